@@ -2,13 +2,24 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
+
+Each CSV is indexed once (rows, posting lists with term frequencies, document
+lengths, IDF and per-document BM25 weights) and the index is pickled under
+../.index/. It is rebuilt only when the CSV's mtime or size changes, and kept
+in memory, so repeated searches in one process only walk the postings of the
+query terms and pick the top results with a heap.
 """
 
 import csv
+import heapq
+import os
+import pickle
 import re
+import tempfile
 from pathlib import Path
 from math import log
 from collections import defaultdict
+from functools import lru_cache
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -78,120 +89,213 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
 # ============ BM25 IMPLEMENTATION ============
+_TOKEN_SPLIT = re.compile(r'[^\w\s]')
+
+
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search, over an inverted index"""
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
         self.N = 0
+        # term -> (doc ids, term frequencies, BM25 contributions), doc ids ascending
+        self.postings = {}
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+        text = _TOKEN_SPLIT.sub(' ', str(text).lower())
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        corpus = [self.tokenize(doc) for doc in documents]
+        term_freqs = defaultdict(dict)
+        for idx, doc in enumerate(corpus):
+            for word in doc:
+                freqs = term_freqs[word]
+                freqs[idx] = freqs.get(idx, 0) + 1
+        self.fit_counts([len(doc) for doc in corpus], term_freqs)
+
+    def fit_counts(self, doc_lengths, term_freqs):
+        """Build BM25 index from document lengths and {term: {doc id: term frequency}}"""
+        self.N = len(doc_lengths)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = list(doc_lengths)
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        for word, freqs in term_freqs.items():
+            self.doc_freqs[word] = len(freqs)
+            self.idf[word] = log((self.N - len(freqs) + 0.5) / (len(freqs) + 0.5) + 1)
+
+        # Everything but the query is known now: store each term's contribution per document
+        for word, freqs in term_freqs.items():
+            idf = self.idf[word]
+            doc_ids = list(freqs)
+            tfs = [freqs[idx] for idx in doc_ids]
+            weights = []
+            for idx, tf in zip(doc_ids, tfs):
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[idx] / self.avgdl)
+                weights.append(idf * numerator / denominator)
+            self.postings[word] = (doc_ids, tfs, weights)
+
+    def _accumulate(self, query):
+        """{doc id: score} for documents containing a query term (touches only their postings)"""
+        scores = {}
+        for token in self.tokenize(query):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            doc_ids, _, weights = posting
+            for idx, weight in zip(doc_ids, weights):
+                scores[idx] = scores.get(idx, 0) + weight
+        return scores
+
+    def top(self, query, k):
+        """Best k (idx, score) pairs with score > 0, highest first (ties: lower idx first)"""
+        scores = self._accumulate(query)
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
 
     def score(self, query):
         """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        scores = [0] * self.N
+        for idx, score in self._accumulate(query).items():
+            scores[idx] = score
+        return sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
 
-            scores.append((idx, score))
+# ============ PERSISTED INDEXES ============
+INDEX_DIR = Path(__file__).parent.parent / ".index"
+INDEX_VERSION = 1
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+# filepath -> (stamp, rows, BM25); indexes stay warm for the life of the process
+_INDEXES = {}
 
 
-# ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
     """Load CSV and return list of dicts"""
     with open(filepath, 'r', encoding='utf-8') as f:
         return list(csv.DictReader(f))
 
 
+def _index_path(filepath):
+    relative = filepath.relative_to(DATA_DIR) if filepath.is_relative_to(DATA_DIR) else Path(filepath.name)
+    return INDEX_DIR / (str(relative.with_suffix("")).replace("/", "-") + ".pickle")
+
+
+def _read_index(path, stamp):
+    try:
+        with open(path, 'rb') as f:
+            saved = pickle.load(f)
+        if saved["stamp"] != stamp:
+            return None
+        bm25 = BM25.__new__(BM25)
+        bm25.__dict__.update(saved["bm25"])
+        return saved["rows"], bm25
+    except Exception:  # missing, stale or unreadable cache: rebuild
+        return None
+
+
+def _write_index(path, stamp, rows, bm25):
+    """Atomic write; the index is only a cache, so failures are ignored"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            # Plain attributes, so the pickle does not depend on how core is imported
+            pickle.dump({"stamp": stamp, "rows": rows, "bm25": dict(vars(bm25))}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_index(filepath, search_cols):
+    """
+    (rows, BM25) for a CSV: from memory, else from INDEX_DIR, else built from the CSV.
+    Rebuilt only when the CSV's mtime or size (or the search columns) change.
+    """
+    stat = filepath.stat()
+    stamp = (INDEX_VERSION, stat.st_mtime_ns, stat.st_size, tuple(search_cols))
+    cached = _INDEXES.get(filepath)
+    if cached and cached[0] == stamp:
+        return cached[1], cached[2]
+
+    index_path = _index_path(filepath)
+    loaded = _read_index(index_path, stamp)
+    if loaded is None:
+        rows = _load_csv(filepath)
+        # Build documents from search columns
+        documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in rows]
+        bm25 = BM25()
+        bm25.fit(documents)
+        _write_index(index_path, stamp, rows, bm25)
+        loaded = rows, bm25
+
+    _INDEXES[filepath] = (stamp, *loaded)
+    return loaded
+
+
+# ============ SEARCH FUNCTIONS ============
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    data, bm25 = load_index(filepath, search_cols)
 
-    # Get top results with score > 0
+    # Top results with score > 0
     results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
+    for idx, score in bm25.top(query, max_results):
+        row = data[idx]
+        results.append({col: row.get(col, "") for col in output_cols if col in row})
 
     return results
 
 
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"]
+}
+
+
+@lru_cache(maxsize=4096)
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
     query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"]
-    }
-
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
+    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in DOMAIN_KEYWORDS.items()}
     best = max(scores, key=scores.get)
     return best if scores[best] > 0 else "style"
 
 
+def warm():
+    """Load every domain and stack index into memory (for long-lived processes)"""
+    count = 0
+    for config in CSV_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            load_index(filepath, config["search_cols"])
+            count += 1
+    for config in STACK_CONFIG.values():
+        filepath = DATA_DIR / config["file"]
+        if filepath.exists():
+            load_index(filepath, _STACK_COLS["search_cols"])
+            count += 1
+    return count
+
+
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
     if domain is None:
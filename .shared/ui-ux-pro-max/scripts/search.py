@@ -3,13 +3,34 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py --batch < queries.jsonl
+       python search.py --serve [--port 8765]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
-Stacks: html-tailwind, react, nextjs
+Stacks: html-tailwind, react, nextjs, vue, svelte, swiftui, react-native, flutter
+
+Batch mode reads one JSON request per line from stdin and writes one JSON
+result per line: {"query": "...", "domain": "...", "stack": "...",
+"max_results": 3, "id": ...} (all but "query" optional; "id" is echoed back).
+
+Server mode answers the same requests over HTTP on 127.0.0.1 until stopped:
+    GET  /search?q=<query>[&domain=<domain>][&stack=<stack>][&n=<max_results>]
+    POST /search   body: one request object, or a list of them
+    GET  /health
+Both modes load every domain and stack index once, so each lookup costs
+microseconds instead of a new interpreter and a CSV parse.
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack, warm
+
+DEFAULT_PORT = 8765
 
 
 def format_output(result):
@@ -38,16 +59,153 @@ def format_output(result):
     return "\n".join(output)
 
 
+def run_request(request):
+    """
+    Answer one request dict the way the command-line options would. Never
+    raises: a bad or failing request becomes an {"error": ...} result, so one
+    line cannot end a batch or drop a server connection.
+    """
+    try:
+        result = _answer(request)
+    except Exception as e:
+        result = {"error": f"Search failed: {type(e).__name__}: {e}"}
+    if isinstance(request, dict) and "id" in request:
+        result = {"id": request["id"], **result}
+    return result
+
+
+def _answer(request):
+    if not isinstance(request, dict) or not isinstance(request.get("query"), str):
+        return {"error": 'Each request needs a "query" string'}
+    query = request["query"]
+    domain = request.get("domain")
+    stack = request.get("stack")
+    for name, value in (("domain", domain), ("stack", stack)):
+        if value is not None and not isinstance(value, str):
+            return {"error": f"Invalid {name}: {value!r} (expected a string)"}
+    try:
+        max_results = int(request.get("max_results", MAX_RESULTS))
+    except (TypeError, ValueError):
+        return {"error": f"Invalid max_results: {request.get('max_results')!r}"}
+
+    # Stack search takes priority
+    if stack:
+        return search_stack(query, stack, max_results)
+    if domain is not None and domain not in CSV_CONFIG:
+        return {"error": f"Unknown domain: {domain}. Available: {', '.join(CSV_CONFIG)}"}
+    return search(query, domain, max_results)
+
+
+def run_batch(lines, out):
+    """JSONL in, JSONL out; one result line per non-empty input line"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            result = {"error": f"Invalid JSON: {e}"}
+        else:
+            result = run_request(request)
+        out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+        out.flush()
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """HTTP front end over run_request(); JSON in, JSON out"""
+
+    # Keep-alive, so a client can send many lookups over one connection; no Nagle
+    # delay between the header and body writes of a response
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send(200, {"status": "ok", "indexes": self.server.indexes})
+            return
+        if url.path != "/search":
+            self._send(404, {"error": f"Unknown path: {url.path}"})
+            return
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        request = {"query": params.get("q", params.get("query"))}
+        for key, name in (("domain", "domain"), ("stack", "stack"), ("n", "max_results"), ("max_results", "max_results")):
+            if key in params:
+                request[name] = params[key]
+        result = run_request(request)
+        self._send(400 if "error" in result else 200, result)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/search":
+            self._send(404, {"error": f"Unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if isinstance(request, list):
+            self._send(200, [run_request(item) for item in request])
+        else:
+            result = run_request(request)
+            self._send(400 if "error" in result else 200, result)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(port, verbose=False):
+    """Keep every index warm and answer HTTP requests on localhost until interrupted"""
+    started = time.perf_counter()
+    server = ThreadingHTTPServer(("127.0.0.1", port), SearchHandler)
+    server.indexes = warm()
+    server.verbose = verbose
+    print(f"UI Pro Max search server on http://127.0.0.1:{server.server_address[1]}/search "
+          f"({server.indexes} indexes loaded in {(time.perf_counter() - started) * 1000:.0f} ms)",
+          file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--batch", action="store_true", help="Read JSONL requests from stdin, write JSONL results")
+    parser.add_argument("--serve", action="store_true", help="Serve requests over HTTP on 127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Server port (default: {DEFAULT_PORT})")
+    parser.add_argument("--verbose", action="store_true", help="Log every server request")
 
     args = parser.parse_args()
 
+    if args.batch:
+        warm()
+        run_batch(sys.stdin, sys.stdout)
+        sys.exit(0)
+    if args.serve:
+        serve(args.port, args.verbose)
+        sys.exit(0)
+    if args.query is None:
+        parser.error("a query is required (or use --batch / --serve)")
+
     # Stack search takes priority
     if args.stack:
         result = search_stack(args.query, args.stack, args.max_results)
@@ -55,7 +213,6 @@ if __name__ == "__main__":
         result = search(args.query, args.domain, args.max_results)
 
     if args.json:
-        import json
         print(json.dumps(result, indent=2, ensure_ascii=False))
     else:
         print(format_output(result))
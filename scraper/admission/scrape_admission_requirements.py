@@ -1,12 +1,16 @@
 """
 UBC Admission Requirements Scraper for Canadian High School Students
 Scrapes admission requirements from you.ubc.ca
+
+Usage:
+    python scraper/admission/scrape_admission_requirements.py [--record ARCHIVE | --replay ARCHIVE]
 """
 
 import requests
 from bs4 import BeautifulSoup
-import json
+import os
 import re
+import sys
 import time
 from typing import Dict, List, Optional
 from selenium import webdriver
@@ -16,6 +20,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.json_writer import write_json
+
 class UBCAdmissionRequirementsScraper:
     def __init__(self, use_selenium=True):
         self.base_url = "https://you.ubc.ca"
@@ -51,7 +62,7 @@ class UBCAdmissionRequirementsScraper:
                 self.driver.get(self.requirements_url)
                 time.sleep(3)  # Wait for page to load
                 
-                soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                soup = BeautifulSoup(fixtures.page_source(self.driver, self.requirements_url), 'html.parser')
             else:
                 response = requests.get(self.requirements_url)
                 response.raise_for_status()
@@ -175,7 +186,9 @@ class UBCAdmissionRequirementsScraper:
                         time.sleep(2)
                         
                         # Get the page source after selection
-                        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                        html = fixtures.page_source(self.driver, self.requirements_url,
+                                                    f"campus={campus}&degree={value}")
+                        soup = BeautifulSoup(html, 'html.parser')
                         
                         # Extract degree-specific requirements
                         degree_req = self.extract_degree_specific_requirements(soup, name)
@@ -278,7 +291,8 @@ class UBCAdmissionRequirementsScraper:
                         province_select.select_by_value(value)
                         time.sleep(2)
                         
-                        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+                        html = fixtures.page_source(self.driver, self.requirements_url, f"province={value}")
+                        soup = BeautifulSoup(html, 'html.parser')
                         
                         # Extract provincial requirements (similar to general requirements)
                         provincial_requirements[name] = {
@@ -300,9 +314,10 @@ class UBCAdmissionRequirementsScraper:
     
     def save_to_json(self, data: Dict, filename: str):
         """Save scraped data to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"\nSaved admission requirements to {filename}")
+        if write_json(filename, data):
+            print(f"\nSaved admission requirements to {filename}")
+        else:
+            print(f"\nAdmission requirements unchanged in {filename}")
     
     def cleanup(self):
         """Clean up resources"""
@@ -312,6 +327,7 @@ class UBCAdmissionRequirementsScraper:
 
 
 def main():
+    fixtures.configure_from_argv()
     scraper = UBCAdmissionRequirementsScraper(use_selenium=True)
     
     print("=" * 70)
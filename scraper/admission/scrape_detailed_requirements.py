@@ -1,27 +1,108 @@
 """
 Enhanced UBC Admission Requirements Scraper
 Scrapes detailed requirements by province and degree from you.ubc.ca
+
+Usage:
+    python scraper/admission/scrape_detailed_requirements.py
+    python scraper/admission/scrape_detailed_requirements.py --record fixtures/requirements.zip
+    python scraper/admission/scrape_detailed_requirements.py --replay fixtures/requirements.zip
+    python scraper/admission/scrape_detailed_requirements.py --drivers 4
+    python scraper/admission/scrape_detailed_requirements.py --resume
+    python scraper/admission/scrape_detailed_requirements.py --reuse-page
+    python scraper/admission/scrape_detailed_requirements.py --capture-xhr
+    python scraper/admission/scrape_detailed_requirements.py --from-payloads
+
+--record saves every page_source snapshot (keyed by province/degree selection);
+--replay re-parses them without starting Chrome or sleeping.
+
+Page loads and degree selections wait on DOM conditions (MutationObserver based,
+see scraper/utils/selenium_waits.py) instead of fixed sleeps; the measured wait
+durations are saved next to the output as *_wait_timings.json.
+
+--drivers N scrapes the province x degree matrix with N headless browsers, one
+worker process each (scraper/utils/driver_pool.py); items whose page errors
+are retried on a fresh browser (a page with no requirements is a result, not
+an error) and results are merged in the same order as a sequential run.
+
+--reuse-page loads each province page once and then switches the degree
+<select> in place, waiting for the requests the selection triggers to finish
+before reading the new degree's content (about 13 page loads instead of one
+per degree). With --drivers, a worker keeps taking the degrees of the province
+it has loaded.
+
+--resume continues an interrupted run: every finished province/degree is
+appended to vancouver_detailed_requirements.checkpoint.jsonl as it completes
+(scraper/utils/checkpoint.py), and a resumed run skips those and rebuilds the
+output from the checkpoint. The checkpoint is removed once the output is saved.
+
+--capture-xhr also records the XHR/fetch requests the page makes for every
+province/degree (Chrome performance log) into requirements_payloads.json.
+--from-payloads later rebuilds the output by repeating those requests over plain
+HTTP, with no browser at all.
 """
 
 import requests
 from bs4 import BeautifulSoup
-import json
+import functools
+import os
 import re
+import sys
 import time
 from typing import Dict, List, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import Select
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.checkpoint import Checkpoint
+from scraper.utils.driver_pool import DriverPool
+from scraper.utils.fetch_engine import polite_wait
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
+from scraper.utils.network_capture import (
+    PayloadManifest, discard_requests, drain_requests, enable_performance_logging,
+    fetch_payload, html_fragments
+)
+from scraper.utils.selenium_waits import (
+    WaitTimings, arm_observer, document_ready, dom_settled, select_populated
+)
+
+PROVINCE_SELECT = '#admission-requirements-province'
+DEGREE_SELECT = '.select-programs-list'
+REQUIREMENTS_SECTION = '.section-requirements'
+
+# How long the DOM must stay unchanged before client-rendered content counts as settled
+SETTLE_MS = 750
+PAGE_TIMEOUT = 15
+CONTENT_TIMEOUT = 25
 
 class DetailedRequirementsScraper:
-    def __init__(self):
+    def __init__(self, reuse_page=False, capture_xhr=False, use_browser=True, checkpoint=None,
+                 raise_errors=False):
         self.base_url = "https://you.ubc.ca"
         self.requirements_url = "https://you.ubc.ca/applying-ubc/requirements/canadian-high-schools/"
         self.driver = None
-        self.setup_selenium()
+        self.timings = WaitTimings()
+        # With reuse_page, the province whose page is currently loaded (None = must navigate)
+        self.reuse_page = reuse_page
+        self.loaded_province = None
+        # With capture_xhr, the data requests seen for each page state
+        self.capture_xhr = capture_xhr
+        self.payloads = PayloadManifest()
+        # Pool workers let page errors propagate so the item is retried; the
+        # sequential run logs them and records the unit as empty
+        self.raise_errors = raise_errors
+        # Finished work units (see unit_key); None = no checkpointing
+        self.checkpoint: Optional[Checkpoint] = checkpoint
+        # Replayed runs read recorded page snapshots and never need a browser
+        if use_browser and not fixtures.replaying():
+            self.setup_selenium()
     
     def setup_selenium(self):
         """Setup Selenium WebDriver"""
@@ -30,6 +111,8 @@ class DetailedRequirementsScraper:
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+        if self.capture_xhr:
+            enable_performance_logging(chrome_options)
         
         try:
             self.driver = webdriver.Chrome(options=chrome_options)
@@ -38,7 +121,26 @@ class DetailedRequirementsScraper:
             print(f"✗ Failed to initialize Selenium: {e}")
             raise
     
-    def scrape_all_requirements(self, campus='vancouver'):
+    @staticmethod
+    def unit_key(province_hash=None, degree_name=None) -> str:
+        """Checkpoint key of a work unit (same form as the fixture page states)"""
+        if province_hash is None:
+            return 'general'
+        if degree_name is None:
+            return f"province={province_hash}"
+        return f"province={province_hash}&degree={degree_name}"
+    
+    def run_unit(self, key, scrape):
+        """Result of a work unit: from the checkpoint if already done, else scraped and recorded"""
+        if self.checkpoint is not None and key in self.checkpoint:
+            return self.checkpoint.get(key)
+        result = scrape()
+        # Empty results are failures (errors are caught and logged); those units run again
+        if result and self.checkpoint is not None:
+            self.checkpoint.record(key, result)
+        return result
+    
+    def scrape_all_requirements(self, campus='vancouver', drivers=1):
         """Scrape all requirements for all provinces and degrees"""
         print(f"\n{'='*70}")
         print(f"Scraping requirements for {campus.upper()} campus")
@@ -57,11 +159,19 @@ class DetailedRequirementsScraper:
         # Get list of degrees
         degrees = self.get_degrees(campus)
         print(f"Found {len(degrees)} degrees to scrape")
+        self.payloads.meta.update({'campus': campus, 'provinces': provinces, 'degrees': degrees})
         
         # Scrape general requirements (without province selection)
         print("\n" + "="*70)
         print("Scraping general requirements...")
-        all_data['general_requirements'] = self.scrape_general_requirements()
+        all_data['general_requirements'] = self.run_unit(self.unit_key(), self.scrape_general_requirements)
+        
+        if drivers > 1:
+            if fixtures.active_archive() is None and not self.capture_xhr:
+                all_data['provinces'] = self.scrape_provinces_parallel(campus, provinces, degrees, drivers)
+                self.timings.print_summary()
+                return all_data
+            print("\n⚠️  --record/--replay/--capture-xhr run sequentially; ignoring --drivers")
         
         # Scrape for each province
         for province_name, province_hash in provinces:
@@ -77,31 +187,154 @@ class DetailedRequirementsScraper:
             }
             
             # Scrape province-specific general requirements
-            province_data['general_requirements'] = self.scrape_province_requirements(
-                campus, province_name, province_hash
+            province_data['general_requirements'] = self.run_unit(
+                self.unit_key(province_hash),
+                lambda: self.scrape_province_requirements(campus, province_name, province_hash)
             )
             
             # Scrape each degree for this province
             for degree_name, degree_value in degrees:
+                key = self.unit_key(province_hash, degree_name)
+                if self.checkpoint is not None and key in self.checkpoint:
+                    province_data['degrees'][degree_name] = self.checkpoint.get(key)
+                    continue
+                
                 print(f"\n  Degree: {degree_name}")
-                degree_reqs = self.scrape_degree_requirements(
+                degree_reqs = self.run_unit(key, lambda: self.scrape_degree_requirements(
                     campus, province_name, province_hash, degree_name, degree_value
-                )
+                ))
                 
                 if degree_reqs:
                     province_data['degrees'][degree_name] = degree_reqs
                 
-                time.sleep(1)  # Be respectful
+                if not fixtures.replaying():
+                    time.sleep(1)  # Be respectful
             
             all_data['provinces'][province_name] = province_data
         
+        self.timings.print_summary()
         return all_data
     
+    def scrape_provinces_parallel(self, campus, provinces, degrees, drivers) -> Dict:
+        """Scrape every (province, degree) pair on a pool of browsers; same structure as the sequential loop"""
+        print(f"\n{'='*70}")
+        print(f"Scraping {len(provinces)} provinces x {len(degrees)} degrees with {drivers} browsers")
+        print(f"{'='*70}")
+        
+        # degree_name None = the province's general requirements page
+        items = []
+        for province_name, province_hash in provinces:
+            items.append((campus, province_name, province_hash, None, None))
+            for degree_name, degree_value in degrees:
+                items.append((campus, province_name, province_hash, degree_name, degree_value))
+        
+        # Units finished by an earlier (interrupted) run come from the checkpoint
+        results = {}
+        if self.checkpoint is not None:
+            for item in items:
+                key = self.unit_key(item[2], item[3])
+                if key in self.checkpoint:
+                    results[item] = self.checkpoint.get(key)
+            if results:
+                print(f"  {len(results)} of {len(items)} item(s) already done")
+        
+        def record(item, result):
+            if self.checkpoint is not None:
+                self.checkpoint.record(self.unit_key(item[2], item[3]), result)
+        
+        # Each worker keeps its own province page loaded in --reuse-page mode, so
+        # it is handed that province's degrees while any are left
+        make_worker = functools.partial(RequirementsPoolWorker, reuse_page=self.reuse_page)
+        pool = DriverPool(make_worker=make_worker, size=drivers, retries=2)
+        affinity = (lambda item: item[2]) if self.reuse_page else None
+        results.update(pool.run([item for item in items if item not in results], on_result=record,
+                                affinity=affinity))
+        self.timings.samples.update(pool.timing_samples)
+        self.timings.timeouts.update(pool.timing_timeouts)
+        
+        # Merge in province/degree order so the output matches a sequential run
+        provinces_data = {}
+        for province_name, province_hash in provinces:
+            province_data = {
+                'name': province_name,
+                'hash': province_hash,
+                'general_requirements': results.get((campus, province_name, province_hash, None, None)) or {},
+                'degrees': {}
+            }
+            for degree_name, degree_value in degrees:
+                degree_reqs = results.get((campus, province_name, province_hash, degree_name, degree_value))
+                if degree_reqs:
+                    province_data['degrees'][degree_name] = degree_reqs
+            provinces_data[province_name] = province_data
+        return provinces_data
+    
+    def scrape_all_from_payloads(self, manifest_path) -> Dict:
+        """Rebuild scrape_all_requirements output from captured data requests, over plain HTTP"""
+        manifest = PayloadManifest.load(manifest_path)
+        campus = manifest.meta.get('campus', 'vancouver')
+        provinces = [tuple(p) for p in manifest.meta.get('provinces', [])]
+        degrees = [tuple(d) for d in manifest.meta.get('degrees', [])]
+        session = CachedSession()
+        
+        print(f"\n{'='*70}")
+        print(f"Refreshing {len(provinces)} provinces x {len(degrees)} degrees from {manifest_path}")
+        print(f"{'='*70}")
+        
+        # The #basic content ships with the page itself
+        response = session.get(self.requirements_url, timeout=15)
+        all_data = {
+            'campus': campus,
+            'general_requirements': self.parse_general_requirements(response.text),
+            'provinces': {}
+        }
+        
+        missing = 0
+        for province_name, province_hash in provinces:
+            print(f"\nProvince: {province_name}")
+            html = self.fetch_payload_html(session, manifest, f"province={province_hash}")
+            province_data = {
+                'name': province_name,
+                'hash': province_hash,
+                'general_requirements': self.parse_general_requirements(html) if html else {},
+                'degrees': {}
+            }
+            for degree_name, degree_value in degrees:
+                html = self.fetch_payload_html(session, manifest, f"province={province_hash}&degree={degree_name}")
+                if not html:
+                    missing += 1
+                    continue
+                print(f"  Degree: {degree_name}")
+                degree_reqs = self.parse_degree_requirements(html, degree_name)
+                if degree_reqs:
+                    province_data['degrees'][degree_name] = degree_reqs
+            all_data['provinces'][province_name] = province_data
+        
+        if missing:
+            print(f"\n⚠️  {missing} province/degree page(s) had no HTML payload; re-run with --capture-xhr")
+        return all_data
+    
+    def fetch_payload_html(self, session, manifest, state) -> str:
+        """Repeat the requests captured for one page state and join the HTML they return"""
+        fragments = []
+        for spec in manifest.requests_for(state):
+            if not session.is_fresh(spec['url']):
+                polite_wait(spec['url'])
+            try:
+                response = fetch_payload(session, spec)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                print(f"    ⚠ {spec['url']}: {e}")
+                continue
+            fragments.append(html_fragments(response.text))
+        return '\n'.join(f for f in fragments if f)
+    
     def get_provinces(self) -> List[tuple]:
         """Get list of all provinces"""
+        if fixtures.replaying():
+            return [tuple(p) for p in fixtures.replay_value(self.requirements_url, 'provinces')]
         try:
             self.driver.get(self.requirements_url + '#basic')
-            time.sleep(4)
+            self.timings.wait(self.driver, 'province_list', select_populated(PROVINCE_SELECT), PAGE_TIMEOUT)
             
             # Find province dropdown using the correct ID
             province_select = Select(self.driver.find_element(
@@ -119,6 +352,7 @@ class DetailedRequirementsScraper:
                     provinces.append((text, value))
             
             print(f"Found {len(provinces)} provinces")
+            fixtures.record_value(self.requirements_url, 'provinces', provinces)
             return provinces  # Return ALL provinces
             
         except Exception as e:
@@ -133,10 +367,12 @@ class DetailedRequirementsScraper:
     
     def get_degrees(self, campus='vancouver') -> List[tuple]:
         """Get list of all degrees"""
+        if fixtures.replaying():
+            return [tuple(d) for d in fixtures.replay_value(self.requirements_url, 'degrees')]
         try:
             url = self.requirements_url + '#basic'
             self.driver.get(url)
-            time.sleep(4)
+            self.timings.wait(self.driver, 'degree_list', select_populated(DEGREE_SELECT), PAGE_TIMEOUT)
             
             # Find degree dropdown using the correct class
             degree_select = Select(self.driver.find_element(
@@ -154,6 +390,7 @@ class DetailedRequirementsScraper:
                     degrees.append((text, text))
             
             print(f"Found {len(degrees)} degrees")
+            fixtures.record_value(self.requirements_url, 'degrees', degrees)
             # Return ALL degrees
             return degrees
             
@@ -168,257 +405,294 @@ class DetailedRequirementsScraper:
     def scrape_general_requirements(self) -> Dict:
         """Scrape general admission requirements"""
         try:
-            self.driver.get(self.requirements_url + '#basic')
-            time.sleep(3)
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            if not fixtures.replaying():
+                self.load_page(self.requirements_url + '#basic', 'general_page')
             
-            general_reqs = {
-                'english_requirement': self.extract_section(soup, 'English language requirement'),
-                'general_admission': self.extract_section(soup, 'General admission requirements'),
-                'requirements_list': []
-            }
-            
-            # Extract bullet points from general admission
-            section = soup.find('h3', string=re.compile(r'General admission requirements', re.I))
-            if section:
-                ul = section.find_next('ul')
-                if ul:
-                    for li in ul.find_all('li'):
-                        general_reqs['requirements_list'].append(li.get_text(strip=True))
-            
-            return general_reqs
+            html = fixtures.page_source(self.driver, self.requirements_url, 'basic')
+            return self.parse_general_requirements(html)
             
         except Exception as e:
             print(f"  ✗ Error scraping general requirements: {e}")
             return {}
     
+    def parse_general_requirements(self, html) -> Dict:
+        """Parse the English / general admission sections of a page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        general_reqs = {
+            'english_requirement': self.extract_section(soup, 'English language requirement'),
+            'general_admission': self.extract_section(soup, 'General admission requirements'),
+            'requirements_list': []
+        }
+        
+        # Extract bullet points from general admission
+        section = soup.find('h3', string=re.compile(r'General admission requirements', re.I))
+        if section:
+            ul = section.find_next('ul')
+            if ul:
+                for li in ul.find_all('li'):
+                    general_reqs['requirements_list'].append(li.get_text(strip=True))
+        
+        return general_reqs
+    
     def scrape_province_requirements(self, campus, province_name, province_hash) -> Dict:
         """Scrape requirements for a specific province"""
         try:
-            url = f"{self.requirements_url}#{province_hash}"
-            self.driver.get(url)
-            time.sleep(3)
-            
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            province_reqs = {
-                'english_requirement': self.extract_section(soup, 'English language requirement'),
-                'general_admission': self.extract_section(soup, 'General admission requirements'),
-                'requirements_list': []
-            }
-            
-            # Extract requirements list
-            section = soup.find('h3', string=re.compile(r'General admission requirements', re.I))
-            if section:
-                ul = section.find_next('ul')
-                if ul:
-                    for li in ul.find_all('li'):
-                        province_reqs['requirements_list'].append(li.get_text(strip=True))
+            state = f"province={province_hash}"
+            if not fixtures.replaying():
+                if self.capture_xhr:
+                    discard_requests(self.driver)  # drop requests from earlier pages
+                self.load_page(f"{self.requirements_url}#{province_hash}", 'province_page')
+                self.loaded_province = province_hash  # degrees can be selected on this page
+                if self.capture_xhr:
+                    self.payloads.add(state, drain_requests(self.driver))
+            
+            html = fixtures.page_source(self.driver, self.requirements_url, state)
+            province_reqs = self.parse_general_requirements(html)
             
             print(f"  ✓ General requirements scraped")
             return province_reqs
             
         except Exception as e:
             print(f"  ✗ Error: {e}")
+            if self.raise_errors:
+                raise
             return {}
     
-    def scrape_degree_requirements(self, campus, province_name, province_hash, 
-                                   degree_name, degree_value) -> Dict:
-        """Scrape requirements for a specific degree in a specific province"""
-        try:
-            # Navigate to province page
+    def load_page(self, url, label):
+        """Navigate and wait until the document is loaded and client-side rendering has gone quiet"""
+        arm_observer(self.driver)  # survives hash-only navigation, re-armed by dom_settled otherwise
+        self.driver.get(url)
+        self.loaded_province = None
+        self.timings.wait(self.driver, label, document_ready, PAGE_TIMEOUT)
+        self.timings.wait(self.driver, label + '_render',
+                          dom_settled('body', quiet_ms=SETTLE_MS, require_mutation=False), PAGE_TIMEOUT)
+    
+    def load_degree_page(self, province_hash, degree_name) -> bool:
+        """Open a province page and select a degree; False if the degree could not be selected"""
+        # Navigate to province page and wait for the degree dropdown to be populated,
+        # unless this province is already loaded and only the degree changes
+        if not (self.reuse_page and self.loaded_province == province_hash):
             url = f"{self.requirements_url}#{province_hash}"
             self.driver.get(url)
-            time.sleep(5)  # Increased wait time for province content
-            
-            # Select the degree using the correct class
-            try:
-                degree_select = Select(self.driver.find_element(
-                    By.CLASS_NAME,
-                    "select-programs-list"
-                ))
-                
-                # Select by visible text (degree_name)
-                degree_select.select_by_visible_text(degree_name)
-                
-                # Wait longer for province-specific course codes to load
-                time.sleep(8)  # Increased to ensure province-specific codes appear
-                
-            except Exception as e:
-                print(f"    ✗ Error selecting degree: {e}")
-                return {}
-            
-            # Wait for content to load using explicit wait
-            try:
-                # Wait for degree-specific requirements section to appear
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "section-requirements"))
-                )
-            except TimeoutException:
-                print(f"    ⚠ Timeout waiting for requirements section")
-                pass  # Continue even if timeout
-            
-            # Additional wait to ensure province-specific content (like "English Language Arts 30-1") loads
-            time.sleep(4)
-            
-            # Get page content
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            degree_reqs = {
-                'degree_name': degree_name,
-                'grade_12_requirements': [],
-                'grade_11_requirements': [],
-                'related_courses': [],
-                'minimum_grade': '',
-                'additional_info': ''
-            }
-            
-            # Find degree-specific requirements section - try multiple approaches
-            degree_section = None
-            
-            # Try 1: Find h2 with "Degree-specific requirements"
-            degree_section = soup.find('h2', string=re.compile(r'Degree-specific requirements', re.I))
-            
-            # Try 2: Look for Grade 12 requirements directly (h5 first) - this is most reliable
-            if not degree_section:
-                for tag in ['h5', 'h4', 'h3', 'h2']:
-                    grade_12_heading = soup.find(tag, string=re.compile(r'Grade 12 requirements?', re.I))
-                    if grade_12_heading:
-                        degree_section = grade_12_heading
-                        break
-            
-            # Try 3: Look for Grade 11 requirements if Grade 12 not found
-            if not degree_section:
-                for tag in ['h5', 'h4', 'h3', 'h2']:
-                    grade_11_heading = soup.find(tag, string=re.compile(r'Grade 11 requirements?', re.I))
-                    if grade_11_heading:
-                        degree_section = grade_11_heading
-                        break
-            
-            # Try 4: Look for Related courses
-            if not degree_section:
-                for tag in ['h5', 'h4', 'h3', 'h2']:
-                    related_heading = soup.find(tag, string=re.compile(r'Related courses?', re.I))
-                    if related_heading:
-                        degree_section = related_heading
-                        break
+            self.loaded_province = None
+            self.timings.wait(self.driver, 'province_page', select_populated(DEGREE_SELECT), PAGE_TIMEOUT)
+        
+        # Select the degree using the correct class
+        try:
+            degree_select = Select(self.driver.find_element(
+                By.CLASS_NAME,
+                "select-programs-list"
+            ))
             
-            # Determine content container - always search entire page for degree-specific requirements
-            # Since they appear after degree selection, we need to search the whole soup
-            content_div = soup
+            if self.capture_xhr:
+                discard_requests(self.driver)  # only keep requests caused by this selection
             
-            # Extract Grade 12 requirements - try multiple tag types (h5 first as it's commonly used)
-            grade_12_section = None
-            if content_div:
-                for tag in ['h5', 'h4', 'h3', 'h2', 'strong', 'div']:
-                    grade_12_section = content_div.find(tag, string=re.compile(r'Grade 12 requirements?', re.I))
-                    if grade_12_section:
-                        break
+            # Watch the DOM and the page's requests from just before the selection, so
+            # only its own re-render counts (even if it matches the previous degree's)
+            arm_observer(self.driver)
             
-            if grade_12_section:
-                # Try to find list
-                ul = grade_12_section.find_next('ul')
-                if ul:
-                    for li in ul.find_all('li', recursive=False):
-                        # Get complete text including nested elements (like <strong>, <em>, etc.)
-                        text = li.get_text(separator=' ', strip=True)
-                        if text:
-                            degree_reqs['grade_12_requirements'].append(text)
-                else:
-                    # Try to find paragraph or div with requirements
-                    p = grade_12_section.find_next(['p', 'div'])
-                    if p:
-                        text = p.get_text(separator=' ', strip=True)
-                        if text and len(text) > 10:  # Meaningful content
-                            degree_reqs['grade_12_requirements'].append(text)
+            # Select by visible text (degree_name)
+            degree_select.select_by_visible_text(degree_name)
             
-            # Extract Grade 11 requirements - try multiple tag types (h5 first as it's commonly used)
-            grade_11_section = None
-            if content_div:
-                for tag in ['h5', 'h4', 'h3', 'h2', 'strong', 'div']:
-                    grade_11_section = content_div.find(tag, string=re.compile(r'Grade 11 requirements?', re.I))
-                    if grade_11_section:
-                        break
+        except Exception as e:
+            print(f"    ✗ Error selecting degree: {e}")
+            self.loaded_province = None
+            # A missing <select> means the page is broken; a missing option, that
+            # the degree is not offered for this province
+            if self.raise_errors and not (isinstance(e, NoSuchElementException)
+                                          and 'visible text' in str(e)):
+                raise
+            return False
+        
+        # Wait until the selection's requests have completed, the requirements section
+        # has rendered and the province-specific course codes (like "English Language
+        # Arts 30-1") have stopped changing
+        settled = self.timings.wait(
+            self.driver, 'degree_content',
+            dom_settled(REQUIREMENTS_SECTION, quiet_ms=SETTLE_MS), CONTENT_TIMEOUT
+        )
+        if not settled:
+            print(f"    ⚠ Timeout waiting for requirements section")
+        # A timed-out page may be wedged; only keep reusing pages that behaved
+        self.loaded_province = province_hash if settled else None
+        return True
+    
+    def scrape_degree_requirements(self, campus, province_name, province_hash, 
+                                   degree_name, degree_value) -> Dict:
+        """Scrape requirements for a specific degree in a specific province"""
+        try:
+            state = f"province={province_hash}&degree={degree_name}"
+            if not fixtures.replaying() and not self.load_degree_page(province_hash, degree_name):
+                return {}
             
-            if grade_11_section:
-                ul = grade_11_section.find_next('ul')
-                if ul:
-                    for li in ul.find_all('li', recursive=False):
-                        # Get complete text including nested elements
-                        text = li.get_text(separator=' ', strip=True)
-                        if text:
-                            degree_reqs['grade_11_requirements'].append(text)
-                else:
-                    p = grade_11_section.find_next(['p', 'div'])
-                    if p:
-                        text = p.get_text(separator=' ', strip=True)
-                        if text and len(text) > 10:
-                            degree_reqs['grade_11_requirements'].append(text)
+            if self.capture_xhr and not fixtures.replaying():
+                self.payloads.add(state, drain_requests(self.driver))
             
-            # Extract Related courses - try multiple tag types (h5 first as it's commonly used)
-            related_section = None
-            if content_div:
-                for tag in ['h5', 'h4', 'h3', 'h2', 'strong', 'div']:
-                    related_section = content_div.find(tag, string=re.compile(r'Related courses?', re.I))
-                    if related_section:
-                        break
+            # Get page content
+            html = fixtures.page_source(self.driver, self.requirements_url, state)
+            return self.parse_degree_requirements(html, degree_name)
             
-            if related_section:
-                ul = related_section.find_next('ul')
-                if ul:
-                    for li in ul.find_all('li', recursive=False):
-                        # Get complete text including nested elements
-                        text = li.get_text(separator=' ', strip=True)
-                        if text:
-                            degree_reqs['related_courses'].append(text)
-                else:
-                    # Try to find related courses in nearby paragraphs
-                    p = related_section.find_next(['p', 'div'])
-                    if p:
-                        text = p.get_text(separator=' ', strip=True)
-                        if text and len(text) > 10:
-                            # Split by common delimiters
-                            courses = re.split(r'[,;•\n]', text)
-                            for course in courses:
-                                course = course.strip()
-                                if course and len(course) > 2:
-                                    degree_reqs['related_courses'].append(course)
-                
-                # Get the explanatory paragraph
-                p = related_section.find_next('p')
+        except Exception as e:
+            print(f"    ✗ Error: {e}")
+            if self.raise_errors:
+                raise
+            return {}
+    
+    def parse_degree_requirements(self, html, degree_name) -> Dict:
+        """Parse degree-specific requirements out of a rendered page (or HTML fragment)"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        degree_reqs = {
+            'degree_name': degree_name,
+            'grade_12_requirements': [],
+            'grade_11_requirements': [],
+            'related_courses': [],
+            'minimum_grade': '',
+            'additional_info': ''
+        }
+        
+        # Find degree-specific requirements section - try multiple approaches
+        degree_section = None
+        
+        # Try 1: Find h2 with "Degree-specific requirements"
+        degree_section = soup.find('h2', string=re.compile(r'Degree-specific requirements', re.I))
+        
+        # Try 2: Look for Grade 12 requirements directly (h5 first) - this is most reliable
+        if not degree_section:
+            for tag in ['h5', 'h4', 'h3', 'h2']:
+                grade_12_heading = soup.find(tag, string=re.compile(r'Grade 12 requirements?', re.I))
+                if grade_12_heading:
+                    degree_section = grade_12_heading
+                    break
+        
+        # Try 3: Look for Grade 11 requirements if Grade 12 not found
+        if not degree_section:
+            for tag in ['h5', 'h4', 'h3', 'h2']:
+                grade_11_heading = soup.find(tag, string=re.compile(r'Grade 11 requirements?', re.I))
+                if grade_11_heading:
+                    degree_section = grade_11_heading
+                    break
+        
+        # Try 4: Look for Related courses
+        if not degree_section:
+            for tag in ['h5', 'h4', 'h3', 'h2']:
+                related_heading = soup.find(tag, string=re.compile(r'Related courses?', re.I))
+                if related_heading:
+                    degree_section = related_heading
+                    break
+        
+        # Determine content container - always search entire page for degree-specific requirements
+        # Since they appear after degree selection, we need to search the whole soup
+        content_div = soup
+        
+        # Extract Grade 12 requirements - try multiple tag types (h5 first as it's commonly used)
+        grade_12_section = None
+        if content_div:
+            for tag in ['h5', 'h4', 'h3', 'h2', 'strong', 'div']:
+                grade_12_section = content_div.find(tag, string=re.compile(r'Grade 12 requirements?', re.I))
+                if grade_12_section:
+                    break
+        
+        if grade_12_section:
+            # Try to find list
+            ul = grade_12_section.find_next('ul')
+            if ul:
+                for li in ul.find_all('li', recursive=False):
+                    # Get complete text including nested elements (like <strong>, <em>, etc.)
+                    text = li.get_text(separator=' ', strip=True)
+                    if text:
+                        degree_reqs['grade_12_requirements'].append(text)
+            else:
+                # Try to find paragraph or div with requirements
+                p = grade_12_section.find_next(['p', 'div'])
                 if p:
-                    info_text = p.get_text(separator=' ', strip=True)
-                    if info_text and len(info_text) > 10:
-                        degree_reqs['additional_info'] = info_text
-            
-            # Find minimum grade requirements
-            grade_pattern = re.compile(r'minimum.*?(\d+%)', re.I)
-            for p in soup.find_all(['p', 'div', 'li']):
-                match = grade_pattern.search(p.get_text())
-                if match:
-                    degree_reqs['minimum_grade'] = match.group(0)
+                    text = p.get_text(separator=' ', strip=True)
+                    if text and len(text) > 10:  # Meaningful content
+                        degree_reqs['grade_12_requirements'].append(text)
+        
+        # Extract Grade 11 requirements - try multiple tag types (h5 first as it's commonly used)
+        grade_11_section = None
+        if content_div:
+            for tag in ['h5', 'h4', 'h3', 'h2', 'strong', 'div']:
+                grade_11_section = content_div.find(tag, string=re.compile(r'Grade 11 requirements?', re.I))
+                if grade_11_section:
                     break
-            
-            # Improved validation: Consider it successful if ANY requirement type is found
-            has_requirements = (
-                degree_reqs['grade_12_requirements'] or 
-                degree_reqs['grade_11_requirements'] or 
-                degree_reqs['related_courses']
-            )
-            
-            if has_requirements:
-                g12_count = len(degree_reqs['grade_12_requirements'])
-                g11_count = len(degree_reqs['grade_11_requirements'])
-                related_count = len(degree_reqs['related_courses'])
-                print(f"    ✓ Requirements scraped: G12={g12_count}, G11={g11_count}, Related={related_count}")
-                return degree_reqs
+        
+        if grade_11_section:
+            ul = grade_11_section.find_next('ul')
+            if ul:
+                for li in ul.find_all('li', recursive=False):
+                    # Get complete text including nested elements
+                    text = li.get_text(separator=' ', strip=True)
+                    if text:
+                        degree_reqs['grade_11_requirements'].append(text)
             else:
-                print(f"    - No specific requirements found")
-                return {}
-            
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
+                p = grade_11_section.find_next(['p', 'div'])
+                if p:
+                    text = p.get_text(separator=' ', strip=True)
+                    if text and len(text) > 10:
+                        degree_reqs['grade_11_requirements'].append(text)
+        
+        # Extract Related courses - try multiple tag types (h5 first as it's commonly used)
+        related_section = None
+        if content_div:
+            for tag in ['h5', 'h4', 'h3', 'h2', 'strong', 'div']:
+                related_section = content_div.find(tag, string=re.compile(r'Related courses?', re.I))
+                if related_section:
+                    break
+        
+        if related_section:
+            ul = related_section.find_next('ul')
+            if ul:
+                for li in ul.find_all('li', recursive=False):
+                    # Get complete text including nested elements
+                    text = li.get_text(separator=' ', strip=True)
+                    if text:
+                        degree_reqs['related_courses'].append(text)
+            else:
+                # Try to find related courses in nearby paragraphs
+                p = related_section.find_next(['p', 'div'])
+                if p:
+                    text = p.get_text(separator=' ', strip=True)
+                    if text and len(text) > 10:
+                        # Split by common delimiters
+                        courses = re.split(r'[,;•\n]', text)
+                        for course in courses:
+                            course = course.strip()
+                            if course and len(course) > 2:
+                                degree_reqs['related_courses'].append(course)
+            
+            # Get the explanatory paragraph
+            p = related_section.find_next('p')
+            if p:
+                info_text = p.get_text(separator=' ', strip=True)
+                if info_text and len(info_text) > 10:
+                    degree_reqs['additional_info'] = info_text
+        
+        # Find minimum grade requirements
+        grade_pattern = re.compile(r'minimum.*?(\d+%)', re.I)
+        for p in soup.find_all(['p', 'div', 'li']):
+            match = grade_pattern.search(p.get_text())
+            if match:
+                degree_reqs['minimum_grade'] = match.group(0)
+                break
+        
+        # Improved validation: Consider it successful if ANY requirement type is found
+        has_requirements = (
+            degree_reqs['grade_12_requirements'] or 
+            degree_reqs['grade_11_requirements'] or 
+            degree_reqs['related_courses']
+        )
+        
+        if has_requirements:
+            g12_count = len(degree_reqs['grade_12_requirements'])
+            g11_count = len(degree_reqs['grade_11_requirements'])
+            related_count = len(degree_reqs['related_courses'])
+            print(f"    ✓ Requirements scraped: G12={g12_count}, G11={g11_count}, Related={related_count}")
+            return degree_reqs
+        else:
+            print(f"    - No specific requirements found")
             return {}
     
     def extract_section(self, soup: BeautifulSoup, section_title: str) -> str:
@@ -439,17 +713,11 @@ class DetailedRequirementsScraper:
         return ''
     
     def save_to_json(self, data: Dict, filename: str):
-        """Save data to JSON file"""
-        import os
-        
-        # Ensure directory exists
-        directory = os.path.dirname(filename)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"\n✓ Saved to {filename}")
+        """Save data to JSON file (creates the directory; skips identical output)"""
+        if write_json(filename, data):
+            print(f"\n✓ Saved to {filename}")
+        else:
+            print(f"\n✓ {filename} already up to date")
     
     def cleanup(self):
         """Cleanup resources"""
@@ -458,25 +726,76 @@ class DetailedRequirementsScraper:
             print("\n✓ Browser closed")
 
 
+class RequirementsPoolWorker:
+    """DriverPool worker: one headless browser scraping (province, degree) items"""
+    
+    def __init__(self, reuse_page=False):
+        # Errors raise, so the pool retries them; empty pages come back as {}
+        self.scraper = DetailedRequirementsScraper(reuse_page=reuse_page, raise_errors=True)
+        self.timings = self.scraper.timings
+    
+    def process(self, item) -> Dict:
+        campus, province_name, province_hash, degree_name, degree_value = item
+        if degree_name is None:
+            return self.scraper.scrape_province_requirements(campus, province_name, province_hash)
+        degree_reqs = self.scraper.scrape_degree_requirements(
+            campus, province_name, province_hash, degree_name, degree_value
+        )
+        time.sleep(1)  # Be respectful
+        return degree_reqs
+    
+    def close(self):
+        self.scraper.cleanup()
+
+
 def main():
-    import os
-    scraper = DetailedRequirementsScraper()
+    fixtures.configure_from_argv()
+    
+    drivers = 1
+    if '--drivers' in sys.argv:
+        idx = sys.argv.index('--drivers')
+        if idx + 1 < len(sys.argv):
+            drivers = int(sys.argv[idx + 1])
+    
+    from_payloads = '--from-payloads' in sys.argv
+    
+    # Output goes to scraper/data (the script itself lives in scraper/admission)
+    data_dir = os.path.join(project_root, 'scraper', 'data')
+    output_file = os.path.join(data_dir, 'vancouver_detailed_requirements.json')
+    payloads_file = os.path.join(data_dir, 'requirements_payloads.json')
+    
+    # Payload refreshes are plain HTTP and quick; only browser runs are checkpointed
+    checkpoint = None
+    if not from_payloads:
+        checkpoint = Checkpoint(output_file.replace('.json', '.checkpoint.jsonl'),
+                                resume='--resume' in sys.argv)
+    
+    scraper = DetailedRequirementsScraper(
+        reuse_page='--reuse-page' in sys.argv,
+        capture_xhr='--capture-xhr' in sys.argv,
+        use_browser=not from_payloads,
+        checkpoint=checkpoint
+    )
     
     try:
         print("\n" + "="*70)
         print("UBC Detailed Requirements Scraper")
         print("="*70)
         
-        # Get the script directory and construct absolute path
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        data_dir = os.path.join(script_dir, 'data')
-        output_file = os.path.join(data_dir, 'vancouver_detailed_requirements.json')
-        
         print(f"\nOutput file: {output_file}")
         
         # Scrape Vancouver campus
-        vancouver_data = scraper.scrape_all_requirements(campus='vancouver')
+        if from_payloads:
+            vancouver_data = scraper.scrape_all_from_payloads(payloads_file)
+        else:
+            vancouver_data = scraper.scrape_all_requirements(campus='vancouver', drivers=drivers)
         scraper.save_to_json(vancouver_data, output_file)
+        if checkpoint is not None:
+            checkpoint.discard()
+        if scraper.capture_xhr:
+            scraper.payloads.save(payloads_file)
+        if scraper.timings.samples:
+            scraper.timings.save(output_file.replace('.json', '_wait_timings.json'))
         
         # Summary is already printed in scrape_all_requirements
         
@@ -486,6 +805,10 @@ def main():
         print(f"\n\nError: {e}")
     finally:
         scraper.cleanup()
+        if checkpoint is not None and len(checkpoint) and os.path.exists(checkpoint.path):
+            checkpoint.close()
+            print(f"\n↻ {len(checkpoint)} finished unit(s) kept in {checkpoint.path}; "
+                  f"continue with --resume")
 
 
 if __name__ == "__main__":
@@ -3,18 +3,26 @@ UBC Academic Calendar Course Scraper
 Scrapes course data from vancouver.calendar.ubc.ca
 """
 
-import requests
 from bs4 import BeautifulSoup
-import json
 import re
-import time
 from typing import Dict, List, Optional
+import os
 import sys
 
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.fetch_engine import polite_wait
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
+from scraper.utils.requisites import course_codes, parse_requisites
+
 class UBCCourseScraper:
     def __init__(self):
         self.base_url = "https://vancouver.calendar.ubc.ca"
-        self.session = requests.Session()
+        self.session = CachedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         })
@@ -28,6 +36,9 @@ class UBCCourseScraper:
     def scrape_course_page(self, course_url: str) -> Optional[Dict]:
         """Scrape individual course page for detailed information"""
         try:
+            # Be respectful - wait for the host's rate budget (skipped for cached pages)
+            if not self.session.is_fresh(course_url):
+                polite_wait(course_url)
             response = self.session.get(course_url, timeout=10)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'lxml')
@@ -55,22 +66,18 @@ class UBCCourseScraper:
                 if desc_para:
                     description = desc_para.get_text(strip=True)
             
-            # Extract prerequisites
-            prerequisites = []
+            # Parse prerequisites / corequisites into ASTs (all-of / one-of / n-of / standing)
+            requisites = {}
             prereq_section = soup.find('div', class_='field-name-field-prerequisite')
             if prereq_section:
-                prereq_text = prereq_section.get_text(strip=True)
-                # Extract course codes from prerequisites text
-                prereq_codes = re.findall(r'([A-Z]{4})\s+(\d+[A-Z]?)', prereq_text)
-                prerequisites = [f"{code[0]} {code[1]}" for code in prereq_codes]
-            
-            # Extract corequisites
-            corequisites = []
+                requisites.update(parse_requisites(prereq_section.get_text(' ', strip=True)))
             coreq_section = soup.find('div', class_='field-name-field-corequisite')
             if coreq_section:
-                coreq_text = coreq_section.get_text(strip=True)
-                coreq_codes = re.findall(r'([A-Z]{4})\s+(\d+[A-Z]?)', coreq_text)
-                corequisites = [f"{code[0]} {code[1]}" for code in coreq_codes]
+                requisites.update(parse_requisites(coreq_section.get_text(' ', strip=True), default='co'))
+            
+            # Flat code lists, as before, now read off the ASTs
+            prerequisites = course_codes(requisites.get('pre'))
+            corequisites = course_codes(requisites.get('co'))
             
             # Determine category based on faculty and course code
             category = self.determine_category(course_code)
@@ -81,6 +88,7 @@ class UBCCourseScraper:
                 'credits': credits,
                 'prerequisites': prerequisites,
                 'corequisites': corequisites,
+                'requisites': requisites,
                 'description': description,
                 'category': category
             }
@@ -135,9 +143,6 @@ class UBCCourseScraper:
                     course_data['faculty_code'] = faculty_code
                     courses.append(course_data)
                 
-                # Be respectful - add delay between requests
-                time.sleep(0.5)
-                
         except Exception as e:
             print(f"Error scraping faculty {faculty_name}: {e}")
         
@@ -218,12 +223,14 @@ class UBCCourseScraper:
     
     def save_to_json(self, courses: List[Dict], filename: str):
         """Save scraped courses to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(courses, f, indent=2, ensure_ascii=False)
-        print(f"\nSaved {len(courses)} courses to {filename}")
+        if write_json(filename, courses):
+            print(f"\nSaved {len(courses)} courses to {filename}")
+        else:
+            print(f"\n{len(courses)} courses unchanged in {filename}")
 
 
 def main():
+    fixtures.configure_from_argv()
     scraper = UBCCourseScraper()
     
     print("=" * 60)
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """
 Script to scrape all Arts majors and identify any with different URL formats.
+Pass --resume to skip majors finished by an interrupted run
+(checkpoint: scraper/data/arts_majors.checkpoint.jsonl).
+Major URLs are discovered in one concurrent HEAD batch and remembered in
+scraper/data/arts_major_slugs.json, so known majors skip discovery next time.
 """
 
 import sys
 import os
-import json
 import re
+import json
 import time
 
 # Add project root to path to import the scraper
@@ -18,6 +22,14 @@ sys.path.insert(0, project_root)
 
 # Import the scraper class directly
 from scraper.curriculum.scrape_arts_curriculum import UBCArtsCurriculumScraper
+from scraper.utils import fixtures
+from scraper.utils.checkpoint import Checkpoint
+from scraper.utils.fetch_engine import FetchEngine
+from scraper.utils.json_writer import write_json
+
+CHECKPOINT_FILE = os.path.join(project_root, 'scraper', 'data', 'arts_majors.checkpoint.jsonl')
+# Working URL slug per major name, filled in by MajorUrlResolver
+SLUG_MAP_FILE = os.path.join(project_root, 'scraper', 'data', 'arts_major_slugs.json')
 
 # Import BA majors from artsData.js
 # Since we can't directly import JS, we'll read the file and parse it
@@ -63,11 +75,8 @@ def construct_major_url(base_url, major_name):
     normalized = normalize_major_name(major_name)
     return f"{base_url}/faculties-colleges-and-schools/faculty-arts/bachelor-arts/{normalized}"
 
-def try_alternative_urls(scraper, major_name):
-    """Try alternative URL formats for a major"""
-    alternatives = []
-    
-    # Try different variations
+def candidate_slugs(major_name):
+    """Standard slug first, then the alternative spellings the calendar has used"""
     base_name = major_name.lower()
     variations = [
         base_name.replace(' ', '-'),
@@ -80,24 +89,172 @@ def try_alternative_urls(scraper, major_name):
         base_name.replace('(', ''),
         base_name.replace(')', ''),
     ]
-    
     # Remove duplicates
-    variations = list(dict.fromkeys(variations))
+    return list(dict.fromkeys([normalize_major_name(major_name)] + variations))
+
+class MajorUrlResolver:
+    """
+    Finds the working calendar URL of every major in one batch.
+    Standard slugs of all unknown majors are HEAD-probed concurrently, then the
+    alternative slugs of those that failed (de-duplicated across majors). Working
+    slugs are kept in SLUG_MAP_FILE, so later runs skip discovery for known majors.
+    """
+
+    def __init__(self, scraper, map_file=SLUG_MAP_FILE, concurrency=4):
+        self.base_path = f"{scraper.base_url}/faculties-colleges-and-schools/faculty-arts/bachelor-arts"
+        self.engine = FetchEngine(session=scraper.session, concurrency=concurrency, timeout=10)
+        self.map_file = map_file
+        self.slugs = {}
+        if os.path.exists(map_file):
+            with open(map_file, 'r', encoding='utf-8') as f:
+                self.slugs = json.load(f)
+
+    def url_for(self, slug):
+        return f"{self.base_path}/{slug}"
+
+    def _probe(self, slugs):
+        """HEAD every slug once; returns {slug: Response or Exception}"""
+        urls = {slug: self.url_for(slug) for slug in slugs}
+        if not urls:
+            return {}
+        responses = self.engine.fetch_all(urls.values(), method='HEAD', allow_redirects=True)
+        return {slug: responses[url] for slug, url in urls.items()}
+
+    def resolve(self, major_names):
+        """
+        Returns {major: {'url', 'format', 'status', 'error', 'alternatives', 'known'}}.
+        'url' is None when nothing worked; 'format' is 'standard' or 'alternative'.
+        """
+        resolved = {}
+        unknown = []
+        for major_name in major_names:
+            slug = self.slugs.get(major_name)
+            if slug is None:
+                unknown.append(major_name)
+                continue
+            standard = slug == normalize_major_name(major_name)
+            resolved[major_name] = {'url': self.url_for(slug), 'format': 'standard' if standard else 'alternative',
+                                    'status': 200, 'error': None, 'alternatives': [], 'known': True}
+
+        print(f"🔗 Resolving major URLs: {len(resolved)} known, {len(unknown)} to discover")
+        if not unknown:
+            return resolved
+
+        # Phase 1: standard slugs
+        standard = self._probe(normalize_major_name(name) for name in unknown)
+        retry = []
+        for major_name in unknown:
+            slug = normalize_major_name(major_name)
+            response = standard[slug]
+            entry = {'url': None, 'format': None, 'status': None, 'error': None, 'alternatives': [], 'known': False}
+            resolved[major_name] = entry
+            if isinstance(response, Exception):
+                entry['error'] = str(response)
+                continue
+            entry['status'] = response.status_code
+            if response.status_code == 200:
+                entry['url'], entry['format'] = self.url_for(slug), 'standard'
+                self.slugs[major_name] = slug
+            else:
+                retry.append(major_name)
+
+        # Phase 2: alternative slugs of the majors whose standard URL failed
+        if retry:
+            alternatives = {name: candidate_slugs(name)[1:] for name in retry}
+            probes = self._probe(slug for slugs in alternatives.values() for slug in slugs
+                                 if slug not in standard)
+            for major_name in retry:
+                working = [slug for slug in alternatives[major_name]
+                           if getattr(probes.get(slug, standard.get(slug)), 'status_code', None) == 200]
+                entry = resolved[major_name]
+                entry['alternatives'] = [self.url_for(slug) for slug in working]
+                if working:
+                    entry['url'], entry['format'] = self.url_for(working[0]), 'alternative'
+                    self.slugs[major_name] = working[0]
+
+        self.save()
+        return resolved
+
+    def forget(self, major_name):
+        """Drop a known slug that no longer yields a page, so the next run rediscovers it"""
+        if self.slugs.pop(major_name, None) is not None:
+            self.save()
+
+    def save(self):
+        write_json(self.map_file, dict(sorted(self.slugs.items())))
+
+def scrape_one_major(scraper, major_name, resolution):
+    """
+    Scrape one major at its resolved URL. Returns its outcome: {'category':
+    'successful' | 'no_data' | 'failed' | 'error', 'entry': {...},
+    'different_format': {...} or None}
+    """
+    standard_url = construct_major_url(scraper.base_url, major_name)
+    url = resolution['url']
     
-    base_path = f"{scraper.base_url}/faculties-colleges-and-schools/faculty-arts/bachelor-arts"
+    if resolution['error']:
+        print(f"  ❌ Error: {resolution['error']}")
+        return {'category': 'error', 'different_format': None, 'entry': {
+            'major': major_name,
+            'url': standard_url,
+            'error': resolution['error'],
+            'reason': 'Exception during scraping'
+        }}
     
-    for variation in variations:
-        url = f"{base_path}/{variation}"
-        try:
-            response = scraper.session.head(url, timeout=5, allow_redirects=True)
-            if response.status_code == 200:
-                alternatives.append(url)
-        except:
-            pass
+    if url is None:
+        # No working alternative found
+        print(f"  🔍 Standard URL failed, no alternative found")
+        print(f"  ❌ URL not found: {standard_url} (Status: {resolution['status']})")
+        return {'category': 'failed', 'different_format': None, 'entry': {
+            'major': major_name,
+            'url': standard_url,
+            'status': resolution['status'],
+            'reason': 'URL not found',
+            'alternatives_tried': resolution['alternatives']
+        }}
+    
+    if resolution['format'] == 'alternative':
+        print(f"  🔄 Using alternative: {url}")
     
-    return alternatives
+    try:
+        curriculum = scraper.scrape_major_requirements(url, major_name)
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        return {'category': 'error', 'different_format': None, 'entry': {
+            'major': major_name,
+            'url': url,
+            'error': str(e),
+            'reason': 'Exception during scraping'
+        }}
+    
+    if curriculum and any(curriculum.values()):
+        if resolution['format'] == 'standard':
+            print(f"  ✅ Successfully scraped {major_name}")
+            return {'category': 'successful', 'different_format': None, 'entry': {
+                'major': major_name,
+                'url': standard_url,
+                'format': 'standard'
+            }}
+        print(f"  ✅ Successfully scraped with alternative URL")
+        return {'category': 'successful', 'entry': {
+            'major': major_name,
+            'url': url,
+            'format': 'alternative',
+            'standard_url': standard_url
+        }, 'different_format': {
+            'major': major_name,
+            'standard_url': standard_url,
+            'working_url': url
+        }}
+    
+    print(f"  ⚠️  No curriculum data found for {major_name}")
+    return {'category': 'no_data', 'different_format': None, 'entry': {
+        'major': major_name,
+        'url': url,
+        'reason': 'No curriculum data found'
+    }}
 
-def main():
+def main(resume=False):
     print("=" * 80)
     print("Arts Major Scraper - Batch Processing")
     print("=" * 80)
@@ -109,90 +266,42 @@ def main():
     print(f"Found {len(ba_majors)} BA majors to scrape")
     print()
     
+    # Every finished major is checkpointed; --resume skips them after an interrupted run
+    checkpoint = Checkpoint(CHECKPOINT_FILE, resume=resume)
+    
+    # Discover every remaining major's URL up front in one concurrent batch
+    resolver = MajorUrlResolver(scraper)
+    resolutions = resolver.resolve([name for name in ba_majors if name not in checkpoint])
+    print()
+    
     successful = []
     failed = []
     different_format = []
     no_data = []
     
     for i, major_name in enumerate(ba_majors, 1):
-        print(f"[{i}/{len(ba_majors)}] Processing: {major_name}")
-        
-        # Try standard URL format
-        standard_url = construct_major_url(scraper.base_url, major_name)
-        
-        # Check if URL exists
-        try:
-            response = scraper.session.head(standard_url, timeout=10, allow_redirects=True)
-            if response.status_code == 200:
-                # Use GET for actual scraping
-                response = scraper.session.get(standard_url, timeout=10)
-                # Try to scrape
-                curriculum = scraper.scrape_major_requirements(standard_url, major_name)
-                
-                if curriculum and any(curriculum.values()):
-                    successful.append({
-                        'major': major_name,
-                        'url': standard_url,
-                        'format': 'standard'
-                    })
-                    print(f"  ✅ Successfully scraped {major_name}")
-                else:
-                    no_data.append({
-                        'major': major_name,
-                        'url': standard_url,
-                        'reason': 'No curriculum data found'
-                    })
-                    print(f"  ⚠️  No curriculum data found for {major_name}")
-            else:
-                # URL doesn't exist, try alternative formats
-                print(f"  🔍 Standard URL failed, trying alternatives...")
-                alternative_urls = try_alternative_urls(scraper, major_name)
-                
-                if alternative_urls:
-                    # Try the first alternative
-                    alt_url = alternative_urls[0]
-                    print(f"  🔄 Trying alternative: {alt_url}")
-                    try:
-                        response = scraper.session.get(alt_url, timeout=10)
-                        if response.status_code == 200:
-                            curriculum = scraper.scrape_major_requirements(alt_url, major_name)
-                            if curriculum and any(curriculum.values()):
-                                successful.append({
-                                    'major': major_name,
-                                    'url': alt_url,
-                                    'format': 'alternative',
-                                    'standard_url': standard_url
-                                })
-                                different_format.append({
-                                    'major': major_name,
-                                    'standard_url': standard_url,
-                                    'working_url': alt_url
-                                })
-                                print(f"  ✅ Successfully scraped with alternative URL")
-                                continue
-                    except Exception as e:
-                        pass
-                
-                # No working alternative found
-                failed.append({
-                    'major': major_name,
-                    'url': standard_url,
-                    'status': response.status_code,
-                    'reason': 'URL not found',
-                    'alternatives_tried': alternative_urls
-                })
-                print(f"  ❌ URL not found: {standard_url} (Status: {response.status_code})")
-                
-        except Exception as e:
-            failed.append({
-                'major': major_name,
-                'url': standard_url,
-                'error': str(e),
-                'reason': 'Exception during scraping'
-            })
-            print(f"  ❌ Error: {e}")
+        if major_name in checkpoint:
+            print(f"[{i}/{len(ba_majors)}] Already processed: {major_name} (checkpoint)")
+            outcome = checkpoint.get(major_name)
+        else:
+            print(f"[{i}/{len(ba_majors)}] Processing: {major_name}")
+            outcome = scrape_one_major(scraper, major_name, resolutions[major_name])
+            # A remembered slug that stopped working is rediscovered next run
+            if resolutions[major_name]['known'] and outcome['category'] != 'successful':
+                resolver.forget(major_name)
+            # Exceptions (timeouts, blocks) are retried on --resume; everything else is final
+            if outcome['category'] != 'error':
+                checkpoint.record(major_name, outcome)
+            print()
         
-        print()
+        if outcome['category'] == 'successful':
+            successful.append(outcome['entry'])
+        elif outcome['category'] == 'no_data':
+            no_data.append(outcome['entry'])
+        else:
+            failed.append(outcome['entry'])
+        if outcome['different_format']:
+            different_format.append(outcome['different_format'])
     
     # Save results
     results = {
@@ -215,8 +324,11 @@ def main():
     
     results_file = os.path.join(project_root, 'scraper', 'curriculum', 'arts_scraping_results.json')
     
-    with open(results_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    write_json(results_file, results)
+    if any('error' in item for item in failed):
+        checkpoint.close()
+    else:
+        checkpoint.discard()
     
     # Print summary
     print("=" * 80)
@@ -265,4 +377,5 @@ def main():
     return results
 
 if __name__ == '__main__':
-    main()
+    fixtures.configure_from_argv()
+    main(resume='--resume' in sys.argv)
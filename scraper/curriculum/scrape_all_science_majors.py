@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 """
 Batch scraper for all UBC Science majors.
-This script runs scrape_single_science_major.py for each major.
+All majors are scraped in this process with UBCSingleScienceMajorScraper's batch
+mode: one shared HTTP session fetches the pages concurrently, a pool of
+--workers N processes (default 4) parses them, and science_curriculum.json is
+written once with every result merged.
+Pass --record ARCHIVE / --replay ARCHIVE to record or replay every major's pages.
+Finished majors are checkpointed (scraper/data/science_majors.checkpoint.jsonl);
+--resume skips them after an interrupted or partly failed run.
 """
 
-import subprocess
 import sys
 import os
 
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.checkpoint import Checkpoint
+from scraper.curriculum.scrape_single_science_major import UBCSingleScienceMajorScraper
+
+CHECKPOINT_FILE = os.path.join(project_root, 'scraper', 'data', 'science_majors.checkpoint.jsonl')
+
 # List of all Science majors (matching the format expected by the scraper)
 SCIENCE_MAJORS = [
     "Astronomy",
@@ -41,48 +56,35 @@ SCIENCE_MAJORS = [
     "Zoology"
 ]
 
-def scrape_major(major_name):
-    """Scrape a single major and return success status"""
-    print(f"\n{'='*70}")
-    print(f"Scraping: {major_name}")
-    print(f"{'='*70}")
-    
-    script_path = os.path.join(os.path.dirname(__file__), 'scrape_single_science_major.py')
-    
-    try:
-        result = subprocess.run(
-            [sys.executable, script_path, major_name],
-            capture_output=False,
-            text=True,
-            check=True
-        )
-        print(f"✓ Successfully scraped: {major_name}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Failed to scrape: {major_name}")
-        print(f"  Error: {e}")
-        return False
-    except Exception as e:
-        print(f"✗ Unexpected error scraping {major_name}: {e}")
-        return False
-
 def main():
     """Main entry point"""
+    fixtures.configure_from_argv()
     print("="*70)
     print("UBC Science Majors Batch Scraper")
     print("="*70)
     print(f"Total majors to scrape: {len(SCIENCE_MAJORS)}")
     print("="*70)
     
-    successful = []
-    failed = []
+    workers = 4
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    
+    checkpoint = Checkpoint(CHECKPOINT_FILE, resume='--resume' in sys.argv)
+    results = UBCSingleScienceMajorScraper.scrape_batch(SCIENCE_MAJORS, workers=workers, checkpoint=checkpoint)
+    successful = [major for major, curriculum in results.items() if curriculum]
+    failed = [major for major, curriculum in results.items() if not curriculum]
+    
+    # One read-merge-write of science_curriculum.json for every scraped major
+    print(f"\n{'='*70}")
+    print("Saving results...")
+    print(f"{'='*70}")
+    UBCSingleScienceMajorScraper.save_batch(results)
     
-    for i, major in enumerate(SCIENCE_MAJORS, 1):
-        print(f"\n[{i}/{len(SCIENCE_MAJORS)}] Processing: {major}")
-        if scrape_major(major):
-            successful.append(major)
-        else:
-            failed.append(major)
+    # Keep the checkpoint while majors are missing so --resume retries only those
+    if failed:
+        checkpoint.close()
+    else:
+        checkpoint.discard()
     
     # Summary
     print("\n" + "="*70)
@@ -101,7 +103,9 @@ def main():
         print(f"\n✗ Failed majors:")
         for major in failed:
             print(f"  - {major}")
-        print("\nYou can retry failed majors individually:")
+        print("\nRetry only the failed majors with:")
+        print("  python scraper/curriculum/scrape_all_science_majors.py --resume")
+        print("or individually:")
         for major in failed:
             print(f"  python scraper/curriculum/scrape_single_science_major.py \"{major}\"")
     
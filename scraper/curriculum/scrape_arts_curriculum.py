@@ -6,23 +6,31 @@ Uses sibling traversal logic because Arts requirements are structured as headers
 Usage:
     python scraper/curriculum/scrape_arts_curriculum.py
     python scraper/curriculum/scrape_arts_curriculum.py --major "Anthropology"
+    python scraper/curriculum/scrape_arts_curriculum.py --record fixtures/arts.zip   (or --replay)
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
-import time
 import os
 import sys
 from typing import Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 
+# Add project root to path so the shared scraper utilities can be imported
+# File is at: scraper/curriculum/scrape_arts_curriculum.py
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.fetch_engine import polite_wait
+from scraper.utils.http_cache import CachedSession
+
 class UBCArtsCurriculumScraper:
     def __init__(self):
         self.base_url = "https://vancouver.calendar.ubc.ca"
         self.ba_url = f"{self.base_url}/faculties-colleges-and-schools/faculty-arts/bachelor-arts"
-        self.session = requests.Session()
+        self.session = CachedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -242,6 +250,9 @@ class UBCArtsCurriculumScraper:
         """
         try:
             print(f"  Scraping {major_name}...")
+            # Be polite - wait for the host's rate budget (skipped for cached pages)
+            if not self.session.is_fresh(major_url):
+                polite_wait(major_url)
             response = self.session.get(major_url, timeout=15)
             response.raise_for_status()
             
@@ -544,9 +555,6 @@ class UBCArtsCurriculumScraper:
                 curriculum = self.scrape_major_requirements(major_url, major_name)
                 if curriculum:
                     all_curriculum[major_name] = curriculum
-                
-                # Be polite - add delay between requests
-                time.sleep(1)
         
         # Save to JSON
         print("\n" + "=" * 70)
@@ -560,6 +568,7 @@ class UBCArtsCurriculumScraper:
 
 def main():
     """Main entry point"""
+    fixtures.configure_from_argv()
     scraper = UBCArtsCurriculumScraper()
     
     # Check for specific major argument
@@ -11,7 +11,6 @@ Usage:
 import sys
 import os
 import json
-import time
 
 # Add project root to path
 script_path = os.path.abspath(__file__)
@@ -19,6 +18,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_path)))
 sys.path.insert(0, project_root)
 
 from scraper.curriculum.scrape_arts_curriculum import UBCArtsCurriculumScraper
+from scraper.utils import fixtures
 
 # BFA Majors list
 BFA_MAJORS = [
@@ -88,8 +88,6 @@ def main():
             failed.append(major_name)
             print(f"  ❌ Failed to scrape {major_name}")
         
-        # Be polite - add delay between requests
-        time.sleep(1)
         print()
     
     # Save updated curriculum
@@ -117,4 +115,5 @@ def main():
     print("=" * 80)
 
 if __name__ == '__main__':
+    fixtures.configure_from_argv()
     main()
@@ -4,23 +4,30 @@ Special scraper for CPSC that handles the edge case where Year 1 is in a separat
 from Years 2-4.
 
 Usage:
-    python scraper/curriculum/scrape_cpsc_curriculum.py
+    python scraper/curriculum/scrape_cpsc_curriculum.py [--record ARCHIVE | --replay ARCHIVE]
 """
 
-import requests
 from bs4 import BeautifulSoup
 import json
 import re
 import time
 import os
+import sys
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.http_cache import CachedSession
+
 class UBCCPSCCurriculumScraper:
     def __init__(self):
         self.base_url = "https://vancouver.calendar.ubc.ca"
         self.cpsc_url = f"{self.base_url}/faculties-colleges-and-schools/faculty-science/bachelor-science/computer-science"
-        self.session = requests.Session()
+        self.session = CachedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -485,6 +492,7 @@ class UBCCPSCCurriculumScraper:
 
 
 if __name__ == "__main__":
+    fixtures.configure_from_argv()
     scraper = UBCCPSCCurriculumScraper()
     scraper.run()
 
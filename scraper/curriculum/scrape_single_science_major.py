@@ -7,24 +7,52 @@ Usage:
     python scraper/curriculum/scrape_single_science_major.py biology
     python scraper/curriculum/scrape_single_science_major.py "Computer Science"
     python scraper/curriculum/scrape_single_science_major.py chemistry
+    python scraper/curriculum/scrape_single_science_major.py chemistry --replay fixtures/science.zip
+
+Batch mode (used by scrape_all_science_majors.py): UBCSingleScienceMajorScraper.scrape_batch()
+fetches every major's page concurrently on one shared session, parses them on a
+process pool, and save_batch() merges all of them into science_curriculum.json
+with a single write.
 """
 
 import requests
 from bs4 import BeautifulSoup
+import contextlib
+import io
 import json
 import re
 import sys
 import os
-from typing import Dict, List, Optional, Tuple
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Add project root to path so the shared scraper utilities can be imported
+# File is at: scraper/curriculum/scrape_single_science_major.py
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.checkpoint import Checkpoint
+from scraper.utils.fetch_engine import FetchEngine
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
+
+
+def _parse_in_worker(major_name: str, content: bytes) -> Tuple[Optional[Dict], str]:
+    """Process-pool entry point: parse one major's page, returning (curriculum, captured output)."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        curriculum = UBCSingleScienceMajorScraper(major_name).parse_major_page_safely(content)
+    return curriculum, output.getvalue()
+
 
 class UBCSingleScienceMajorScraper:
-    def __init__(self, major_name: str):
+    def __init__(self, major_name: str, session: Optional[requests.Session] = None):
         self.base_url = "https://vancouver.calendar.ubc.ca"
         self.major_name = major_name.strip()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        # Created on first use, so parse-only instances (batch workers) never open one
+        self._session = session
         
         # Convert major name to URL slug
         self.url_slug = self.major_name.lower().replace(' ', '-').replace('&', 'and')
@@ -38,6 +66,20 @@ class UBCSingleScienceMajorScraper:
         # Also keep track of the main science_curriculum.json path for merging
         self.main_curriculum_file = os.path.join(self.output_dir, 'science_curriculum.json')
     
+    @staticmethod
+    def new_session() -> CachedSession:
+        session = CachedSession()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        })
+        return session
+    
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            self._session = self.new_session()
+        return self._session
+    
     def extract_sup_ids_and_remove(self, cell) -> List[str]:
         """Extract numeric footnote ids from <sup> (supports '8,9' and '10'), then remove <sup> tags."""
         ids = []
@@ -367,130 +409,133 @@ class UBCSingleScienceMajorScraper:
         
         return years_data
     
-    def scrape_major_curriculum(self) -> Optional[Dict]:
-        """
-        Scrape curriculum for the specified Science major.
-        Returns a dictionary with years 1-4 as keys, each containing a list of courses.
-        """
+    def print_header(self):
         print(f"\n{'='*70}")
         print(f"Scraping {self.major_name}")
         print(f"URL: {self.major_url}")
         print(f"{'='*70}")
-        
+    
+    def scrape_major_curriculum(self, response=None) -> Optional[Dict]:
+        """
+        Scrape curriculum for the specified Science major.
+        Returns a dictionary with years 1-4 as keys, each containing a list of courses.
+        `response` is the page fetched ahead of time (or the exception raised
+        fetching it); by default the page is fetched here.
+        """
+        self.print_header()
         try:
-            response = self.session.get(self.major_url, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract communication requirement courses
-            comm_requirement_courses = self.extract_communication_requirement_courses(soup)
-            
-            # Find all tables in "Degree Requirements" section
-            tables = soup.find_all('figure', class_='responsive-figure-table')
-            if not tables:
-                # Fallback: look for any table
-                tables = soup.find_all('table')
-            
-            print(f"  Found {len(tables)} table(s)")
-            
-            years_data = {
-                "1": [],
-                "2": [],
-                "3": [],
-                "4": []
-            }
-            
-            for table in tables:
-                # 1. Check if this table is actually a requirement table
-                table_text = table.get_text().lower()
-                if "year" not in table_text and "credits" not in table_text:
-                    continue
-
-                # Extract footnotes for this table
-                footnotes = self.extract_footnotes(soup, table)
-                
-                # Parse the table
-                table_years_data = self.parse_table_for_courses(
-                    table, 
-                    footnotes=footnotes,
-                    comm_requirement_courses=comm_requirement_courses
-                )
-                
-                # 2. Merge data (allow duplicates for "Electives")
-                has_data = False
-                for year_key in ["1", "2", "3", "4"]:
-                    if year_key in table_years_data and table_years_data[year_key]:
-                        # For non-Electives, check for duplicates
-                        existing_codes = {c["code"] for c in years_data[year_key] if c["code"] != "Electives"}
-                        for course in table_years_data[year_key]:
-                            # Always allow Electives, or if it's a new course code
-                            if course["code"] == "Electives" or course["code"] not in existing_codes:
-                                years_data[year_key].append(course)
-                                if course["code"] != "Electives":
-                                    existing_codes.add(course["code"])
-                        has_data = True
-
-                # 3. Stop after finding the primary requirement table
-                if "total credits for degree" in table_text or "total credits" in table_text:
-                    if has_data:
-                        print(f"  Primary requirement table found. Stopping.")
-                        break
-            
-            # Normalize years (fill missing years)
-            years_data = self.normalize_curriculum_years(years_data)
-            
-            # Report results
-            total_courses = sum(len(courses) for courses in years_data.values())
-            print(f"\n  Extracted {total_courses} courses:")
-            for year in ["1", "2", "3", "4"]:
-                count = len(years_data[year])
-                if count > 0:
-                    print(f"    Year {year}: {count} courses")
-            
-            return years_data
-            
+            content = self.fetch_major_page(response)
         except requests.exceptions.HTTPError as e:
-            print(f"  Error: HTTP {e.response.status_code} - Could not access page")
-            print(f"  Please check if the major name is correct: '{self.major_name}'")
+            self.print_http_error(e)
             return None
         except Exception as e:
             print(f"  Error scraping {self.major_name}: {e}")
-            import traceback
             traceback.print_exc()
             return None
+        return self.parse_major_page_safely(content)
     
-    def run(self):
-        """Main execution method"""
-        print("=" * 70)
-        print("UBC Single Science Major Curriculum Scraper")
-        print("=" * 70)
-        print(f"\nMajor: {self.major_name}")
-        print(f"URL Slug: {self.url_slug}")
+    def fetch_major_page(self, response=None) -> bytes:
+        """Page content; raises for network errors and HTTP error statuses."""
+        if response is None:
+            response = self.session.get(self.major_url, timeout=15)
+        elif isinstance(response, Exception):
+            raise response
+        response.raise_for_status()
+        return response.content
+    
+    def print_http_error(self, e: requests.exceptions.HTTPError):
+        print(f"  Error: HTTP {e.response.status_code} - Could not access page")
+        print(f"  Please check if the major name is correct: '{self.major_name}'")
+    
+    def parse_major_page_safely(self, content: bytes) -> Optional[Dict]:
+        """parse_major_page(), reporting errors and returning None instead of raising."""
+        try:
+            return self.parse_major_page(content)
+        except Exception as e:
+            print(f"  Error scraping {self.major_name}: {e}")
+            traceback.print_exc(file=sys.stdout)
+            return None
+    
+    def parse_major_page(self, content: bytes) -> Dict:
+        """Years 1-4 -> courses, from the HTML of the major's calendar page."""
+        soup = BeautifulSoup(content, 'html.parser')
         
-        # Scrape the major
-        curriculum = self.scrape_major_curriculum()
+        # Extract communication requirement courses
+        comm_requirement_courses = self.extract_communication_requirement_courses(soup)
         
-        if not curriculum:
-            print("\n" + "=" * 70)
-            print("Scraping Failed!")
-            print("=" * 70)
-            return
+        # Find all tables in "Degree Requirements" section
+        tables = soup.find_all('figure', class_='responsive-figure-table')
+        if not tables:
+            # Fallback: look for any table
+            tables = soup.find_all('table')
         
-        # Save results
-        print(f"\n{'='*70}")
-        print("Saving results...")
-        print(f"{'='*70}")
+        print(f"  Found {len(tables)} table(s)")
         
-        # Merge into main science_curriculum.json file
-        main_file = os.path.join(self.output_dir, 'science_curriculum.json')
+        years_data = {
+            "1": [],
+            "2": [],
+            "3": [],
+            "4": []
+        }
         
-        # Load existing data if file exists
-        if os.path.exists(main_file):
-            with open(main_file, 'r', encoding='utf-8') as f:
-                all_curriculum = json.load(f)
-        else:
-            all_curriculum = {}
+        for table in tables:
+            # 1. Check if this table is actually a requirement table
+            table_text = table.get_text().lower()
+            if "year" not in table_text and "credits" not in table_text:
+                continue
+
+            # Extract footnotes for this table
+            footnotes = self.extract_footnotes(soup, table)
+            
+            # Parse the table
+            table_years_data = self.parse_table_for_courses(
+                table, 
+                footnotes=footnotes,
+                comm_requirement_courses=comm_requirement_courses
+            )
+            
+            # 2. Merge data (allow duplicates for "Electives")
+            has_data = False
+            for year_key in ["1", "2", "3", "4"]:
+                if year_key in table_years_data and table_years_data[year_key]:
+                    # For non-Electives, check for duplicates
+                    existing_codes = {c["code"] for c in years_data[year_key] if c["code"] != "Electives"}
+                    for course in table_years_data[year_key]:
+                        # Always allow Electives, or if it's a new course code
+                        if course["code"] == "Electives" or course["code"] not in existing_codes:
+                            years_data[year_key].append(course)
+                            if course["code"] != "Electives":
+                                existing_codes.add(course["code"])
+                    has_data = True
+
+            # 3. Stop after finding the primary requirement table
+            if "total credits for degree" in table_text or "total credits" in table_text:
+                if has_data:
+                    print(f"  Primary requirement table found. Stopping.")
+                    break
+        
+        # Normalize years (fill missing years)
+        years_data = self.normalize_curriculum_years(years_data)
         
+        # Report results
+        total_courses = sum(len(courses) for courses in years_data.values())
+        print(f"\n  Extracted {total_courses} courses:")
+        for year in ["1", "2", "3", "4"]:
+            count = len(years_data[year])
+            if count > 0:
+                print(f"    Year {year}: {count} courses")
+        
+        return years_data
+    
+    def load_main_curriculum(self) -> Dict:
+        """science_curriculum.json, or {} if it does not exist yet."""
+        if os.path.exists(self.main_curriculum_file):
+            with open(self.main_curriculum_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+    
+    def merge_into(self, all_curriculum: Dict, curriculum: Dict) -> str:
+        """Put this major's curriculum into the combined dict; returns the key used."""
         # Find the correct key (case-insensitive match) or use capitalized version
         # This ensures we update the existing "Biology" entry, not create a duplicate "biology"
         existing_key = None
@@ -516,30 +561,141 @@ class UBCSingleScienceMajorScraper:
         
         # Update the specific major's data
         all_curriculum[major_key] = curriculum
+        return major_key
+    
+    def save_backup(self, curriculum: Dict):
+        """Also save the major as a separate file for backup."""
+        safe_filename = self.major_name.lower().replace(' ', '_').replace('&', 'and')
+        backup_file = os.path.join(self.output_dir, f'{safe_filename}_curriculum.json')
+        write_json(backup_file, {self.major_name: curriculum})
+        print(f"  Backup saved: {backup_file}")
+    
+    def run(self):
+        """Main execution method"""
+        print("=" * 70)
+        print("UBC Single Science Major Curriculum Scraper")
+        print("=" * 70)
+        print(f"\nMajor: {self.major_name}")
+        print(f"URL Slug: {self.url_slug}")
         
-        # Save updated data
-        with open(main_file, 'w', encoding='utf-8') as f:
-            json.dump(all_curriculum, f, indent=2, ensure_ascii=False)
+        # Scrape the major
+        curriculum = self.scrape_major_curriculum()
         
-        print(f"\n  Updated: {main_file}")
+        if not curriculum:
+            print("\n" + "=" * 70)
+            print("Scraping Failed!")
+            print("=" * 70)
+            return
+        
+        # Save results
+        print(f"\n{'='*70}")
+        print("Saving results...")
+        print(f"{'='*70}")
+        
+        # Merge into main science_curriculum.json file
+        all_curriculum = self.load_main_curriculum()
+        major_key = self.merge_into(all_curriculum, curriculum)
+        write_json(self.main_curriculum_file, all_curriculum)
+        
+        print(f"\n  Updated: {self.main_curriculum_file}")
         print(f"  Updated major: {major_key}")
         print(f"  Total courses: {sum(len(courses) for courses in curriculum.values())}")
         
-        # Also save as separate file for backup
-        safe_filename = self.major_name.lower().replace(' ', '_').replace('&', 'and')
-        backup_file = os.path.join(self.output_dir, f'{safe_filename}_curriculum.json')
-        backup_data = {self.major_name: curriculum}
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(backup_data, f, indent=2, ensure_ascii=False)
-        print(f"  Backup saved: {backup_file}")
+        self.save_backup(curriculum)
         
         print("\n" + "=" * 70)
         print("Scraping Complete!")
         print("=" * 70)
+    
+    # ----------------------------
+    # Batch mode
+    # ----------------------------
+    @classmethod
+    def scrape_batch(cls, major_names: Iterable[str], workers: int = 4,
+                     checkpoint: Optional[Checkpoint] = None) -> Dict[str, Optional[Dict]]:
+        """
+        Scrape many majors in this process: pages are fetched concurrently on one
+        shared session (per-host rate limit, HTTP cache, fixtures), then parsed on
+        a pool of `workers` processes. Majors already in `checkpoint` are reused;
+        newly parsed ones are recorded as they finish.
+        Returns {major name: curriculum, or None if it failed}, in input order.
+        """
+        session = cls.new_session()
+        scrapers = [cls(name, session=session) for name in major_names]
+        results: Dict[str, Optional[Dict]] = {}
+        
+        todo = []
+        for scraper in scrapers:
+            if checkpoint is not None and scraper.major_name in checkpoint:
+                results[scraper.major_name] = checkpoint.get(scraper.major_name)
+            else:
+                todo.append(scraper)
+        if len(todo) < len(scrapers):
+            print(f"  {len(scrapers) - len(todo)} major(s) already scraped (checkpoint)")
+        
+        # Fetch every page up front, concurrently under the calendar's rate limit
+        engine = FetchEngine(session=session, concurrency=workers)
+        responses = engine.fetch_all(scraper.major_url for scraper in todo) if todo else {}
+        
+        pages = []
+        for scraper in todo:
+            try:
+                pages.append((scraper, scraper.fetch_major_page(responses[scraper.major_url])))
+            except requests.exceptions.HTTPError as e:
+                scraper.print_header()
+                scraper.print_http_error(e)
+                results[scraper.major_name] = None
+            except Exception as e:
+                scraper.print_header()
+                print(f"  Error scraping {scraper.major_name}: {e}")
+                results[scraper.major_name] = None
+        
+        # Parse on a process pool (HTML parsing is CPU-bound); each major's output is printed as a block
+        def finished(scraper, curriculum):
+            results[scraper.major_name] = curriculum
+            if curriculum and checkpoint is not None:
+                checkpoint.record(scraper.major_name, curriculum)
+        
+        if workers > 1 and len(pages) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pages))) as pool:
+                parsed = pool.map(_parse_in_worker, [s.major_name for s, _ in pages], [c for _, c in pages])
+                for (scraper, _), (curriculum, output) in zip(pages, parsed):
+                    scraper.print_header()
+                    print(output, end='')
+                    finished(scraper, curriculum)
+        else:
+            for scraper, content in pages:
+                scraper.print_header()
+                finished(scraper, scraper.parse_major_page_safely(content))
+        
+        return {scraper.major_name: results.get(scraper.major_name) for scraper in scrapers}
+    
+    @classmethod
+    def save_batch(cls, results: Dict[str, Optional[Dict]]) -> List[str]:
+        """Merge every scraped major into science_curriculum.json with one write; returns the keys updated."""
+        scraped = {name: curriculum for name, curriculum in results.items() if curriculum}
+        if not scraped:
+            return []
+        
+        scrapers = [cls(name) for name in scraped]
+        all_curriculum = scrapers[0].load_main_curriculum()
+        major_keys = []
+        for scraper in scrapers:
+            print(f"\n{scraper.major_name}:")
+            major_keys.append(scraper.merge_into(all_curriculum, scraped[scraper.major_name]))
+            scraper.save_backup(scraped[scraper.major_name])
+        
+        main_file = scrapers[0].main_curriculum_file
+        if write_json(main_file, all_curriculum):
+            print(f"\n  Updated: {main_file} ({len(major_keys)} major(s))")
+        else:
+            print(f"\n  Unchanged: {main_file}")
+        return major_keys
 
 
 def main():
     """Main entry point"""
+    fixtures.configure_from_argv()
     if len(sys.argv) < 2:
         print("Usage: python scrape_single_science_major.py <major_name>")
         print("\nExamples:")
@@ -6,7 +6,6 @@ Script to scrape all successful Arts majors and update arts_curriculum.json
 import sys
 import os
 import json
-import time
 
 # Add project root to path
 script_path = os.path.abspath(__file__)
@@ -14,6 +13,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(script_path)))
 sys.path.insert(0, project_root)
 
 from scraper.curriculum.scrape_arts_curriculum import UBCArtsCurriculumScraper
+from scraper.utils import fixtures
 
 def load_scraping_results():
     """Load the scraping results to get list of successful majors"""
@@ -123,8 +123,6 @@ def main():
         else:
             print(f"  ⚠️  No curriculum data found for {major_name}")
         
-        # Be polite - add delay between requests
-        time.sleep(1)
         print()
     
     # Save updated curriculum
@@ -143,4 +141,5 @@ def main():
     print("=" * 80)
 
 if __name__ == '__main__':
+    fixtures.configure_from_argv()
     main()
@@ -4,121 +4,94 @@ Apply province-specific course code mappings to the scraped requirements
 """
 
 import json
+import os
 import re
+import sys
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils.requirements_walker import RequirementsPipeline
 
 def load_mappings():
     """Load province course mappings"""
     with open('province_course_mappings.json', 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def map_requirement_to_province(requirement_text, province_name, mappings):
-    """Map a generic requirement to province-specific course codes"""
-    if province_name not in mappings['mappings']:
-        return [requirement_text]  # Return as-is if province not mapped
-    
-    province_map = mappings['mappings'][province_name]
+class ProvinceMapper:
+    """
+    Maps generic requirements to province-specific course codes. Each province's
+    generic phrases are lowercased once, and results are memoized per
+    (province, requirement) since most degrees share requirement text.
+    """
     
-    # Try exact match first
-    if requirement_text in province_map:
-        return province_map[requirement_text]
-    
-    # Try partial matches
-    for generic, specific in province_map.items():
-        if generic.lower() in requirement_text.lower():
-            # Replace the generic part with specific codes
-            return specific
-    
-    # Return original if no mapping found
-    return [requirement_text]
-
-def apply_mappings_to_data(input_file, output_file, mappings):
-    """Apply province mappings to the scraped data"""
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    def __init__(self, mappings):
+        self.mappings = mappings['mappings']
+        self.phrases = {province: [(generic.lower(), specific) for generic, specific in province_map.items()]
+                        for province, province_map in self.mappings.items()}
+        self.memo = {}
     
-    total_mapped = 0
+    def map(self, requirement_text, province_name):
+        """Map a generic requirement to province-specific course codes"""
+        key = (province_name, requirement_text)
+        if key not in self.memo:
+            self.memo[key] = self._map(requirement_text, province_name)
+        return self.memo[key]
     
-    # Process each province
-    for province_name, province_data in data.get('provinces', {}).items():
-        print(f"\nProcessing: {province_name}")
+    def _map(self, requirement_text, province_name):
+        if province_name not in self.mappings:
+            return [requirement_text]  # Return as-is if province not mapped
+        
+        province_map = self.mappings[province_name]
         
-        # Check if degrees are nested under faculty or directly under province
-        degrees_dict = province_data.get('degrees', {})
+        # Try exact match first
+        if requirement_text in province_map:
+            return province_map[requirement_text]
         
-        # Handle two possible structures:
-        # 1. degrees[degree_name] = degree_data (flat)
-        # 2. degrees[faculty_name][degree_name] = degree_data (nested)
+        # Try partial matches: first generic phrase (in mapping order) contained in the requirement
+        text = requirement_text.lower()
+        for generic, specific in self.phrases[province_name]:
+            if generic in text:
+                return specific
         
-        # Try to determine structure
-        if degrees_dict:
-            first_value = next(iter(degrees_dict.values()))
-            
-            # If first value is a dict with 'grade_12_requirements', it's flat structure
-            if isinstance(first_value, dict) and 'grade_12_requirements' in first_value:
-                # Flat structure: process directly
-                for degree_name, degree_data in degrees_dict.items():
-                    if not isinstance(degree_data, dict):
-                        continue
-                    
-                    # Map Grade 12 requirements
-                    if degree_data.get('grade_12_requirements'):
-                        new_g12 = []
-                        for req in degree_data['grade_12_requirements']:
-                            mapped = map_requirement_to_province(req, province_name, mappings)
-                            if mapped != [req]:  # Something was mapped
-                                total_mapped += 1
-                                print(f"  ✓ {degree_name}: '{req}' → {mapped}")
-                            new_g12.extend(mapped)
-                        degree_data['grade_12_requirements'] = new_g12
-                    
-                    # Map Grade 11 requirements
-                    if degree_data.get('grade_11_requirements'):
-                        new_g11 = []
-                        for req in degree_data['grade_11_requirements']:
-                            mapped = map_requirement_to_province(req, province_name, mappings)
-                            if mapped != [req]:
-                                total_mapped += 1
-                                print(f"  ✓ {degree_name}: '{req}' → {mapped}")
-                            new_g11.extend(mapped)
-                        degree_data['grade_11_requirements'] = new_g11
-            else:
-                # Nested structure: iterate through faculties first
-                for faculty_name, faculty_degrees in degrees_dict.items():
-                    if not isinstance(faculty_degrees, dict):
-                        continue
-                    for degree_name, degree_data in faculty_degrees.items():
-                        if not isinstance(degree_data, dict):
-                            continue
-                        
-                        # Map Grade 12 requirements
-                        if degree_data.get('grade_12_requirements'):
-                            new_g12 = []
-                            for req in degree_data['grade_12_requirements']:
-                                mapped = map_requirement_to_province(req, province_name, mappings)
-                                if mapped != [req]:
-                                    total_mapped += 1
-                                    print(f"  ✓ {faculty_name}/{degree_name}: '{req}' → {mapped}")
-                                new_g12.extend(mapped)
-                            degree_data['grade_12_requirements'] = new_g12
-                        
-                        # Map Grade 11 requirements
-                        if degree_data.get('grade_11_requirements'):
-                            new_g11 = []
-                            for req in degree_data['grade_11_requirements']:
-                                mapped = map_requirement_to_province(req, province_name, mappings)
-                                if mapped != [req]:
-                                    total_mapped += 1
-                                    print(f"  ✓ {faculty_name}/{degree_name}: '{req}' → {mapped}")
-                                new_g11.extend(mapped)
-                            degree_data['grade_11_requirements'] = new_g11
+        # Return original if no mapping found
+        return [requirement_text]
+
+def mapping_transform(mapper, counter):
+    """
+    RequirementsPipeline transform replacing each requirement with its
+    province-specific codes; counter['mapped'] counts the replacements.
+    """
+    current = {'province': None}
     
-    # Save the enhanced data
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    def transform(province_name, faculty_name, degree_name, field, requirements):
+        if province_name != current['province']:
+            current['province'] = province_name
+            print(f"\nProcessing: {province_name}")
+        label = f"{faculty_name}/{degree_name}" if faculty_name else degree_name
+        mapped_requirements = []
+        for req in requirements:
+            mapped = mapper.map(req, province_name)
+            if mapped != [req]:  # Something was mapped
+                counter['mapped'] += 1
+                print(f"  ✓ {label}: '{req}' → {mapped}")
+            mapped_requirements.extend(mapped)
+        return mapped_requirements
+    
+    return transform
+
+def apply_mappings_to_data(input_file, output_file, mapper):
+    """Apply province mappings to the scraped data"""
+    # One pass over both layouts: degrees[degree] and degrees[faculty][degree]
+    counter = {'mapped': 0}
+    pipeline = RequirementsPipeline()
+    pipeline.add_transform(mapping_transform(mapper, counter))
+    report = pipeline.run_file(input_file, output_file)
     
     print(f"\n{'=' * 80}")
-    print(f"✓ Applied {total_mapped} province-specific mappings")
-    print(f"✓ Saved to: {output_file}")
+    print(f"✓ Applied {counter['mapped']} province-specific mappings")
+    print(f"✓ Saved to: {output_file}" if report.written else f"✓ Unchanged: {output_file}")
     print(f"{'=' * 80}")
 
 def main():
@@ -128,12 +101,13 @@ def main():
     
     mappings = load_mappings()
     print(f"\n✓ Loaded mappings for {len(mappings['mappings'])} provinces")
+    mapper = ProvinceMapper(mappings)
     
     # Apply to the raw scraped data
     apply_mappings_to_data(
         'data/vancouver_detailed_requirements.json',
         'data/vancouver_detailed_requirements_enhanced.json',
-        mappings
+        mapper
     )
     
     # Also apply to the processed data if it exists
@@ -141,7 +115,7 @@ def main():
         apply_mappings_to_data(
             '../src/data/detailed_requirements.json',
             '../src/data/detailed_requirements_enhanced.json',
-            mappings
+            mapper
         )
     except FileNotFoundError:
         print("\n⚠ src/data/detailed_requirements.json not found, skipping frontend enhancement")
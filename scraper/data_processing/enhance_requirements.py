@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Enhance and verify the scraped admission requirements in one pass
+Registers every requirement transform and check on a single
+RequirementsPipeline, so the data is loaded once, walked once and written once
+(run_file), instead of once per script:
+
+1. Bullet-format check on the scraped text (check_all_bullet_formats.py)
+2. Province-specific course code mappings (apply_province_mappings.py)
+3. Compound science requirements kept on one line (fix_all_compound_requirements.py)
+4. BC codes outside BC and leftover generic formats (verify_all_requirements.py)
+
+Run from scraper/ (paths are relative to it):
+    python data_processing/enhance_requirements.py
+Exits 1 if step 4 finds issues.
+"""
+
+import os
+import sys
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.data_processing.apply_province_mappings import ProvinceMapper, load_mappings, mapping_transform
+from scraper.data_processing.fix_all_compound_requirements import compound_science_transform
+from scraper.utils.requirements_walker import RequirementsPipeline
+from scraper.verification.check_all_bullet_formats import bullet_format_check
+from scraper.verification.verify_all_requirements import requirement_checks
+
+INPUT_FILE = 'data/vancouver_detailed_requirements.json'
+OUTPUT_FILE = 'data/vancouver_detailed_requirements_enhanced.json'
+
+def build_pipeline(mapper, counter):
+    """Every requirement transform and check, in the order the separate scripts ran"""
+    pipeline = RequirementsPipeline()
+    pipeline.add_check(bullet_format_check, on_input=True)
+    pipeline.add_transform(mapping_transform(mapper, counter))
+    pipeline.add_transform(compound_science_transform(counter))
+    pipeline.add_check(requirement_checks)
+    return pipeline
+
+def main():
+    print("=" * 80)
+    print("Enhancing and Verifying Admission Requirements")
+    print("=" * 80)
+
+    mappings = load_mappings()
+    print(f"\n✓ Loaded mappings for {len(mappings['mappings'])} provinces")
+
+    counter = {'mapped': 0, 'fixed': 0}
+    report = build_pipeline(ProvinceMapper(mappings), counter).run_file(INPUT_FILE, OUTPUT_FILE)
+
+    # Bullet-format notes are dicts, verification issues are strings
+    formats = [issue for issue in report.issues if isinstance(issue, dict)]
+    degrees_with_issues = 0
+    for (province_name, faculty_name, degree_name), issues in report.degrees.items():
+        problems = [issue for issue in issues if not isinstance(issue, dict)]
+        if problems:
+            degrees_with_issues += 1
+            print(f"\n  ⚠️  {province_name} - {degree_name}:")
+            for issue in problems:
+                print(f"      - {issue}")
+    total_issues = len(report.issues) - len(formats)
+
+    print(f"\n{'=' * 80}")
+    print("SUMMARY")
+    print(f"{'=' * 80}")
+    print(f"✓ {report.lists} requirement lists in {len(report.degrees)} degrees, {report.changed} changed")
+    print(f"✓ Applied {counter['mapped']} province-specific mappings")
+    print(f"✓ Fixed {counter['fixed']} compound science requirements")
+    print(f"✓ {len(formats)} requirements in compound \"X, Y, or Z\" format (kept as one line)")
+    print(f"✓ Saved to: {OUTPUT_FILE}" if report.written else f"✓ Unchanged: {OUTPUT_FILE}")
+    if total_issues:
+        print(f"❌ Found {total_issues} issues in {degrees_with_issues} degrees")
+    else:
+        print("✅ ALL REQUIREMENTS ARE CORRECTLY FORMATTED!")
+    print(f"{'=' * 80}")
+
+    return total_issues
+
+if __name__ == '__main__':
+    sys.exit(0 if main() == 0 else 1)
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Incremental Scrape Pipeline
+Runs the scrapers and data-processing steps as a DAG of stages instead of the
+fixed chain in RUN_FULL_SCRAPE.sh.
+
+- Each stage declares its command, the files it reads (inputs: its script and
+  every project module it imports, plus its data), the files or directories it
+  produces (outputs, each owned by one stage), those it rewrites in place
+  after an upstream stage (updates) and the stages it depends on
+- A stage is skipped when its input key is unchanged since its last successful
+  run and its outputs exist. The key hashes the command, the contents of its
+  inputs (scripts included) and the output fingerprints of its dependencies,
+  so a stage reruns only when something it consumes actually changed
+- Independent stages run concurrently, except that stages sharing a
+  `resource` (the host they scrape) never overlap: requirements (you.ubc.ca)
+  runs alongside the calendar scrapers, but science majors, arts majors and
+  engineering + course details take turns on vancouver.calendar.ubc.ca so
+  their per-process rate limits never add up. Output lines are prefixed with
+  the stage name
+- Per-stage status and timings are reported at the end
+- State is kept in scraper/data/pipeline_state.json
+
+Scraping stages only read their own code, so a web-side change is not
+detected: rerun them with --force. Editing province_course_mappings.json only
+reruns province-mappings and copy-enhanced.
+
+Usage:
+    python scraper/run_pipeline.py                          # everything that is out of date
+    python scraper/run_pipeline.py province-mappings         # a stage (and its out-of-date upstream)
+    python scraper/run_pipeline.py validate-requirements     # requirements + validation gate
+    python scraper/run_pipeline.py --force requirements-scrape
+    python scraper/run_pipeline.py --list                    # stages and whether they would run
+    python scraper/run_pipeline.py --dry-run --jobs 2
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.utils.json_writer import write_bytes, write_json
+
+STATE_FILE = os.path.join(project_root, 'scraper', 'data', 'pipeline_state.json')
+
+_print_lock = threading.Lock()
+
+
+def log(message: str):
+    with _print_lock:
+        print(message, flush=True)
+
+
+class Stage:
+    """One pipeline step: a script (command) or an in-process action."""
+
+    def __init__(self, name: str, description: str, command: Optional[List[str]] = None,
+                 action: Optional[Callable[[], None]] = None, inputs: Sequence[str] = (),
+                 outputs: Sequence[str] = (), updates: Sequence[str] = (), deps: Sequence[str] = (),
+                 cwd: str = '', default: bool = True, resource: str = ''):
+        self.name = name
+        self.description = description
+        self.command = command
+        self.action = action
+        # Paths are relative to the project root
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        # Files another stage produced that this one rewrites in place
+        self.updates = list(updates)
+        self.deps = list(deps)
+        self.cwd = os.path.join(project_root, cwd)
+        # False: only run when named (or needed by a named stage)
+        self.default = default
+        # Stages with the same resource (e.g. the host they scrape) never run at once
+        self.resource = resource
+
+    def run(self) -> bool:
+        if self.action:
+            self.action()
+            return True
+        env = dict(os.environ, PYTHONUNBUFFERED='1')
+        process = subprocess.Popen([sys.executable] + self.command, cwd=self.cwd, env=env,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True, encoding='utf-8', errors='replace')
+        for line in process.stdout:
+            log(f"[{self.name}] {line.rstrip()}")
+        return process.wait() == 0
+
+
+def copy_enhanced_requirements():
+    """cp scraper/data/vancouver_detailed_requirements_enhanced.json src/data/detailed_requirements_enhanced.json"""
+    source = os.path.join(project_root, 'scraper', 'data', 'vancouver_detailed_requirements_enhanced.json')
+    target = os.path.join(project_root, 'src', 'data', 'detailed_requirements_enhanced.json')
+    with open(source, 'rb') as f:
+        changed = write_bytes(target, f.read())
+    log(f"[copy-enhanced] {'Copied' if changed else 'Unchanged'}: {os.path.relpath(target, project_root)}")
+
+
+# ----------------------------
+# Stages
+# ----------------------------
+def script_inputs(*scripts: str) -> List[str]:
+    """
+    The scripts plus every project module they import, transitively:
+    `scraper.*` modules and modules next to the importing file (the curriculum
+    scrapers import their siblings). Paths relative to the project root.
+    """
+    found: List[str] = []
+    pending = list(scripts)
+    while pending:
+        path = pending.pop(0)
+        if path in found:
+            continue
+        found.append(path)
+        full = os.path.join(project_root, path)
+        if not os.path.isfile(full):
+            continue
+        with open(full, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                if name.startswith('scraper.'):
+                    candidate = name.replace('.', '/') + '.py'
+                elif '.' not in name:
+                    candidate = os.path.join(os.path.dirname(path), name + '.py').replace(os.sep, '/')
+                else:
+                    continue
+                if os.path.isfile(os.path.join(project_root, candidate)):
+                    pending.append(candidate)
+    return found
+
+
+# Hosts scraped by more than one stage; each scraper rate-limits itself, so
+# stages on the same host are serialized rather than allowed to stack up
+ADMISSIONS = 'you.ubc.ca'
+CALENDAR = 'vancouver.calendar.ubc.ca'
+
+STAGES = [
+    # Admission requirements (RUN_FULL_SCRAPE.sh)
+    Stage('requirements-scrape', 'Scrape detailed admission requirements (Selenium, 40-60 min)',
+          command=['scraper/admission/scrape_detailed_requirements.py'],
+          inputs=script_inputs('scraper/admission/scrape_detailed_requirements.py'),
+          outputs=['scraper/data/vancouver_detailed_requirements.json'],
+          resource=ADMISSIONS),
+    Stage('requirements-process', 'Organize requirements by faculty for the frontend',
+          command=['scraper/data_processing/process_detailed_requirements.py'],
+          inputs=script_inputs('scraper/data_processing/process_detailed_requirements.py') +
+                 ['scraper/data/vancouver_detailed_requirements.json'],
+          outputs=['src/data/detailed_requirements.json'],
+          deps=['requirements-scrape']),
+    # The script resolves its paths relative to scraper/
+    Stage('province-mappings', 'Apply province-specific course code mappings',
+          command=['data_processing/apply_province_mappings.py'], cwd='scraper',
+          inputs=script_inputs('scraper/data_processing/apply_province_mappings.py') +
+                 ['scraper/province_course_mappings.json',
+                  'scraper/data/vancouver_detailed_requirements.json',
+                  'src/data/detailed_requirements.json'],
+          outputs=['scraper/data/vancouver_detailed_requirements_enhanced.json'],
+          deps=['requirements-process']),
+    Stage('copy-enhanced', 'Copy the enhanced requirements to src/data',
+          action=copy_enhanced_requirements,
+          inputs=['scraper/data/vancouver_detailed_requirements_enhanced.json'],
+          outputs=['src/data/detailed_requirements_enhanced.json'],
+          deps=['province-mappings']),
+    # Gate: fails (exit 1) while any error-level validation rule has issues; run it by name
+    Stage('validate-requirements', 'Validate the requirements data (JSON + JUnit report)',
+          command=['scraper/verification/validate_requirements.py',
+                   '--json', 'scraper/data/requirements_validation.json',
+                   '--junit', 'scraper/data/requirements_validation.xml'],
+          inputs=script_inputs('scraper/verification/validate_requirements.py') +
+                 ['scraper/data/vancouver_detailed_requirements.json'],
+          outputs=['scraper/data/requirements_validation.json',
+                   'scraper/data/requirements_validation.xml'],
+          deps=['copy-enhanced'], default=False),
+
+    # Curriculum
+    Stage('science-majors', 'Scrape every Science major',
+          command=['scraper/curriculum/scrape_all_science_majors.py'],
+          inputs=script_inputs('scraper/curriculum/scrape_all_science_majors.py'),
+          outputs=['src/data/curriculum/science'],
+          resource=CALENDAR),
+    Stage('arts-majors', 'Scrape every BA major listed in artsData.js',
+          command=['scraper/curriculum/scrape_all_arts_majors.py'],
+          inputs=script_inputs('scraper/curriculum/scrape_all_arts_majors.py') + ['src/data/artsData.js'],
+          outputs=['src/data/curriculum/arts', 'scraper/curriculum/arts_scraping_results.json'],
+          resource=CALENDAR),
+    Stage('engineering', 'Scrape the engineering curriculum (Years 1-4)',
+          command=['scripts/scrape_ubc_engineering.py'],
+          inputs=script_inputs('scripts/scrape_ubc_engineering.py'),
+          outputs=['src/data/curriculum/applied-science'],
+          resource=CALENDAR),
+
+    # Course details all rewrite src/data/curriculum/applied-science in place, so they run one
+    # after another; each reads the files as its upstream stage left them
+    Stage('apsc-details', 'Fill APSC course details',
+          command=['scripts/scrape_apsc_details.py'],
+          inputs=script_inputs('scripts/scrape_apsc_details.py'),
+          updates=['src/data/curriculum/applied-science'],
+          deps=['engineering'], resource=CALENDAR),
+    Stage('math-details', 'Fill MATH course details',
+          command=['scripts/scrape_math_details.py'],
+          inputs=script_inputs('scripts/scrape_math_details.py'),
+          outputs=['ubc_math_courses.json'],
+          updates=['src/data/curriculum/applied-science'],
+          deps=['apsc-details'], resource=CALENDAR),
+    Stage('ece-details', 'Fill ELEC/CPEN course details',
+          command=['scripts/scrape_ece_details.py'],
+          inputs=script_inputs('scripts/scrape_ece_details.py'),
+          updates=['src/data/curriculum/applied-science'],
+          deps=['math-details'], resource='ece.ubc.ca'),
+    Stage('course-details', 'Fill the remaining course details',
+          command=['scripts/scrape_course_details.py'],
+          inputs=script_inputs('scripts/scrape_course_details.py'),
+          updates=['src/data/curriculum/applied-science'],
+          deps=['ece-details'], resource=CALENDAR),
+    Stage('requisites', 'Parse requisite text into ASTs in the curriculum JSON',
+          command=['scraper/utils/requisites.py'],
+          inputs=script_inputs('scraper/utils/requisites.py'),
+          updates=['src/data/curriculum/applied-science', 'ubc_math_courses.json'],
+          deps=['course-details']),
+    Stage('course-search', 'Build the course-catalog search index',
+          command=['scraper/utils/course_search.py', '--build'],
+          inputs=script_inputs('scraper/utils/course_search.py') +
+                 ['.shared/ui-ux-pro-max/scripts/core.py',
+                  'ubc_math_courses.json',
+                  'src/data/curriculum'],
+          outputs=['src/data/course_search_index.json'],
+          deps=['science-majors', 'arts-majors', 'requisites']),
+    Stage('prereq-graph', 'Build the prerequisite graph and its closure bitsets',
+          command=['scraper/utils/prereq_graph.py', '--build'],
+          inputs=script_inputs('scraper/utils/prereq_graph.py') +
+                 ['ubc_math_courses.json',
+                  'src/data/curriculum',
+                  'src/data/engineering_prereqs.json'],
+          outputs=['src/data/prereq_graph.json'],
+          deps=['science-majors', 'arts-majors', 'requisites']),
+]
+
+
+# ----------------------------
+# Hashing
+# ----------------------------
+def _hash_path(sha, path: str):
+    """Feed a file, or every file under a directory, into `sha` (missing paths hash as such)."""
+    full = os.path.join(project_root, path)
+    if os.path.isdir(full):
+        for root, dirs, files in os.walk(full):
+            dirs.sort()
+            for name in sorted(files):
+                _hash_path(sha, os.path.relpath(os.path.join(root, name), project_root))
+        return
+    sha.update(path.replace(os.sep, '/').encode('utf-8') + b'\0')
+    if not os.path.isfile(full):
+        sha.update(b'<missing>\0')
+        return
+    with open(full, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    sha.update(b'\0')
+
+
+def fingerprint(paths: Sequence[str]) -> str:
+    sha = hashlib.sha256()
+    for path in paths:
+        _hash_path(sha, path)
+    return sha.hexdigest()
+
+
+def input_key(stage: Stage, state: Dict) -> str:
+    """Hash of what the stage consumes: command, input contents, upstream output fingerprints."""
+    sha = hashlib.sha256()
+    sha.update(json.dumps([stage.command or stage.action.__name__, stage.cwd]).encode('utf-8'))
+    sha.update(fingerprint(stage.inputs).encode('ascii'))
+    for dep in stage.deps:
+        sha.update(f"{dep}={state.get(dep, {}).get('outputs', '')}".encode('utf-8'))
+    return sha.hexdigest()
+
+
+def is_current(stage: Stage, state: Dict) -> bool:
+    recorded = state.get(stage.name)
+    if not recorded or recorded.get('inputs') != input_key(stage, state):
+        return False
+    return all(os.path.exists(os.path.join(project_root, p)) for p in stage.outputs + stage.updates)
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+class Pipeline:
+    """Runs a set of stages in dependency order, concurrently where possible."""
+
+    def __init__(self, stages: List[Stage], jobs: int = 4, force: Sequence[str] = (), dry_run: bool = False):
+        self.stages = {stage.name: stage for stage in stages}
+        owners: Dict[str, str] = {}
+        for stage in stages:
+            for path in stage.outputs:
+                if path in owners:
+                    raise ValueError(f"{path} is an output of both {owners[path]} and {stage.name}; "
+                                     f"declare it under updates= of the stage that rewrites it")
+                owners[path] = stage.name
+        self.jobs = max(1, jobs)
+        self.force = set(force)
+        self.dry_run = dry_run
+        self.state = self.load_state()
+        # name -> (status, seconds)
+        self.results: Dict[str, tuple] = {}
+
+    @staticmethod
+    def load_state() -> Dict:
+        try:
+            with open(STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def select(self, targets: Sequence[str]) -> List[str]:
+        """Targets plus everything upstream of them, in declaration order."""
+        if not targets:
+            return [name for name, stage in self.stages.items() if stage.default]
+        unknown = [t for t in targets if t not in self.stages]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+        wanted = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.stages if name in wanted]
+
+    def needs_run(self, name: str) -> bool:
+        return name in self.force or not is_current(self.stages[name], self.state)
+
+    def execute(self, name: str) -> tuple:
+        """Run one stage; returns (status, seconds)."""
+        stage = self.stages[name]
+        key = input_key(stage, self.state)
+        log(f"▶ {name}: {stage.description}")
+        started = time.perf_counter()
+        try:
+            ok = stage.run()
+        except Exception as e:
+            log(f"[{name}] ❌ {e}")
+            ok = False
+        elapsed = time.perf_counter() - started
+        if not ok:
+            return 'failed', elapsed
+        with _print_lock:
+            self.state[name] = {'inputs': key, 'outputs': fingerprint(stage.outputs + stage.updates),
+                                'finished': time.strftime('%Y-%m-%dT%H:%M:%S')}
+            write_json(STATE_FILE, self.state)
+        return 'ran', elapsed
+
+    def plan(self, name: str, deps: List[str]) -> Optional[str]:
+        """Status of a stage whose dependencies are settled, or None if it has to run."""
+        if any(self.results[d][0] in ('failed', 'blocked') for d in deps):
+            return 'blocked'
+        if self.dry_run:
+            # Upstream stages did not really run, so their new outputs are unknown
+            upstream = any(self.results[d][0] == 'would run' for d in deps)
+            return 'would run' if upstream or self.needs_run(name) else 'up to date'
+        return None if self.needs_run(name) else 'up to date'
+
+    def busy(self, name: str, running: Dict) -> bool:
+        """True if a running stage holds the same resource as `name`."""
+        resource = self.stages[name].resource
+        return bool(resource) and any(self.stages[other].resource == resource
+                                      for other in running.values())
+
+    def run(self, targets: Sequence[str], quiet: bool = False) -> bool:
+        order = self.select(targets)
+        started = time.perf_counter()
+        waiting = list(order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while waiting or running:
+                for name in list(waiting):
+                    deps = [d for d in self.stages[name].deps if d in order]
+                    if any(d not in self.results for d in deps):
+                        continue
+                    status = self.plan(name, deps)
+                    if status is None and (len(running) >= self.jobs or self.busy(name, running)):
+                        continue
+                    waiting.remove(name)
+                    if status is None:
+                        running[pool.submit(self.execute, name)] = name
+                        continue
+                    self.results[name] = (status, 0.0)
+                    if not quiet:
+                        log(f"{'✓' if status == 'up to date' else '•' if status == 'would run' else '✗'} "
+                            f"{name}: {status}")
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self.results[name] = future.result()
+                    status, seconds = self.results[name]
+                    log(f"{'✓' if status == 'ran' else '❌'} {name}: {status} in {seconds:.1f}s")
+
+        if not quiet:
+            self.report(order, time.perf_counter() - started)
+        return not any(status == 'failed' for status, _ in self.results.values())
+
+    def report(self, order: List[str], wall: float):
+        print(f"\n{'=' * 60}")
+        print("Pipeline Summary")
+        print(f"{'=' * 60}")
+        for name in order:
+            status, seconds = self.results.get(name, ('not run', 0.0))
+            print(f"  {name:<22} {status:<11} {seconds:>8.1f}s")
+        total = sum(seconds for _, seconds in self.results.values())
+        print(f"  {'(stage time total)':<22} {'':<11} {total:>8.1f}s")
+        print(f"  {'(wall clock)':<22} {'':<11} {wall:>8.1f}s")
+        print(f"{'=' * 60}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the scrape pipeline incrementally')
+    parser.add_argument('stages', nargs='*',
+                        help='Stages to bring up to date (default: all except validate-requirements)')
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help='Rerun these stages even if up to date (no names: every selected stage)')
+    parser.add_argument('--jobs', type=int, default=4, help='Stages to run at once (default: 4)')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would run without running it')
+    parser.add_argument('--list', action='store_true', help='List the stages and whether they are up to date')
+    args = parser.parse_args()
+
+    pipeline = Pipeline(STAGES, jobs=args.jobs, dry_run=args.dry_run)
+    try:
+        order = pipeline.select(args.stages)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.force is not None:
+        pipeline.force = set(args.force or order)
+
+    if args.list:
+        # Every stage, including those that only run when named
+        targets = args.stages or list(pipeline.stages)
+        order = pipeline.select(targets)
+        pipeline.dry_run = True
+        pipeline.run(targets, quiet=True)
+        for name in order:
+            stage = pipeline.stages[name]
+            after = f" (after {', '.join(stage.deps)})" if stage.deps else ''
+            if stage.resource:
+                after += f" [{stage.resource}]"
+            print(f"  {name:<22} {pipeline.results[name][0]:<11} {stage.description}{after}")
+        return
+
+    sys.exit(0 if pipeline.run(args.stages) else 1)
+
+
+if __name__ == '__main__':
+    main()
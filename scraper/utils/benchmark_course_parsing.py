@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Course-Chunk Parsing Micro-Benchmark
+Compares chunks/second of the shared parser (scraper/utils/course_parsing.py)
+against the per-script implementation it replaced, and checks that both give
+identical results on every chunk. Whole subject pages are also segmented with
+the old per-match look-around filter and with segment_course_text(), which
+must return the same chunk offsets.
+
+Chunks come from a recorded fixture archive when one is given (subject pages
+captured with --record), otherwise they are synthesised from the courses in
+src/data/curriculum (header, title, description, prerequisites, credit
+vectors and navigation leftovers, like a real subject page).
+
+Usage:
+    python scraper/utils/benchmark_course_parsing.py
+    python scraper/utils/benchmark_course_parsing.py --archive fixtures/math.zip --repeat 20
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import course_parsing, html_text
+from scraper.utils.fixtures import FixtureArchive
+
+
+# ----------------------------
+# Baseline: the implementation previously copied into each scraper
+# ----------------------------
+def legacy_clean_course_code(code: str) -> str:
+    code = re.sub(r"_V\s*", " ", code.strip())
+    code = re.sub(r"\s+", " ", code)
+    return code.strip()
+
+
+def legacy_clean_text(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r'\nCourse Descriptions.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = re.sub(r'\nIntroduction.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = re.sub(r'\nCourses by Subject.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = re.sub(r'\nCourses by Faculty.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
+    text = re.sub(
+        r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?"
+        r"(?:\s*;\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?)*\s*\]",
+        "",
+        text,
+    )
+    text = re.sub(r"This course is not eligible for Credit/D/Fail grading\.?", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r"\s+\n", "\n", text)
+    text = re.sub(r"\n\s+", "\n", text)
+    text = re.sub(r"\s*\.\s*\.", ".", text)
+    return text.strip()
+
+
+def legacy_parse_course_chunk(chunk_text: str, code: str) -> Optional[Dict]:
+    if not chunk_text or not chunk_text.strip():
+        return None
+    chunk_stripped = chunk_text.strip()
+    if re.match(
+        r"^[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]+[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]*$",
+        chunk_stripped[:250],
+        re.IGNORECASE | re.MULTILINE,
+    ):
+        return None
+    header_pattern = rf"{re.escape(code)}(?:_V)?\s+(\d{{3}}[A-Z]?)\s*(?:\(([\d-]+)\))?"
+    code_match = re.search(header_pattern, chunk_text, re.IGNORECASE)
+    if not code_match:
+        return None
+    number = code_match.group(1)
+    credits_raw = code_match.group(2) if code_match.lastindex >= 2 and code_match.group(2) else None
+    course_code = legacy_clean_course_code(code_match.group(0))
+
+    remaining = chunk_text[code_match.end():].lstrip()
+    remaining = re.sub(r"^\s*\.?\s*", "", remaining)
+    title = ""
+    body = remaining
+    m = re.match(r"^([^\n]{2,120})\n(.*)$", remaining, flags=re.DOTALL)
+    if m:
+        candidate = m.group(1).strip()
+        if not re.match(r"^(Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency)\b", candidate, re.IGNORECASE):
+            title = candidate
+            body = m.group(2).strip()
+    if not title:
+        m2 = re.search(r"^(.*?)(?:\s+(?:Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency):\s)", remaining, re.IGNORECASE | re.DOTALL)
+        if m2:
+            candidate = m2.group(1).strip()
+            if 2 < len(candidate) <= 120:
+                title = candidate
+                body = remaining[m2.end(1):].strip()
+    code_pattern = rf"{re.escape(code)}(?:_V)?\s+{re.escape(number)}"
+    title = re.sub(code_pattern, "", title, flags=re.IGNORECASE).strip()
+    title = re.sub(r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?\s*\]", "", title).strip()
+    title = re.sub(r"\s+", " ", title).strip().rstrip(".").strip()
+
+    full_text = body.strip()
+    prereq = coreq = equiv = ""
+    prereq_pattern = r"(?:Prerequisite|Prerequisites):\s*(.+?)(?=\s*(?:Corequisite|Co-requisite|Corequisites|Equivalency|This course|Credit will|Consult|$))"
+    coreq_pattern = r"(?:Corequisite|Co-requisite|Corequisites):\s*(.+?)(?=\s*(?:Prerequisite|Prerequisites|Equivalency|This course|Credit will|Consult|$))"
+    equiv_pattern = r"Equivalency:\s*(.+?)(?=\s*(?:Prerequisite|Prerequisites|Corequisite|Co-requisite|Corequisites|This course|Credit will|Consult|$))"
+    pm = re.search(prereq_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
+    if pm:
+        prereq = pm.group(1).strip()
+        full_text = full_text.replace(pm.group(0), "", 1)
+    cm = re.search(coreq_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
+    if cm:
+        coreq = cm.group(1).strip()
+        full_text = full_text.replace(cm.group(0), "", 1)
+    em = re.search(equiv_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
+    if em:
+        equiv = em.group(1).strip()
+        full_text = full_text.replace(em.group(0), "", 1)
+
+    description = legacy_clean_text(full_text)
+    prereq = legacy_clean_text(prereq)
+    coreq = legacy_clean_text(coreq)
+    equiv = legacy_clean_text(equiv)
+    if equiv:
+        prereq = f"{prereq}\n\nEquivalency: {equiv}" if prereq else f"Equivalency: {equiv}"
+    credits: Union[int, str, None] = None
+    if credits_raw:
+        credits_raw = credits_raw.strip()
+        credits = int(credits_raw) if credits_raw.isdigit() else credits_raw
+    return {"code": course_code, "title": title, "credits": credits, "description": description,
+            "prerequisites": prereq, "corequisites": coreq}
+
+
+def legacy_segment(full_text: str, code: str) -> Tuple[int, List[Tuple[int, int]]]:
+    header_pattern = rf'{re.escape(code)}(?:_V)?\s+(\d{{3}}[A-Z]?)\s*(?:\(([\d-]+)\))?'
+    all_matches = list(re.finditer(header_pattern, full_text, re.IGNORECASE))
+    valid_headers = []
+    for m in all_matches:
+        lookahead = full_text[m.end():m.end()+80].lower()
+        lookbehind = full_text[max(0, m.start()-80):m.start()].lower()
+        is_equivalency_or = re.search(r'\s+or\s+[A-Z]{2,4}_?V?\s+\d', lookahead)
+        is_equivalency_comma = re.search(r',\s*[A-Z]{2,4}_?V?\s+\d', lookahead)
+        is_prerequisite_and = re.search(r'\s+and\s+(?:fourth-year|third-year|second-year|all of|one of|either)', lookahead)
+        is_equivalency_context = 'equivalency' in lookbehind or 'equivalency' in lookahead
+        is_in_requirement = re.search(r'(?:prerequisite|corequisite):', lookbehind)
+        if not (is_equivalency_or or is_equivalency_comma or is_prerequisite_and or
+                is_equivalency_context or is_in_requirement):
+            valid_headers.append(m)
+    spans = []
+    for i in range(len(valid_headers)):
+        start = valid_headers[i].start()
+        end = valid_headers[i + 1].start() if i + 1 < len(valid_headers) else len(full_text)
+        spans.append((start, end))
+    return len(all_matches), spans
+
+
+# ----------------------------
+# Inputs
+# ----------------------------
+def synthetic_chunks() -> List[Tuple[str, str]]:
+    """(subject code, chunk) pairs built from the curriculum JSON files."""
+    pairs = []
+    pattern = os.path.join(project_root, 'src', 'data', 'curriculum', '**', '*.json')
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                code = node.get('code', '')
+                parts = code.split() if isinstance(code, str) else []
+                if len(parts) == 2 and node.get('description'):
+                    subject, number = parts
+                    chunk = (f"{subject}_V {number} ({node.get('credits') or 3}) {node.get('title') or 'Untitled'}\n"
+                             f"{node['description']}\n"
+                             f"[3-0-{len(pairs) % 3}]\n")
+                    if node.get('prerequisites'):
+                        chunk += f"Prerequisite: {node['prerequisites']}\n"
+                    chunk += "This course is not eligible for Credit/D/Fail grading.\n\nCourse Descriptions  \n  Introduction\n"
+                    pairs.append((subject, chunk))
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+    return pairs
+
+
+def synthetic_pages(pairs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """(subject code, page text) with every synthetic chunk of a subject on one page."""
+    by_code: Dict[str, List[str]] = {}
+    for code, chunk in pairs:
+        by_code.setdefault(code, []).append(chunk)
+    return [(code, '\n\n'.join(chunks)) for code, chunks in sorted(by_code.items())]
+
+
+def archive_pages(path: str) -> List[Tuple[str, str]]:
+    """(subject code, main-content text) for the subject pages in a fixture archive."""
+    archive = FixtureArchive(path, 'replay')
+    pages = []
+    for meta, body in archive.entries.values():
+        url = meta.get('url', '')
+        m = re.search(r'/course-descriptions/subject/([a-z]+?)v?$', url)
+        if meta.get('kind') != 'response' or not m:
+            continue
+        pages.append((m.group(1).upper(), html_text.main_text(body)))
+    return pages
+
+
+def archive_chunks(pages: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """(subject code, chunk) pairs cut from recorded subject pages."""
+    pairs = []
+    for code, text in pages:
+        starts = [h.start() for h in course_parsing.header_pattern(code).finditer(text)]
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(text)
+            pairs.append((code, text[start:end].strip()))
+    return pairs
+
+
+def run(label: str, fn, pairs: List[Tuple[str, str]], repeat: int) -> Tuple[float, list]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        results = [fn(chunk, code) for code, chunk in pairs]
+    elapsed = time.perf_counter() - started
+    rate = len(pairs) * repeat / elapsed
+    print(f"  {label:<28} {rate:>10,.0f} chunks/s  ({elapsed:.2f}s)")
+    return rate, results
+
+
+def bench_segmentation(pages: List[Tuple[str, str]], repeat: int) -> int:
+    """Time both segmenters per page; returns the number of pages that differ."""
+    mismatches = 0
+    rows = []
+    for code, text in pages:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            before = legacy_segment(text, code)
+        legacy_ms = (time.perf_counter() - started) * 1000 / repeat
+        started = time.perf_counter()
+        for _ in range(repeat):
+            after = course_parsing.segment_course_text(text, code)
+        single_ms = (time.perf_counter() - started) * 1000 / repeat
+        if before != after:
+            mismatches += 1
+            print(f"  ❌ {code}: {len(before[1])} chunks before, {len(after[1])} after")
+        rows.append((len(text), code, len(after[1]), legacy_ms, single_ms))
+
+    total_legacy = sum(r[3] for r in rows)
+    total_single = sum(r[4] for r in rows)
+    for size, code, chunks, legacy_ms, single_ms in sorted(rows, reverse=True)[:5]:
+        print(f"  {code:<6} {size:>9,} chars {chunks:>5} chunks   "
+              f"{legacy_ms:>8.2f} ms -> {single_ms:>6.2f} ms")
+    print(f"  all {len(rows)} pages: {total_legacy:.1f} ms -> {total_single:.1f} ms "
+          f"({total_legacy / max(total_single, 1e-9):.1f}x)")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark course-chunk parsing')
+    parser.add_argument('--archive', help='Fixture archive with recorded subject pages')
+    parser.add_argument('--repeat', type=int, default=10, help='Passes over the chunk set (default: 10)')
+    args = parser.parse_args()
+
+    pages = archive_pages(args.archive) if args.archive else []
+    pairs = archive_chunks(pages) if args.archive else synthetic_chunks()
+    if not args.archive:
+        pages = synthetic_pages(pairs)
+    if not pairs:
+        print("❌ No chunks to benchmark")
+        return
+    print(f"Benchmarking {len(pairs)} chunks x {args.repeat} passes "
+          f"({'recorded pages' if args.archive else 'synthetic chunks'})\n")
+
+    before, legacy = run('before (per-script copy)', legacy_parse_course_chunk, pairs, args.repeat)
+    after, shared = run('after (course_parsing)', course_parsing.parse_course_chunk, pairs, args.repeat)
+
+    started = time.perf_counter()
+    by_code: Dict[str, List[str]] = {}
+    for code, chunk in pairs:
+        by_code.setdefault(code, []).append(chunk)
+    for _ in range(args.repeat):
+        for code, chunks in by_code.items():
+            course_parsing.parse_course_chunks(chunks, code)
+    batch_rate = len(pairs) * args.repeat / (time.perf_counter() - started)
+    print(f"  {'after (batch API)':<28} {batch_rate:>10,.0f} chunks/s")
+
+    mismatches = sum(1 for a, b in zip(legacy, shared) if a != b)
+    print(f"\nSpeed-up: {after / before:.2f}x")
+
+    print(f"\nSegmenting {len(pages)} subject page(s), largest first:")
+    page_mismatches = bench_segmentation(pages, args.repeat)
+
+    if mismatches:
+        print(f"❌ {mismatches} chunk(s) parsed differently")
+    if page_mismatches:
+        print(f"❌ {page_mismatches} page(s) segmented differently")
+    if mismatches or page_mismatches:
+        sys.exit(1)
+    print(f"✓ Identical results on all {len(pairs)} chunks and {len(pages)} pages")
+
+
+if __name__ == '__main__':
+    main()
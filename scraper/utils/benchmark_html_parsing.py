@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Calendar HTML Parsing Benchmark
+Compares, per subject page, the old full 'html.parser' tree + get_text() on
+the main container against scraper/utils/html_text.py (fast backend, and the
+<main>/<article>-only partial parse), reporting parse time and peak memory
+(tracemalloc) and checking that the extracted text is identical.
+
+Pages come from a recorded fixture archive when one is given (subject pages
+captured with --record), otherwise synthetic subject pages are built from the
+courses in src/data/curriculum, wrapped in navigation, scripts and a footer
+like the real calendar.
+
+Usage:
+    python scraper/utils/benchmark_html_parsing.py
+    python scraper/utils/benchmark_html_parsing.py --archive fixtures/math.zip --repeat 5
+"""
+
+import argparse
+import html
+import os
+import re
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils import html_text
+from scraper.utils.benchmark_course_parsing import synthetic_chunks
+from scraper.utils.fixtures import FixtureArchive
+
+
+def legacy_main_text(markup) -> str:
+    """What the scrapers did before html_text.py."""
+    soup = BeautifulSoup(markup, 'html.parser')
+    main_content = None
+    for selector in ['main', 'article', '.content', '#content', '.main-content']:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    if not main_content:
+        main_content = soup.find('body') or soup
+    return main_content.get_text(separator='\n', strip=False)
+
+
+def full_tree_text(markup, parser: str) -> str:
+    """Same selection on a full tree built by another backend (no partial parsing)."""
+    soup = html_text.parse(markup, parser)
+    for selector in html_text.CONTENT_SELECTORS:
+        found = soup.select_one(selector)
+        if found:
+            return found.get_text(separator='\n', strip=False)
+    return (soup.find('body') or soup).get_text(separator='\n', strip=False)
+
+
+# ----------------------------
+# Inputs
+# ----------------------------
+def _chrome(label: str, links: int) -> str:
+    items = ''.join(f'<li class="menu-item"><a href="/{label}/{i}">{label.title()} link {i}</a></li>\n'
+                    for i in range(links))
+    return f'<nav class="{label}" aria-label="{label}"><ul class="menu">\n{items}</ul></nav>\n'
+
+
+def synthetic_pages() -> List[Tuple[str, bytes]]:
+    """(subject code, page HTML) with every synthetic chunk of a subject on one page."""
+    by_code: Dict[str, List[str]] = {}
+    for code, chunk in synthetic_chunks():
+        by_code.setdefault(code, []).append(chunk)
+
+    pages = []
+    for code, chunks in sorted(by_code.items()):
+        entries = []
+        for chunk in chunks:
+            header, _, rest = chunk.partition('\n')
+            paragraphs = ''.join(f'  <p>{html.escape(line)}</p>\n' for line in rest.split('\n') if line.strip())
+            entries.append(f'<article class="node node--course">\n  <h3>{html.escape(header)}</h3>\n'
+                           f'{paragraphs}  <!-- course {html.escape(header[:12])} -->\n</article>\n')
+        head = ''.join(f'<script src="/js/bundle{i}.js"></script>\n<link rel="stylesheet" href="/css/{i}.css">\n'
+                       for i in range(20))
+        page = (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+                f'<title>{code} - Course Descriptions &amp; Calendar</title>\n{head}'
+                f'<script>window.dataLayer = [{{"subject": "{code}"}}];</script>\n</head>\n<body>\n'
+                f'<header class="site-header">{_chrome("main-nav", 120)}</header>\n'
+                f'<div class="layout">{_chrome("sidebar", 250)}\n'
+                f'<main id="main-content" class="content">\n<h1>{code}_V &ndash; Courses</h1>\n'
+                f'{"".join(entries)}</main>\n</div>\n'
+                f'<footer class="site-footer">{_chrome("footer", 80)}<p>&copy; The University of British Columbia</p>'
+                f'</footer>\n</body>\n</html>\n')
+        pages.append((code, page.encode('utf-8')))
+    return pages
+
+
+def archive_pages(path: str) -> List[Tuple[str, bytes]]:
+    """(subject code, raw HTML) for the subject pages in a fixture archive."""
+    archive = FixtureArchive(path, 'replay')
+    pages = []
+    for meta, body in archive.entries.values():
+        m = re.search(r'/course-descriptions/subject/([a-z]+?)v?$', meta.get('url', ''))
+        if meta.get('kind') == 'response' and m:
+            pages.append((m.group(1).upper(), body))
+    return pages
+
+
+# ----------------------------
+# Measuring
+# ----------------------------
+def measure(fn: Callable, markup, repeat: int) -> Tuple[float, float, str]:
+    """(milliseconds per call, peak MiB, result) for fn(markup)."""
+    tracemalloc.start()
+    result = fn(markup)
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(markup)
+    ms = (time.perf_counter() - started) * 1000 / repeat
+    return ms, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark calendar HTML parsing')
+    parser.add_argument('--archive', help='Fixture archive with recorded subject pages')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed parses per page and variant (default: 3)')
+    args = parser.parse_args()
+
+    pages = archive_pages(args.archive) if args.archive else synthetic_pages()
+    if not pages:
+        print("❌ No subject pages to benchmark")
+        return
+
+    variants = [('html.parser full (before)', legacy_main_text)]
+    for name in html_text.available_backends():
+        variants.append((f'{name} full', lambda markup, name=name: full_tree_text(markup, name)))
+        variants.append((f'{name} main only', lambda markup, name=name: html_text.main_text(markup, parser=name)))
+
+    print(f"Parsing {len(pages)} subject page(s) x {args.repeat} "
+          f"({'recorded pages' if args.archive else 'synthetic pages'}); "
+          f"backends: {', '.join(html_text.available_backends())}\n")
+
+    totals = {label: [0.0, 0.0] for label, _ in variants}
+    mismatches: Dict[str, int] = {label: 0 for label, _ in variants}
+    for code, markup in pages:
+        print(f"{code} ({len(markup) / 1024:,.0f} KiB)")
+        expected = None
+        for label, fn in variants:
+            ms, peak, text = measure(fn, markup, args.repeat)
+            if expected is None:
+                expected = text
+            same = text == expected
+            if not same:
+                mismatches[label] += 1
+            totals[label][0] += ms
+            totals[label][1] = max(totals[label][1], peak)
+            print(f"  {label:<28} {ms:>8.1f} ms  peak {peak:>6.1f} MiB  {'✓' if same else '❌ text differs'}")
+
+    print("\nTotals (time summed over pages, worst peak memory):")
+    before_ms = totals[variants[0][0]][0]
+    for label, (ms, peak) in totals.items():
+        print(f"  {label:<28} {ms:>8.1f} ms  peak {peak:>6.1f} MiB  {before_ms / max(ms, 1e-9):>5.1f}x")
+
+    failed = {label: n for label, n in mismatches.items() if n}
+    if failed:
+        for label, n in failed.items():
+            print(f"❌ {label}: text differs on {n} page(s)")
+        sys.exit(1)
+    print(f"✓ Identical text on all {len(pages)} pages with every variant")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Province Requirement Mapping Benchmark
+Times the old linear substring scan of map_requirement_to_province against
+ProvinceMapper (the same scan over phrases lowercased once, plus a memo) over
+every requirement of the full 13-province dataset, and checks that both map
+every requirement identically (first partial hit in mapping order).
+
+Usage:
+    python scraper/utils/benchmark_province_mappings.py
+    python scraper/utils/benchmark_province_mappings.py --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'scraper', 'data_processing'))
+
+from apply_province_mappings import ProvinceMapper
+
+MAPPINGS_FILE = os.path.join(project_root, 'scraper', 'province_course_mappings.json')
+DATA_FILE = os.path.join(project_root, 'scraper', 'data', 'vancouver_detailed_requirements.json')
+
+def linear_map(requirement_text, province_name, mappings):
+    """The mapping as it was before ProvinceMapper, kept as the baseline"""
+    if province_name not in mappings['mappings']:
+        return [requirement_text]
+    province_map = mappings['mappings'][province_name]
+    if requirement_text in province_map:
+        return province_map[requirement_text]
+    for generic, specific in province_map.items():
+        if generic.lower() in requirement_text.lower():
+            return specific
+    return [requirement_text]
+
+def collect_requirements(data):
+    """Every (province, requirement) lookup apply_province_mappings.py makes, in order"""
+    lookups = []
+
+    def walk(province_name, node):
+        if not isinstance(node, dict):
+            return
+        for key, value in node.items():
+            if key in ('grade_12_requirements', 'grade_11_requirements') and isinstance(value, list):
+                lookups.extend((province_name, req) for req in value)
+            else:
+                walk(province_name, value)
+
+    for province_name, province_data in data.get('provinces', {}).items():
+        walk(province_name, province_data)
+    return lookups
+
+def timed(label, repeat, run, lookups):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    elapsed = (time.perf_counter() - started) / repeat
+    per_lookup = elapsed / len(lookups) * 1e6
+    print(f"  {label:<34} {elapsed * 1000:8.2f} ms/run  {per_lookup:6.2f} µs/lookup")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark province requirement mapping')
+    parser.add_argument('--repeat', type=int, default=50, help='Passes over all requirements (default: 50)')
+    repeat = parser.parse_args().repeat
+
+    with open(MAPPINGS_FILE, 'r', encoding='utf-8') as f:
+        mappings = json.load(f)
+    with open(DATA_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    lookups = collect_requirements(data)
+
+    print("=" * 80)
+    print("Province Mapping Benchmark")
+    print("=" * 80)
+    print(f"Provinces: {len(mappings['mappings'])}, generic phrases: "
+          f"{sum(len(m) for m in mappings['mappings'].values())}")
+    print(f"Lookups per run: {len(lookups)} ({len(set(lookups))} distinct), repeat={repeat}")
+    print()
+
+    def run_linear():
+        for province_name, req in lookups:
+            linear_map(req, province_name, mappings)
+
+    prebuilt = ProvinceMapper(mappings)
+    warm = ProvinceMapper(mappings)
+    for province_name, req in lookups:
+        warm.map(req, province_name)
+
+    def run_unmemoized():
+        for province_name, req in lookups:
+            prebuilt._map(req, province_name)
+
+    def run_cold():
+        mapper = ProvinceMapper(mappings)
+        for province_name, req in lookups:
+            mapper.map(req, province_name)
+
+    def run_warm():
+        # apply_province_mappings.py maps a second file with the same mapper
+        for province_name, req in lookups:
+            warm.map(req, province_name)
+
+    build = timed('build ProvinceMapper', repeat, lambda: ProvinceMapper(mappings), lookups)
+    baseline = timed('linear scan (old)', repeat, run_linear, lookups)
+    unmemoized = timed('ProvinceMapper, no memo', repeat, run_unmemoized, lookups)
+    cold = timed('ProvinceMapper, cold (incl. build)', repeat, run_cold, lookups)
+    memoized = timed('ProvinceMapper, warm memo', repeat, run_warm, lookups)
+    print()
+    print(f"✓ Lookups: no memo {baseline / unmemoized:.1f}x, warm memo {baseline / memoized:.1f}x "
+          f"vs the linear scan")
+    print(f"✓ First file incl. building the mapper: {cold * 1000:.2f} ms vs {baseline * 1000:.2f} ms "
+          f"(build alone: {build * 1000:.2f} ms)")
+
+    # ProvinceMapper must reproduce the linear scan exactly
+    mapper = ProvinceMapper(mappings)
+    differences = []
+    for province_name, req in dict.fromkeys(lookups):
+        old, new = linear_map(req, province_name, mappings), mapper.map(req, province_name)
+        if old != new:
+            differences.append((province_name, req, old, new))
+    print()
+    if not differences:
+        print("✓ Both mappers agree on every requirement")
+    else:
+        print(f"❌ {len(differences)} requirement(s) map differently:")
+        for province_name, req, old, new in differences:
+            print(f"  - {province_name}: '{req}'")
+            print(f"    old: {old}")
+            print(f"    new: {new}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Write-Ahead Checkpoints for Long Scrape Runs
+The long scrapers (province x degree requirements, all Science/Arts majors)
+used to keep every result in memory and write the output once at the end, so a
+crash or a transient block late in the run threw away all completed work.
+
+- Each finished work unit is appended to a JSONL file as one line
+  {"key": ..., "result": ...}, flushed and fsync'ed before the run moves on
+- With resume=True the existing file is read back: completed units are
+  skipped and their results are used to rebuild the final output. A last line
+  cut off by a crash is ignored (that unit simply runs again)
+- Without resume the old checkpoint is discarded and the run starts fresh
+- discard() removes the file once the final output has been written
+- record() is thread-safe, so worker pools can report units as they finish
+
+Usage:
+    from scraper.utils.checkpoint import Checkpoint
+
+    checkpoint = Checkpoint(output_file.replace('.json', '.checkpoint.jsonl'), resume='--resume' in sys.argv)
+    for unit in units:
+        if unit in checkpoint:
+            result = checkpoint.get(unit)
+        else:
+            result = scrape(unit)
+            checkpoint.record(unit, result)
+    write_json(output_file, build(results))
+    checkpoint.discard()
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+
+class Checkpoint:
+    """Append-only JSONL log of finished work units, keyed by string."""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self.results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+        if resume:
+            self._load()
+            if self.results:
+                print(f"↻ Resuming from {path}: {len(self.results)} unit(s) already done")
+            else:
+                print(f"↻ No checkpoint to resume at {path}, starting fresh")
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for number, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                print(f"  ⚠️  Ignoring unreadable checkpoint line {number} (interrupted write)")
+                continue
+            self.results[entry['key']] = entry['result']
+        # Rewrite without the broken tail so new lines do not follow a partial one
+        if lines and not lines[-1].endswith('\n'):
+            self._rewrite()
+
+    def _rewrite(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, result in self.results.items():
+                f.write(json.dumps({'key': key, 'result': result}, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.results
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        return self.results.get(key, default)
+
+    def record(self, key: str, result: Any):
+        """Durably append one finished unit."""
+        line = json.dumps({'key': key, 'result': result}, ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.results[key] = result
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def discard(self):
+        """Remove the checkpoint once the run's final output is safely written."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,273 @@
+"""
+Persistent Course-Occurrence Index for Curriculum JSON Files
+Maps a normalized course code ("MATH 100") to every place it appears in a
+curriculum directory, as (file, year index, term index, course index), so
+enrichment scripts only open the files that contain the courses they update
+instead of walking years -> terms -> courses of every file for every subject.
+
+The index is stored as JSON under scraper/data/course_index/ together with the
+mtime and size of each file it was built from. On load, only files whose
+mtime/size changed (or that are new) are re-walked; removed files are dropped.
+Files written through apply() are re-stamped, so the scripts' own updates
+never force a rebuild. A location that no longer holds its code (file edited
+within the same mtime tick) triggers a re-index of that one file.
+
+Usage:
+    from scraper.utils.course_index import CourseIndex
+
+    index = CourseIndex(curriculum_dir)
+    counts = index.apply(scraped_data.keys(),
+                         lambda course: update_course(course, scraped_data),
+                         save=save_json_file)      # {filename: (occurrences, updated)}
+    for filename, course in index.courses(['ELEC 201']):
+        ...
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scraper.utils.json_writer import write_json
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_INDEX_DIR = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'course_index')
+
+INDEX_VERSION = 1
+
+# (year index, term index, course index) inside one file
+Position = Tuple[int, int, int]
+
+
+def normalize_code(code: str) -> str:
+    """'math_v  100' -> 'MATH 100' (same rule the scrapers use to compare codes)."""
+    code = re.sub(r"_V\s*", " ", (code or '').strip().upper())
+    return re.sub(r"\s+", " ", code).strip()
+
+
+def iter_courses(data: Dict) -> Iterator[Tuple[Position, Dict]]:
+    """Walk years -> terms -> courses of one curriculum file."""
+    for y, year in enumerate(data.get('years', [])):
+        for t, term in enumerate(year.get('terms', [])):
+            for c, course in enumerate(term.get('courses', [])):
+                yield (y, t, c), course
+
+
+def iter_course_entries(node) -> Iterator[Dict]:
+    """Every dict with a "code" string, in any layout (catalog map, years/terms, major/year lists)."""
+    if isinstance(node, dict):
+        if isinstance(node.get('code'), str):
+            yield node
+            return
+        for value in node.values():
+            yield from iter_course_entries(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_course_entries(value)
+
+
+def _default_save(data: Dict, filename: str, curriculum_dir: str):
+    write_json(os.path.join(curriculum_dir, filename), data)
+
+
+class CourseIndex:
+    """Course code -> [(file, year, term, course)] for one curriculum directory."""
+
+    def __init__(self, curriculum_dir: str, index_path: Optional[str] = None):
+        self.curriculum_dir = os.path.abspath(curriculum_dir)
+        if index_path is None:
+            tag = hashlib.sha1(self.curriculum_dir.encode('utf-8')).hexdigest()[:10]
+            name = f"{os.path.basename(self.curriculum_dir)}-{tag}.json"
+            index_path = os.path.join(DEFAULT_INDEX_DIR, name)
+        self.index_path = index_path
+        # filename -> {'mtime_ns', 'size', 'total'}; code -> {filename: [position, ...]}
+        self.files: Dict[str, Dict] = {}
+        self.codes: Dict[str, Dict[str, List[Position]]] = {}
+        self._dirty = False
+        self._load()
+        self.refresh()
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if stored.get('version') != INDEX_VERSION:
+            return
+        self.files = stored.get('files', {})
+        self.codes = {
+            code: {filename: [tuple(p) for p in positions] for filename, positions in places.items()}
+            for code, places in stored.get('codes', {}).items()
+        }
+
+    def save(self):
+        """Write the index (only if it changed) through a temp file."""
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.index_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'curriculum_dir': self.curriculum_dir,
+                           'files': self.files, 'codes': self.codes}, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
+
+    # ----------------------------
+    # Building
+    # ----------------------------
+    def _stat(self, filename: str) -> Optional[Dict]:
+        try:
+            st = os.stat(os.path.join(self.curriculum_dir, filename))
+        except OSError:
+            return None
+        return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+    def _forget(self, filename: str):
+        for code in [c for c, places in self.codes.items() if filename in places]:
+            del self.codes[code][filename]
+            if not self.codes[code]:
+                del self.codes[code]
+        self.files.pop(filename, None)
+        self._dirty = True
+
+    def _index_file(self, filename: str, data: Optional[Dict] = None):
+        """(Re)build the entries of one file; `data` avoids re-reading a file already loaded."""
+        self._forget(filename)
+        stamp = self._stat(filename)
+        if stamp is None:
+            return
+        if data is None:
+            try:
+                with open(os.path.join(self.curriculum_dir, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Course index: cannot read {filename}: {e}")
+                return
+        total = 0
+        for position, course in iter_courses(data):
+            total += 1
+            code = normalize_code(course.get('code', ''))
+            if code:
+                self.codes.setdefault(code, {}).setdefault(filename, []).append(position)
+        self.files[filename] = dict(stamp, total=total)
+
+    def refresh(self) -> int:
+        """Re-index new or changed files, drop removed ones; returns files re-indexed."""
+        try:
+            present = sorted(f for f in os.listdir(self.curriculum_dir) if f.endswith('.json'))
+        except OSError:
+            present = []
+        for filename in set(self.files) - set(present):
+            self._forget(filename)
+
+        rebuilt = 0
+        for filename in present:
+            stamp = self._stat(filename)
+            known = self.files.get(filename)
+            if known and stamp and known['mtime_ns'] == stamp['mtime_ns'] and known['size'] == stamp['size']:
+                continue
+            self._index_file(filename)
+            rebuilt += 1
+        if rebuilt:
+            print(f"  Course index: re-indexed {rebuilt} of {len(present)} file(s)")
+        self.save()
+        return rebuilt
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+    def locations(self, code: str) -> Dict[str, List[Position]]:
+        """{filename: [position, ...]} for one course code."""
+        return self.codes.get(normalize_code(code), {})
+
+    def codes_for_subjects(self, subjects: Iterable[str]) -> List[str]:
+        """Indexed codes whose subject prefix is one of `subjects` (e.g. ['ELEC', 'CPEN'])."""
+        subjects = {s.upper() for s in subjects}
+        return sorted(code for code in self.codes if code.split(' ', 1)[0] in subjects)
+
+    def _plan(self, codes: Iterable[str]) -> Dict[str, List[Position]]:
+        """filename -> positions of the wanted codes, in document order."""
+        by_file: Dict[str, List[Position]] = {}
+        for code in {normalize_code(c) for c in codes}:
+            for filename, positions in self.codes.get(code, {}).items():
+                by_file.setdefault(filename, []).extend(positions)
+        return {filename: sorted(positions) for filename, positions in sorted(by_file.items())}
+
+    def _open(self, filename: str, positions: List[Position], wanted: set) -> Tuple[Optional[Dict], List[Dict]]:
+        """Load a file and return (data, course objects at the given positions)."""
+        try:
+            with open(os.path.join(self.curriculum_dir, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+            return None, []
+
+        courses = []
+        for y, t, c in positions:
+            try:
+                course = data['years'][y]['terms'][t]['courses'][c]
+            except (KeyError, IndexError, TypeError):
+                course = None
+            if course is None or normalize_code(course.get('code', '')) not in wanted:
+                # File changed without a new mtime: re-index it from what we just read
+                self._index_file(filename, data)
+                courses = [course for _, course in iter_courses(data)
+                           if normalize_code(course.get('code', '')) in wanted]
+                break
+            courses.append(course)
+        return data, courses
+
+    def courses(self, codes: Iterable[str]) -> Iterator[Tuple[str, Dict]]:
+        """(filename, course object) for every occurrence of `codes`, file by file."""
+        wanted = {normalize_code(c) for c in codes}
+        for filename, positions in self._plan(wanted).items():
+            _, courses = self._open(filename, positions, wanted)
+            for course in courses:
+                yield filename, course
+        self.save()
+
+    # ----------------------------
+    # Updating
+    # ----------------------------
+    def apply(self, codes: Iterable[str], update: Callable[[Dict], bool],
+              save: Optional[Callable[[Dict, str], None]] = None) -> Dict[str, Tuple[int, int]]:
+        """
+        Call update(course) for every occurrence of `codes` and save each file
+        in which it returned True, using save(data, filename) when given.
+        Returns {filename: (occurrences, courses updated)} for the files opened.
+        """
+        wanted = {normalize_code(c) for c in codes}
+        counts: Dict[str, Tuple[int, int]] = {}
+        for filename, positions in self._plan(wanted).items():
+            data, courses = self._open(filename, positions, wanted)
+            if data is None:
+                continue
+            updated = 0
+            for course in courses:
+                if update(course):
+                    updated += 1
+            counts[filename] = (len(courses), updated)
+            if updated:
+                if save:
+                    save(data, filename)
+                else:
+                    _default_save(data, filename, self.curriculum_dir)
+                # Same structure, new content: keep the entries, take the new stamp
+                stamp = self._stat(filename)
+                if stamp and filename in self.files:
+                    self.files[filename].update(stamp)
+                    self._dirty = True
+        self.save()
+        return counts
@@ -0,0 +1,347 @@
+"""
+Shared UBC Calendar Course-Chunk Parsing
+One implementation of the course-block parser used by the calendar scrapers
+(scrape_course_details.py, scrape_single_course.py, ...), with every regex
+compiled once at import time instead of on each call.
+
+A "chunk" is the text of one course entry on a subject or course page:
+
+    MATH_V 255 (3) Ordinary Differential Equations
+    Linear equations, systems of first-order equations ...
+    Prerequisite: One of MATH 215, MATH 256.
+
+- clean_text(): description/prereq cleanup; the original eleven-pass regex
+  chain is folded into four passes with identical output
+- clean_course_code(): 'MATH_V 255' -> 'MATH 255'
+- is_blocked(): detects the calendar's bot-protection page
+- parse_course_chunk(): one chunk -> {code, title, credits, description, ...}
+- parse_course_chunks(): batch API, re-uses the per-subject patterns
+- segment_course_text(): one header scan plus literal marker searches over a
+  whole subject page -> chunk offsets of the real course headers (in-text references such as
+  'Prerequisite: MATH 100' or 'MATH 360 and fourth-year standing' are skipped)
+
+Usage:
+    from scraper.utils import course_parsing
+
+    info = course_parsing.parse_course_chunk(chunk, 'MATH')
+    infos = course_parsing.parse_course_chunks(chunks, 'MATH')
+    found, spans = course_parsing.segment_course_text(full_text, 'MATH')
+    chunks = [full_text[start:end].strip() for start, end in spans]
+    info = course_parsing.parse_course_chunk(chunk, 'MATH', number='255')  # only accept MATH 255
+
+Benchmark: python scraper/utils/benchmark_course_parsing.py
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+BLOCKING_PHRASES = (
+    "your request has been blocked",
+    "security system",
+    "potentially automated",
+    "access denied",
+    "blocked by security",
+    "security check",
+)
+
+# ----------------------------
+# Precompiled patterns
+# ----------------------------
+_CREDIT_VECTOR = (
+    r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?"
+    r"(?:\s*;\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?)*\s*\]"
+)
+
+# Navigation leftovers, credit vectors and the Credit/D/Fail note are all deleted,
+# so they share one pass. Each alternative only ever removes text, and none can
+# create a match for another, so this equals running them one after another.
+REMOVE_RE = re.compile(
+    r"(?im:\n(?:Course Descriptions|Introduction|Courses by Subject|Courses by Faculty).*$)"
+    r"|" + _CREDIT_VECTOR +
+    r"|(?i:This course is not eligible for Credit/D/Fail grading\.?)"
+)
+# Any whitespace run containing a newline becomes a single newline
+# (same result as the old [ \t]+ / \n{3,} / \s+\n / \n\s+ sequence)
+NEWLINE_RUN_RE = re.compile(r"\s*\n\s*")
+BLANKS_RE = re.compile(r"[ \t]+")
+DOUBLE_PERIOD_RE = re.compile(r"\s*\.\s*\.")
+
+COURSE_CODE_V_RE = re.compile(r"_V\s*")
+WHITESPACE_RE = re.compile(r"\s+")
+
+CODE_LIST_RE = re.compile(
+    r"^[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]+[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+LEADING_PUNCT_RE = re.compile(r"^\s*\.?\s*")
+TITLE_LINE_RE = re.compile(r"^([^\n]{2,120})\n(.*)$", re.DOTALL)
+REQUIREMENT_LABEL_RE = re.compile(
+    r"^(Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency)\b", re.IGNORECASE
+)
+TITLE_BEFORE_LABEL_RE = re.compile(
+    r"^(.*?)(?:\s+(?:Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency):\s)",
+    re.IGNORECASE | re.DOTALL,
+)
+TITLE_CREDIT_VECTOR_RE = re.compile(r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?\s*\]")
+
+PREREQ_RE = re.compile(
+    r"(?:Prerequisite|Prerequisites):\s*(.+?)"
+    r"(?=\s*(?:Corequisite|Co-requisite|Corequisites|Equivalency|This course|Credit will|Consult|$))",
+    re.IGNORECASE | re.DOTALL,
+)
+COREQ_RE = re.compile(
+    r"(?:Corequisite|Co-requisite|Corequisites):\s*(.+?)"
+    r"(?=\s*(?:Prerequisite|Prerequisites|Equivalency|This course|Credit will|Consult|$))",
+    re.IGNORECASE | re.DOTALL,
+)
+EQUIV_RE = re.compile(
+    r"Equivalency:\s*(.+?)"
+    r"(?=\s*(?:Prerequisite|Prerequisites|Corequisite|Co-requisite|Corequisites|This course|Credit will|Consult|$))",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Legacy single-line cleanup used by the APSC/MATH-only scrapers
+COMPACT_CREDIT_VECTOR_RE = re.compile(r"\[?\d+-\d+-\d+\]?")
+CREDIT_D_FAIL_RE = re.compile(r"This course is not eligible for Credit/D/Fail grading\.?", re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def header_pattern(code: str) -> Pattern:
+    """'MATH' -> pattern for 'MATH_V 255 (3)' / 'MATH 255' with number and credits groups."""
+    return re.compile(rf"{re.escape(code)}(?:_V)?\s+(\d{{3}}[A-Z]?)\s*(?:\(([\d-]+)\))?", re.IGNORECASE)
+
+
+# Segmentation: a header is only a real course entry if no requirement context
+# sits within this many characters before/after it
+CONTEXT_WINDOW = 80
+
+# The page is lower-cased (as the old look-around filter did) and scanned for
+# headers with a pattern that starts with the literal subject code, so the regex
+# engine jumps between occurrences of it. Requirement markers are literals found
+# with str.find. Each marker is (kind, start, end); the 'and' marker starts at
+# the whitespace before 'and' (which usually also ends the preceding header).
+# A single alternation of headers and markers was slower: it has no literal
+# prefix, so the engine tries every character of the page.
+_MARKER_LITERALS = (
+    ("equiv", "equivalency"),
+    ("prereq", "prerequisite:"),
+    ("coreq", "corequisite:"),
+)
+AND_REQUIREMENT_RE = re.compile(r"and(\s+(?:fourth-year|third-year|second-year|all of|one of|either))")
+# Marker -> (disqualifies headers after it, disqualifies headers before it)
+_MARKER_GROUPS = {
+    "equiv": (True, True),
+    "prereq": (True, False),
+    "coreq": (True, False),
+    "andreq": (False, True),
+}
+
+
+@lru_cache(maxsize=None)
+def _segment_pattern(code: str) -> Pattern:
+    return re.compile(rf"{re.escape(code.lower())}(?:_v)?\s+\d{{3}}[a-z]?\s*(?:\([\d-]+\))?")
+
+
+def _segment_markers(folded: str) -> List[Tuple[str, int, int]]:
+    """Requirement markers in lower-cased page text, as (kind, start, end)."""
+    markers = []
+    for kind, literal in _MARKER_LITERALS:
+        start = folded.find(literal)
+        while start != -1:
+            markers.append((kind, start, start + len(literal)))
+            start = folded.find(literal, start + 1)
+    for m in AND_REQUIREMENT_RE.finditer(folded):
+        if m.start() and folded[m.start() - 1].isspace():
+            markers.append(("andreq", m.start() - 1, m.end()))
+    return markers
+
+
+@lru_cache(maxsize=4096)
+def _title_code_pattern(code: str, number: str) -> Pattern:
+    return re.compile(rf"{re.escape(code)}(?:_V)?\s+{re.escape(number)}", re.IGNORECASE)
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+def is_blocked(html_text: str) -> bool:
+    """True if the page is the calendar's bot-protection / access-denied page."""
+    t = html_text.lower()
+    return any(p in t for p in BLOCKING_PHRASES)
+
+
+def clean_course_code(code: str) -> str:
+    """Convert SUBJECT_V to SUBJECT and normalize whitespace."""
+    code = COURSE_CODE_V_RE.sub(" ", code.strip())
+    code = WHITESPACE_RE.sub(" ", code)
+    return code.strip()
+
+
+def clean_text(text: str) -> str:
+    """Clean description/prereq/coreq text without killing URLs."""
+    if not text:
+        return ""
+    text = REMOVE_RE.sub("", text)
+    text = NEWLINE_RUN_RE.sub("\n", text)
+    text = BLANKS_RE.sub(" ", text)
+    text = DOUBLE_PERIOD_RE.sub(".", text)
+    return text.strip()
+
+
+def clean_text_compact(text: str) -> str:
+    """Single-line cleanup (all whitespace collapsed) used by the APSC/MATH scrapers."""
+    if not text:
+        return ""
+    text = COMPACT_CREDIT_VECTOR_RE.sub("", text)
+    text = CREDIT_D_FAIL_RE.sub("", text)
+    text = WHITESPACE_RE.sub(" ", text)
+    text = DOUBLE_PERIOD_RE.sub(".", text)
+    return text.strip()
+
+
+def _cut(text: str, match: Optional[re.Match]) -> Tuple[str, str]:
+    """Return (group 1, text without the match). The match is the first occurrence
+    of its own text, so slicing equals str.replace(match, '', 1) without the search."""
+    if not match:
+        return "", text
+    return match.group(1).strip(), text[:match.start()] + text[match.end():]
+
+
+# ----------------------------
+# Parsing a course chunk
+# ----------------------------
+def parse_course_chunk(chunk_text: str, code: str, number: Optional[str] = None) -> Optional[Dict]:
+    """
+    Parse a course block (header + title + description + prereq/coreq).
+    Works with subject-page or course-page extracted blocks.
+
+    `code` is the subject prefix (e.g. 'MATH'). When `number` is given, chunks
+    whose header is a different course number are rejected.
+    """
+    if not chunk_text or not chunk_text.strip():
+        return None
+
+    # Reject chunks that are obviously just a list of codes
+    if CODE_LIST_RE.match(chunk_text.strip()[:250]):
+        return None
+
+    # Header: THIS prefix + optional _V + number + optional credits (3) or (2-6)
+    code_match = header_pattern(code).search(chunk_text)
+    if not code_match:
+        return None
+
+    course_number = code_match.group(1)
+    credits_raw = code_match.group(2)
+    course_code = clean_course_code(code_match.group(0))
+
+    if number is not None and course_number.upper() != number.upper():
+        return None
+
+    # Title + body extraction
+    remaining = chunk_text[code_match.end():].lstrip()
+    # If remaining starts with stray punctuation, skip it
+    remaining = LEADING_PUNCT_RE.sub("", remaining, count=1)
+
+    title = ""
+    body = remaining
+
+    # Title is usually on the same line until newline, but must not be a requirement label
+    m = TITLE_LINE_RE.match(remaining)
+    if m:
+        candidate = m.group(1).strip()
+        if not REQUIREMENT_LABEL_RE.match(candidate):
+            title = candidate
+            body = m.group(2).strip()
+
+    # Fallback: no newline, take the text up to "Prerequisite:" if present
+    if not title:
+        m2 = TITLE_BEFORE_LABEL_RE.search(remaining)
+        if m2:
+            candidate = m2.group(1).strip()
+            if 2 < len(candidate) <= 120:
+                title = candidate
+                body = remaining[m2.end(1):].strip()
+
+    # Clean title: remove embedded course code and credit vectors
+    title = _title_code_pattern(code, course_number).sub("", title).strip()
+    title = TITLE_CREDIT_VECTOR_RE.sub("", title).strip()
+    title = WHITESPACE_RE.sub(" ", title).strip().rstrip(".").strip()
+
+    # Extract prereq/coreq/equiv from body, each removed before the next search
+    full_text = body.strip()
+    prereq, full_text = _cut(full_text, PREREQ_RE.search(full_text))
+    coreq, full_text = _cut(full_text, COREQ_RE.search(full_text))
+    equiv, full_text = _cut(full_text, EQUIV_RE.search(full_text))
+
+    description = clean_text(full_text)
+    prereq = clean_text(prereq)
+    coreq = clean_text(coreq)
+    equiv = clean_text(equiv)
+
+    if equiv:
+        prereq = f"{prereq}\n\nEquivalency: {equiv}" if prereq else f"Equivalency: {equiv}"
+
+    # Parse credits into int or keep range string
+    credits: Union[int, str, None] = None
+    if credits_raw:
+        credits_raw = credits_raw.strip()
+        credits = int(credits_raw) if credits_raw.isdigit() else credits_raw  # e.g. "2-6"
+
+    return {
+        "code": course_code,         # "MATH 255"
+        "title": title,              # "Ordinary Differential Equations"
+        "credits": credits,          # 3 or "2-6"
+        "description": description,
+        "prerequisites": prereq,
+        "corequisites": coreq,
+    }
+
+
+def segment_course_text(full_text: str, code: str) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Split a subject page's text into course chunks in one header scan.
+
+    Returns (number of header-like matches, [(start, end), ...]) where each span
+    runs from a real course header to the next one (or the end of the text);
+    slice and strip it to get the chunk. A header is treated as an in-text
+    reference, not an entry, when within CONTEXT_WINDOW characters:
+      - 'equivalency' appears before or after it
+      - 'Prerequisite:' / 'Corequisite:' appears before it
+      - it is followed by 'and fourth-year', 'and one of', 'and either', ...
+    """
+    folded = full_text.lower()
+    if len(folded) != len(full_text):
+        folded = full_text.replace("\u0130", "I").lower()  # keep offsets aligned
+
+    header_starts: List[int] = []
+    header_ends: List[int] = []
+    for m in _segment_pattern(code).finditer(folded):
+        header_starts.append(m.start())
+        header_ends.append(m.end())
+    markers = _segment_markers(folded) if header_starts else []
+
+    # Markers are usually far fewer than headers: each one knocks out the headers
+    # whose look-behind (start - WINDOW, start) or look-ahead (end, end + WINDOW)
+    # window fully contains it. Headers never overlap, so starts and ends are sorted.
+    is_reference = [False] * len(header_starts)
+    for group, m_start, m_end in markers:
+        blocks_after, blocks_before = _MARKER_GROUPS[group]
+        if blocks_after:
+            i = bisect_left(header_starts, m_end)
+            j = bisect_right(header_starts, m_start + CONTEXT_WINDOW)
+            is_reference[i:j] = [True] * max(0, j - i)
+        if blocks_before:
+            i = bisect_left(header_ends, m_end - CONTEXT_WINDOW)
+            j = bisect_right(header_ends, m_start)
+            is_reference[i:j] = [True] * max(0, j - i)
+
+    valid = [start for start, ref in zip(header_starts, is_reference) if not ref]
+    spans = [(s, valid[i + 1] if i + 1 < len(valid) else len(full_text)) for i, s in enumerate(valid)]
+    return len(header_starts), spans
+
+
+def parse_course_chunks(chunks: Iterable[str], code: str, number: Optional[str] = None) -> List[Optional[Dict]]:
+    """Parse many chunks of one subject in a single call (None for chunks that don't parse)."""
+    return [parse_course_chunk(chunk, code, number) for chunk in chunks]
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Course-Catalog Search
+Ranks the scraped courses (ubc_math_courses.json plus every course listed in
+src/data/curriculum/**) against a free-text query, using the BM25 class of the
+UI/UX search tool (.shared/ui-ux-pro-max/scripts/core.py).
+
+- Field-weighted: one BM25 index per field (code, title, description,
+  prerequisites); a course's score is the weighted sum of its field scores
+  (FIELD_WEIGHTS), so a hit in the title counts more than one in the
+  prerequisite text. Only the postings of the query terms are touched
+- Course codes in the query are matched directly: "MATH_V 255", "math255"
+  and "MATH 255" are the same code (exact), "MATH 2" lists the MATH 2xx
+  courses (prefix, binary search over the sorted codes) and "MTH 255" or
+  "MATH 256" still find MATH 255 (fuzzy, one edit). Code matches rank ahead
+  of text-only matches
+- The index is stored compactly as src/data/course_search_index.json: the
+  merged course records and, per field, document lengths and term -> (doc
+  ids, term frequencies). Loading restores the BM25 weights from those counts
+  without re-tokenizing anything. It is rebuilt when the SHA-1 of any source
+  file changes (or a source appears or disappears)
+
+Usage:
+    python scraper/utils/course_search.py "differential equations"
+    python scraper/utils/course_search.py "MATH_V 255" --json
+    python scraper/utils/course_search.py "MATH 2" -n 20
+    python scraper/utils/course_search.py --build           # rebuild the index
+
+    from scraper.utils.course_search import load_index
+
+    index = load_index()
+    for result in index.search('linear algebra', k=5):
+        print(result['code'], result['score'])
+"""
+
+import argparse
+import bisect
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scraper.utils.course_index import iter_course_entries, normalize_code
+from scraper.utils.json_writer import write_json
+
+CATALOG_FILE = os.path.join(PROJECT_ROOT, 'ubc_math_courses.json')
+CURRICULUM_DIR = os.path.join(PROJECT_ROOT, 'src', 'data', 'curriculum')
+DEFAULT_INDEX_PATH = os.path.join(PROJECT_ROOT, 'src', 'data', 'course_search_index.json')
+CORE_FILE = os.path.join(PROJECT_ROOT, '.shared', 'ui-ux-pro-max', 'scripts', 'core.py')
+
+INDEX_VERSION = 1
+
+FIELD_WEIGHTS = {'code': 3.0, 'title': 2.0, 'description': 1.0, 'prerequisites': 0.5}
+
+# Code match tiers; results are ordered by tier first, then by text score
+EXACT, PREFIX, FUZZY, TEXT = 3, 2, 1, 0
+MATCH_NAMES = {EXACT: 'exact', PREFIX: 'prefix', FUZZY: 'fuzzy', TEXT: 'text'}
+
+# A course entry's code ("MATH_V 100", "APSC 101", "CPSC 121A")
+COURSE_CODE = re.compile(r'^[A-Z]{2,4} \d{3}[A-Z]?$')
+# A (possibly partial) course code inside a query: "MATH_V 255", "math255", "MATH 2"
+CODE_QUERY = re.compile(r'\b([A-Za-z]{2,4})(?:_V)?\s*(\d{1,3}[A-Za-z]?)\b')
+
+
+def _load_core():
+    """The UI/UX search tool's core module (not a package, so loaded by path)"""
+    spec = importlib.util.spec_from_file_location('ui_ux_pro_max_core', CORE_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+BM25 = _load_core().BM25
+
+
+def compact_code(code: str) -> str:
+    """'MATH_V 255' / 'math 255' -> 'MATH255' (the key prefix and fuzzy matching use)"""
+    return normalize_code(code).replace(' ', '')
+
+
+# ----------------------------
+# Catalog
+# ----------------------------
+def source_files(catalog_file: str = CATALOG_FILE, curriculum_dir: str = CURRICULUM_DIR) -> List[str]:
+    """The catalog file, then every curriculum file in path order."""
+    files = [catalog_file] if os.path.isfile(catalog_file) else []
+    return files + sorted(glob.glob(os.path.join(curriculum_dir, '**', '*.json'), recursive=True))
+
+
+def collect_courses(files: Sequence[str]) -> List[Dict]:
+    """
+    One record per normalized course code, sorted by compact code. Fields missing from
+    one file are filled from the next file that has them (the catalog first).
+    """
+    courses: Dict[str, Dict] = {}
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        relative = os.path.relpath(path, PROJECT_ROOT).replace(os.sep, '/')
+        for entry in iter_course_entries(data):
+            code = normalize_code(entry['code'])
+            if not COURSE_CODE.match(code):
+                continue  # "Electives", "MATH 100 or 102", ...
+            course = courses.setdefault(code, {'code': code, 'title': '', 'credits': None,
+                                               'description': '', 'prerequisites': '', 'sources': []})
+            for field in ('title', 'description', 'prerequisites'):
+                if not course[field] and isinstance(entry.get(field), str):
+                    course[field] = entry[field].strip()
+            if course['credits'] is None and isinstance(entry.get('credits'), (int, float)):
+                course['credits'] = entry['credits']
+            if relative not in course['sources']:
+                course['sources'].append(relative)
+    return [courses[code] for code in sorted(courses, key=compact_code)]
+
+
+def _digests(files: Sequence[str]) -> Dict[str, str]:
+    digests = {}
+    for path in files:
+        with open(path, 'rb') as f:
+            digests[os.path.relpath(path, PROJECT_ROOT).replace(os.sep, '/')] = hashlib.sha1(f.read()).hexdigest()
+    return digests
+
+
+# ----------------------------
+# Index
+# ----------------------------
+class CourseSearch:
+    """Field-weighted BM25 plus exact/prefix/fuzzy course-code lookup over a list of course records."""
+
+    def __init__(self, courses: List[Dict], fields: Dict[str, BM25], sources: Optional[Dict[str, str]] = None):
+        self.courses = courses
+        self.fields = fields
+        self.sources = sources or {}
+        # Sorted compact codes (courses are sorted by code), for prefix ranges
+        self.keys = [compact_code(course['code']) for course in courses]
+        self.by_key = {key: idx for idx, key in enumerate(self.keys)}
+        self._deletes: Optional[Dict[str, List[int]]] = None
+
+    @classmethod
+    def build(cls, files: Sequence[str]) -> 'CourseSearch':
+        courses = collect_courses(files)
+        fields = {}
+        for field in FIELD_WEIGHTS:
+            bm25 = BM25()
+            bm25.fit([course[field] for course in courses])
+            fields[field] = bm25
+        return cls(courses, fields, _digests(files))
+
+    def to_dict(self) -> Dict:
+        """Compact form: records plus per-field lengths and term -> [doc ids, term frequencies]."""
+        return {
+            'version': INDEX_VERSION,
+            'sources': self.sources,
+            'courses': self.courses,
+            'fields': {
+                field: {'lengths': bm25.doc_lengths,
+                        'terms': {term: [doc_ids, tfs] for term, (doc_ids, tfs, _) in bm25.postings.items()}}
+                for field, bm25 in self.fields.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, stored: Dict) -> 'CourseSearch':
+        fields = {}
+        for field, data in stored['fields'].items():
+            bm25 = BM25()
+            bm25.fit_counts(data['lengths'], {term: dict(zip(doc_ids, tfs))
+                                              for term, (doc_ids, tfs) in data['terms'].items()})
+            fields[field] = bm25
+        return cls(stored['courses'], fields, stored.get('sources'))
+
+    # ----------------------------
+    # Code matching
+    # ----------------------------
+    @staticmethod
+    def _variants(key: str) -> List[str]:
+        """`key` with each single character deleted"""
+        return [key[:i] + key[i + 1:] for i in range(len(key))]
+
+    def _fuzzy(self, key: str) -> List[int]:
+        """Courses whose compact code is one insertion, deletion or substitution away from `key`."""
+        if self._deletes is None:
+            self._deletes = defaultdict(list)
+            for idx, course_key in enumerate(self.keys):
+                for variant in set(self._variants(course_key)):
+                    self._deletes[variant].append(idx)
+        found = set()
+        candidates = [self.by_key.get(v) for v in self._variants(key)]   # query has an extra character
+        candidates += self._deletes.get(key, [])                         # query is missing one
+        for variant in set(self._variants(key)):                         # one character differs
+            candidates += self._deletes.get(variant, [])
+        for idx in candidates:
+            if idx is not None and self.keys[idx] != key:
+                found.add(idx)
+        return sorted(found)
+
+    def match_codes(self, query: str) -> Dict[int, int]:
+        """{course idx: match tier} for every course code (full or partial) in `query`."""
+        tiers: Dict[int, int] = {}
+
+        def mark(idx, tier):
+            if tiers.get(idx, TEXT) < tier:
+                tiers[idx] = tier
+
+        for subject, number in CODE_QUERY.findall(query):
+            key = (subject + number).upper()
+            if len(number) < 3 or not number[:3].isdigit():   # partial number: prefix range
+                start = bisect.bisect_left(self.keys, key)
+                end = bisect.bisect_left(self.keys, key + '\uffff')
+                for idx in range(start, end):
+                    mark(idx, PREFIX)
+                continue
+            idx = self.by_key.get(key)
+            if idx is not None:
+                mark(idx, EXACT)
+            else:
+                for idx in self._fuzzy(key):
+                    mark(idx, FUZZY)
+        return tiers
+
+    # ----------------------------
+    # Search
+    # ----------------------------
+    def text_scores(self, query: str) -> Dict[int, float]:
+        """{course idx: field-weighted BM25 score} for courses containing a query term."""
+        scores: Dict[int, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for idx, score in self.fields[field]._accumulate(query).items():
+                scores[idx] = scores.get(idx, 0) + weight * score
+        return scores
+
+    def search(self, query: str, k: int = 10) -> List[Dict]:
+        """Best `k` courses: code matches first (exact, prefix, fuzzy), then by text score."""
+        # "math255" / "MATH_V 255" score like "MATH 255" in the text fields too
+        scores = self.text_scores(CODE_QUERY.sub(lambda m: f"{m.group(1)} {m.group(2)}", query))
+        tiers = self.match_codes(query)
+        ranked = sorted(set(scores) | set(tiers),
+                        key=lambda idx: (-tiers.get(idx, TEXT), -scores.get(idx, 0), idx))[:k]
+        return [dict(self.courses[idx], score=round(scores.get(idx, 0), 4),
+                     match=MATCH_NAMES[tiers.get(idx, TEXT)]) for idx in ranked]
+
+    def lookup(self, code: str) -> Optional[Dict]:
+        """The record for one course code in any spelling, or None."""
+        idx = self.by_key.get(compact_code(code))
+        return self.courses[idx] if idx is not None else None
+
+
+def load_index(index_path: str = DEFAULT_INDEX_PATH, files: Optional[Sequence[str]] = None,
+               rebuild: bool = False) -> CourseSearch:
+    """The stored index if it matches the current sources, else a fresh build (written back)."""
+    files = source_files() if files is None else list(files)
+    if not rebuild:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == INDEX_VERSION and stored.get('sources') == _digests(files):
+                return CourseSearch.from_dict(stored)
+        except (OSError, ValueError, KeyError):
+            pass  # missing, stale or unreadable index: rebuild
+    index = CourseSearch.build(files)
+    write_json(index_path, index.to_dict(), indent=None)
+    return index
+
+
+def format_result(rank: int, result: Dict) -> str:
+    lines = [f"{rank}. {result['code']}  [{result['match']}, score {result['score']}]"]
+    if result['title']:
+        lines.append(f"   {result['title']}")
+    if result['description']:
+        description = result['description']
+        lines.append(f"   {description[:160]}{'...' if len(description) > 160 else ''}")
+    if result['prerequisites']:
+        lines.append(f"   Prerequisites: {' '.join(result['prerequisites'].split())[:160]}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the scraped UBC course catalog')
+    parser.add_argument('query', nargs='?', help='Free text and/or course codes ("MATH_V 255", "MATH 2")')
+    parser.add_argument('-n', '--max-results', type=int, default=10, help='Max results (default: 10)')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--build', action='store_true', help='Rebuild the stored index')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Index file')
+    args = parser.parse_args()
+
+    if args.query is None and not args.build:
+        parser.error('a query is required (or use --build)')
+
+    started = time.perf_counter()
+    index = load_index(args.index, rebuild=args.build)
+    if args.build:
+        print(f"✓ Indexed {len(index.courses)} courses from {len(index.sources)} files "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms: {os.path.relpath(args.index, PROJECT_ROOT)}")
+    if args.query is None:
+        return
+
+    results = index.search(args.query, args.max_results)
+    if args.json:
+        print(json.dumps({'query': args.query, 'count': len(results), 'results': results},
+                         indent=2, ensure_ascii=False))
+        return
+    if not results:
+        print(f"⚠️  No courses match: {args.query}")
+        return
+    print(f"Found {len(results)} courses for: {args.query}\n")
+    for rank, result in enumerate(results, 1):
+        print(format_result(rank, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""
+Process-Isolated Worker Pool for Selenium Scrapers
+Runs a bounded number of worker processes, each owning one browser. The parent
+hands each idle worker one item at a time on that worker's own task queue, so
+it always knows which item every worker holds.
+
+- One process per driver: a Chrome crash (or a hung/killed worker) only takes
+  down that process; its in-flight item is re-queued and a replacement worker
+  is started.
+- A failed item makes the worker throw away its driver and start a fresh
+  one; the item is retried up to `retries` times. Only an exception from
+  process() is a failure, so a legitimately empty result ({} or []) is kept;
+  callers whose workers signal failure by value pass `is_valid(result)`
+  (module-level, picklable) and results it rejects are retried too.
+- run(items, affinity=key) hands an idle worker the next item with the same
+  key as its previous one (e.g. the province whose page it has loaded), and
+  otherwise the first item of a key no other worker is on; workers only
+  share a key once every key has been started.
+- Results come back keyed by item, so callers can merge them in their own
+  deterministic order.
+
+Workers are built by `make_worker()` inside the child process. The returned
+object needs `process(item)` and `close()`, and may expose `timings`
+(a scraper.utils.selenium_waits.WaitTimings) whose samples are sent back to
+the parent when the worker shuts down. `make_worker` and the items must be
+picklable (module-level class/function, plain tuples).
+
+Usage:
+    from scraper.utils.driver_pool import DriverPool
+
+    pool = DriverPool(make_worker=MyWorker, size=4, retries=2)
+    results = pool.run(items)        # {item: result or None if it kept failing}
+    pool.run(items, on_result=checkpoint_item)   # also called as each item succeeds
+    pool.run(items, affinity=lambda item: item[0])   # same worker for items sharing item[0]
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+
+def _worker_main(make_worker: Callable, tasks, results, is_valid: Optional[Callable[[Any], bool]] = None):
+    """Child process loop: build a worker, process items until the None sentinel."""
+    worker = make_worker()
+    results.put(('ready', os.getpid(), None))
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, item = task
+            try:
+                value = worker.process(item)
+                error = None if is_valid is None or is_valid(value) else 'invalid result'
+            except Exception as e:
+                value, error = None, repr(e)
+
+            if error is None:
+                results.put(('done', index, value))
+            else:
+                results.put(('failed', index, error))
+                # Retry on a fresh browser: the old one may be wedged
+                worker.close()
+                worker = make_worker()
+    finally:
+        timings = getattr(worker, 'timings', None)
+        if timings is not None:
+            results.put(('timings', timings.samples, timings.timeouts))
+        worker.close()
+        results.put(('exit', os.getpid(), None))
+
+
+class DriverPool:
+    """Bounded pool of worker processes with retry and crash recovery."""
+
+    def __init__(self, make_worker: Callable, size: int = 4, retries: int = 2,
+                 poll_interval: float = 1.0, is_valid: Optional[Callable[[Any], bool]] = None):
+        self.make_worker = make_worker
+        self.is_valid = is_valid
+        self.size = max(1, size)
+        self.retries = retries
+        self.poll_interval = poll_interval
+        self.timing_samples: Dict[str, List[float]] = {}
+        self.timing_timeouts: Dict[str, int] = {}
+
+    def _start_worker(self, ctx, results):
+        tasks = ctx.Queue()
+        proc = ctx.Process(target=_worker_main, args=(self.make_worker, tasks, results, self.is_valid),
+                           daemon=True)
+        proc.start()
+        return proc, tasks
+
+    def _merge_timings(self, samples: Dict[str, List[float]], timeouts: Dict[str, int]):
+        for label, values in samples.items():
+            self.timing_samples.setdefault(label, []).extend(values)
+        for label, count in timeouts.items():
+            self.timing_timeouts[label] = self.timing_timeouts.get(label, 0) + count
+
+    def run(self, items: Iterable[Hashable],
+            on_result: Optional[Callable[[Hashable, object], None]] = None,
+            affinity: Optional[Callable[[Hashable], Hashable]] = None) -> Dict[Hashable, Optional[object]]:
+        """
+        Process all items; returns {item: result}, None for items that kept failing.
+        on_result(item, result) is called in this process as soon as an item succeeds.
+        affinity(item) groups items that should stay on one worker (called in this process).
+        """
+        items = list(items)
+        if not items:
+            return {}
+
+        ctx = mp.get_context()
+        results = ctx.Queue()
+        pending = deque(range(len(items)))
+
+        attempts = [0] * len(items)
+        outcome: Dict[int, Optional[object]] = {}
+        procs = {}                      # pid -> (process, its task queue)
+        idle = set()                    # pids that are ready and hold no item
+        assigned: Dict[int, int] = {}   # pid -> item index
+        keys = [affinity(item) for item in items] if affinity else None
+        worker_key: Dict[int, Hashable] = {}   # pid -> affinity key of its last item
+        for _ in range(min(self.size, len(items))):
+            proc, tasks = self._start_worker(ctx, results)
+            procs[proc.pid] = (proc, tasks)
+
+        started = time.monotonic()
+        restarts = 0
+        max_restarts = self.size * (self.retries + 1)
+
+        def fail(index: int, error: str):
+            attempts[index] += 1
+            if attempts[index] <= self.retries:
+                print(f"  ⚠️  {items[index]} failed ({error}), retry {attempts[index]}/{self.retries}")
+                pending.append(index)
+            else:
+                print(f"  ❌ {items[index]} failed after {attempts[index]} attempt(s): {error}")
+                outcome[index] = None
+
+        def release(index: int):
+            """Mark the worker that held `index` idle again."""
+            for pid, held in list(assigned.items()):
+                if held == index:
+                    del assigned[pid]
+                    idle.add(pid)
+
+        def handle(kind, a, b):
+            if kind == 'ready':
+                if a in procs:
+                    idle.add(a)
+            elif kind == 'done':
+                release(a)
+                if a not in outcome:
+                    outcome[a] = b
+                    print(f"  ✓ [{len(outcome)}/{len(items)}] {items[a]}")
+                    if on_result is not None:
+                        on_result(items[a], b)
+            elif kind == 'failed':
+                release(a)
+                if a not in outcome:
+                    fail(a, b)
+            elif kind == 'timings':
+                self._merge_timings(a, b)
+
+        def next_for(pid: int) -> int:
+            """Pending position of the item `pid` should take next."""
+            if keys is None:
+                return 0
+            own = worker_key.get(pid)
+            taken = {key for other, key in worker_key.items() if other != pid and other in procs}
+            fresh = None
+            for position, index in enumerate(pending):
+                if own is not None and keys[index] == own:
+                    return position
+                if fresh is None and keys[index] not in taken:
+                    fresh = position
+            return fresh if fresh is not None else 0
+
+        def dispatch():
+            while idle:
+                # Drop items settled while queued (e.g. a late result from a retried item)
+                for index in [i for i in pending if i in outcome]:
+                    pending.remove(index)
+                if not pending:
+                    break
+                pid = idle.pop()
+                position = next_for(pid)
+                index = pending[position]
+                del pending[position]
+                assigned[pid] = index
+                if keys is not None:
+                    worker_key[pid] = keys[index]
+                procs[pid][1].put((index, items[index]))
+
+        last_check = time.monotonic()
+        while len(outcome) < len(items):
+            dispatch()
+            try:
+                kind, a, b = results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                kind = None
+            if kind is not None:
+                handle(kind, a, b)
+
+            if kind is None or time.monotonic() - last_check > self.poll_interval:
+                last_check = time.monotonic()
+                # Take in anything a dying worker managed to send before judging it
+                while True:
+                    try:
+                        handle(*results.get_nowait())
+                    except queue.Empty:
+                        break
+                # Replace workers that died mid-item (browser crash, OOM kill, ...)
+                for pid, (proc, _) in list(procs.items()):
+                    if proc.is_alive():
+                        continue
+                    del procs[pid]
+                    idle.discard(pid)
+                    worker_key.pop(pid, None)
+                    index = assigned.pop(pid, None)
+                    if index is not None and index not in outcome:
+                        fail(index, f"worker exited with code {proc.exitcode}")
+                    if len(outcome) < len(items):
+                        restarts += 1
+                        if restarts > max_restarts:
+                            # Workers keep dying (e.g. Chrome cannot start); give up on the rest
+                            print(f"  ❌ Workers crashed {restarts} times, abandoning remaining items")
+                            for i in range(len(items)):
+                                outcome.setdefault(i, None)
+                            break
+                        new_proc, new_tasks = self._start_worker(ctx, results)
+                        procs[new_proc.pid] = (new_proc, new_tasks)
+
+        # Shut the workers down and collect their timing samples
+        for _, tasks in procs.values():
+            tasks.put(None)
+        deadline = time.monotonic() + 30
+        exited = 0
+        while exited < len(procs) and time.monotonic() < deadline:
+            try:
+                kind, a, b = results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                if not any(p.is_alive() for p, _ in procs.values()):
+                    break
+                continue
+            if kind == 'timings':
+                self._merge_timings(a, b)
+            elif kind == 'exit':
+                exited += 1
+        for proc, _ in procs.values():
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+
+        print(f"  Pool finished {len(items)} item(s) in {time.monotonic() - started:.1f}s "
+              f"with {self.size} worker(s)")
+        return {items[i]: outcome.get(i) for i in range(len(items))}
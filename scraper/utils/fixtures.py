@@ -0,0 +1,247 @@
+"""
+Record / Replay Fixtures for Scraper Runs
+Captures everything a scraper reads from the network into a compressed archive
+(--record) and serves it back later with no network and no sleeps (--replay).
+
+Entries are keyed by URL plus an optional "selection state" string, so a single
+Selenium page can be stored once per dropdown selection, e.g.
+    url=https://you.ubc.ca/.../canadian-high-schools/, state="province=alberta&degree=Arts"
+
+What gets recorded:
+- Every GET/HEAD made through scraper.utils.http_cache.CachedSession
+- Selenium page_source snapshots taken through page_source()
+- Small JSON values (dropdown option lists, ...) through record_value()/replay_value()
+
+Archives are zip files (deflate) and are rewritten atomically on exit; recording
+into an existing archive keeps its other entries, so several runs (or the
+per-major subprocesses of a batch script) can add to the same file.
+
+Usage:
+    python scripts/scrape_course_details.py --subject mathv --code MATH --record fixtures/math.zip
+    python scripts/scrape_course_details.py --subject mathv --code MATH --replay fixtures/math.zip
+
+    from scraper.utils import fixtures
+    fixtures.configure_from_argv()           # scripts that read sys.argv by hand
+    fixtures.add_arguments(parser)           # argparse scripts ...
+    fixtures.configure(args.record, args.replay)
+"""
+
+import argparse
+import atexit
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+
+class FixtureMissing(KeyError):
+    """Raised in replay mode when nothing was recorded for a URL/state."""
+
+
+class FixtureArchive:
+    """In-memory view of a fixture zip; saved back to disk on close()."""
+
+    def __init__(self, path: str, mode: str):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown fixture mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.entries: Dict[str, Tuple[Dict, bytes]] = {}
+        self.misses: List[str] = []
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self.entries = self._read_archive()
+        elif mode == 'replay':
+            raise FileNotFoundError(f"Fixture archive not found: {path}")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == 'record'
+
+    @staticmethod
+    def make_key(url: str, state: str = '') -> str:
+        return hashlib.sha1(f"{url}|{state}".encode('utf-8')).hexdigest()
+
+    # ----------------------------
+    # Archive I/O
+    # ----------------------------
+    def _read_archive(self) -> Dict[str, Tuple[Dict, bytes]]:
+        entries = {}
+        with zipfile.ZipFile(self.path, 'r') as zf:
+            names = set(zf.namelist())
+            for name in names:
+                if not name.endswith('.json'):
+                    continue
+                key = name[:-len('.json')]
+                meta = json.loads(zf.read(name).decode('utf-8'))
+                body_name = f"{key}.body"
+                body = zf.read(body_name) if body_name in names else b''
+                entries[key] = (meta, body)
+        return entries
+
+    def save(self):
+        """Write all entries to a temp file, then atomically replace the archive."""
+        if not self.recording or not self._dirty:
+            return
+        # Keep entries another process (e.g. a child scraper) added meanwhile
+        if os.path.exists(self.path):
+            for key, entry in self._read_archive().items():
+                self.entries.setdefault(key, entry)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.zip.tmp')
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                for key in sorted(self.entries):
+                    meta, body = self.entries[key]
+                    zf.writestr(f"{key}.json", json.dumps(meta, ensure_ascii=False, sort_keys=True))
+                    zf.writestr(f"{key}.body", body)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            print(f"✓ Recorded {len(self.entries)} fixture(s) to {self.path}")
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self):
+        self.save()
+        if self.replaying and self.misses:
+            print(f"⚠️  {len(self.misses)} request(s) had no recorded fixture in {self.path}")
+
+    # ----------------------------
+    # Raw entries
+    # ----------------------------
+    def put(self, url: str, state: str, meta: Dict, body: bytes):
+        meta = dict(meta, url=url, state=state)
+        with self._lock:
+            self.entries[self.make_key(url, state)] = (meta, body)
+            self._dirty = True
+
+    def get(self, url: str, state: str = '') -> Tuple[Dict, bytes]:
+        try:
+            return self.entries[self.make_key(url, state)]
+        except KeyError:
+            self.misses.append(f"{url} [{state}]" if state else url)
+            raise FixtureMissing(f"No recorded fixture for {url}" + (f" [{state}]" if state else ''))
+
+    # ----------------------------
+    # HTTP responses
+    # ----------------------------
+    def record_response(self, url: str, response, state: str = ''):
+        meta = {
+            'kind': 'response',
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+        }
+        self.put(url, state, meta, response.content)
+
+    # ----------------------------
+    # Selenium snapshots and small values
+    # ----------------------------
+    def record_text(self, url: str, state: str, text: str):
+        self.put(url, state, {'kind': 'text'}, text.encode('utf-8'))
+
+    def replay_text(self, url: str, state: str = '') -> str:
+        _, body = self.get(url, state)
+        return body.decode('utf-8')
+
+
+_archive: Optional[FixtureArchive] = None
+
+
+def configure(record: Optional[str] = None, replay: Optional[str] = None) -> Optional[FixtureArchive]:
+    """Activate record or replay mode for this process (at most one of the two)."""
+    global _archive
+    if record and replay:
+        raise ValueError("--record and --replay cannot be used together")
+    if _archive is not None:
+        _archive.close()
+        _archive = None
+    if record or replay:
+        _archive = FixtureArchive(record or replay, 'record' if record else 'replay')
+        atexit.register(_archive.close)
+        print(f"Fixture mode: {_archive.mode.upper()} ({_archive.path})")
+    return _archive
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Add --record/--replay options to an argparse parser."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--record', metavar='ARCHIVE', default=None,
+                       help='Record all fetched pages into a fixture archive (.zip)')
+    group.add_argument('--replay', metavar='ARCHIVE', default=None,
+                       help='Replay pages from a fixture archive (no network, no delays)')
+
+
+def configure_from_argv(argv: Optional[List[str]] = None) -> Optional[FixtureArchive]:
+    """
+    Pull --record PATH / --replay PATH out of argv (sys.argv by default) and activate them.
+    The flags are removed in place so scripts that read sys.argv by hand keep working.
+    """
+    argv = sys.argv if argv is None else argv
+    paths = {}
+    for flag in ('--record', '--replay'):
+        if flag in argv:
+            idx = argv.index(flag)
+            if idx + 1 >= len(argv):
+                raise SystemExit(f"{flag} requires an archive path")
+            paths[flag] = argv[idx + 1]
+            del argv[idx:idx + 2]
+    return configure(record=paths.get('--record'), replay=paths.get('--replay'))
+
+
+def fixture_argv() -> List[str]:
+    """Flags that re-create the current fixture mode in a child process."""
+    if _archive is None:
+        return []
+    # Save first so the child sees everything recorded so far
+    _archive.save()
+    return [f"--{_archive.mode}", _archive.path]
+
+
+def active_archive() -> Optional[FixtureArchive]:
+    return _archive
+
+
+def replaying() -> bool:
+    return _archive is not None and _archive.replaying
+
+
+def recording() -> bool:
+    return _archive is not None and _archive.recording
+
+
+def page_source(driver, url: str, state: str = '') -> str:
+    """
+    Selenium page_source that participates in record/replay.
+    In replay mode `driver` may be None.
+    """
+    if replaying():
+        return _archive.replay_text(url, state)
+    source = driver.page_source
+    if recording():
+        _archive.record_text(url, state, source)
+    return source
+
+
+def record_value(url: str, state: str, value):
+    """Record a small JSON-serialisable value (e.g. dropdown options)."""
+    if recording():
+        _archive.record_text(url, state, json.dumps(value, ensure_ascii=False))
+
+
+def replay_value(url: str, state: str = ''):
+    return json.loads(_archive.replay_text(url, state))
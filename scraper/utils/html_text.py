@@ -0,0 +1,106 @@
+"""
+Fast, Partial HTML Parsing for Calendar Pages
+The calendar scrapers only need the text of a page's main content, but used to
+build a full BeautifulSoup tree with the pure-Python 'html.parser' and throw
+most of it (navigation, footer, scripts) away.
+
+- Partial parsing: a SoupStrainer keeps only <main>/<article>, so the rest
+  of the document is tokenized but never becomes a tree (about half the
+  parse time and memory of a full tree)
+- Pluggable backend: 'html.parser' by default, because it is the only tree
+  builder whose text is guaranteed to match what the scrapers produced so
+  far. lxml is faster again but repairs broken or oddly nested markup (and
+  CRLF line ends) differently, so opt in with UBC_HTML_PARSER=lxml or
+  set_backend('lxml') only after the benchmark shows identical text on
+  recorded pages
+- main_text() picks the container exactly like the scrapers did (first
+  selector in CONTENT_SELECTORS that matches, else <body>, else the whole
+  document) and returns the same get_text() output
+
+Usage:
+    from scraper.utils import html_text
+
+    full_text = html_text.main_text(response.content)   # main/article/... text
+    soup = html_text.parse(response.content)             # full tree, selected backend
+
+Benchmark: python scraper/utils/benchmark_html_parsing.py [--archive fixtures/math.zip]
+"""
+
+import importlib.util
+import os
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+
+# Supported tree builders; the first one is the default
+BACKENDS = ('html.parser', 'lxml')
+
+# Content containers in the order the scrapers try them
+CONTENT_SELECTORS = ('main', 'article', '.content', '#content', '.main-content')
+
+_backend: Optional[str] = None
+
+
+def available_backends() -> List[str]:
+    """Tree builders from BACKENDS that can be used here."""
+    return [name for name in BACKENDS if name != 'lxml' or importlib.util.find_spec('lxml') is not None]
+
+
+def set_backend(name: Optional[str]):
+    """Force a tree builder ('lxml', 'html.parser'); None restores auto-detection."""
+    global _backend
+    if name is not None and name not in available_backends():
+        raise ValueError(f"HTML parser backend not available: {name}")
+    _backend = name
+
+
+def backend() -> str:
+    """The tree builder in use: set_backend() > UBC_HTML_PARSER > 'html.parser'."""
+    if _backend:
+        return _backend
+    requested = os.environ.get('UBC_HTML_PARSER')
+    available = available_backends()
+    if requested in available:
+        return requested
+    return available[0]
+
+
+def parse(markup: Union[str, bytes], parser: Optional[str] = None) -> BeautifulSoup:
+    """Full document tree with the selected backend."""
+    return BeautifulSoup(markup, parser or backend())
+
+
+# Nearly every calendar page has <main>; only main/article are strained so the
+# same SoupStrainer works across BeautifulSoup versions
+CONTENT_STRAINER = SoupStrainer(['main', 'article'])
+
+
+def main_content(markup: Union[str, bytes], parser: Optional[str] = None) -> Tag:
+    """
+    The main content container of a page (first match of CONTENT_SELECTORS).
+
+    <main> and <article> come from a partial parse: every one of them is either
+    kept or nested inside a kept one, so the first match in the partial tree is
+    the first match in the full document. Pages without them are parsed in
+    full and fall back to .content / #content / .main-content, then <body>.
+    """
+    parser = parser or backend()
+    partial = BeautifulSoup(markup, parser, parse_only=CONTENT_STRAINER)
+    for selector in ('main', 'article'):
+        found = partial.select_one(selector)
+        if found:
+            return found
+
+    soup = BeautifulSoup(markup, parser)
+    for selector in CONTENT_SELECTORS:
+        found = soup.select_one(selector)
+        if found:
+            return found
+    return soup.find('body') or soup
+
+
+def main_text(markup: Union[str, bytes], separator: str = '\n', strip: bool = False,
+              parser: Optional[str] = None) -> str:
+    """get_text() of the page's main content container."""
+    return main_content(markup, parser).get_text(separator=separator, strip=strip)
@@ -0,0 +1,350 @@
+"""
+Shared On-Disk HTTP Cache
+A drop-in replacement for requests.Session that keeps calendar pages on disk
+between runs and revalidates them with ETag / If-Modified-Since.
+
+Bodies live in a content-addressed store (blobs/<sha256>), so identical pages
+fetched from different URLs are stored once. A small JSON index maps each URL
+to its blob plus the validators the server sent back.
+
+- Fresh entries (younger than `ttl`) are served with no network request at all.
+- Stale entries are revalidated; a 304 reply re-uses the stored body.
+- Entries older than `max_age` are purged, and the least recently used
+  entries are evicted once the store grows past `max_bytes`.
+- Cache hits only mark the index dirty; it is flushed on the next store and
+  at exit. Every flush re-reads index.json under a lock file and merges it,
+  so pipeline stages sharing the cache never overwrite each other's entries.
+
+Usage:
+    from scraper.utils.http_cache import CachedSession
+
+    session = CachedSession()
+    if not session.is_fresh(url):
+        time.sleep(delay)  # only be polite when we actually hit the server
+    response = session.get(url, timeout=15)
+
+Environment:
+    UBC_HTTP_CACHE=off        Disable the cache (plain requests.Session behaviour)
+    UBC_HTTP_CACHE_DIR=PATH   Cache location (default: scraper/data/http_cache)
+    UBC_HTTP_CACHE_TTL=SECS   Freshness window (default: 86400)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked merge-on-write
+    fcntl = None
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from scraper.utils import fixtures
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'http_cache')
+
+DEFAULT_TTL = 24 * 60 * 60           # serve without revalidation for a day
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # drop entries untouched for a month
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Response headers worth keeping alongside the body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def cache_enabled() -> bool:
+    """Return False when the cache is switched off via UBC_HTTP_CACHE."""
+    return os.environ.get('UBC_HTTP_CACHE', 'on').strip().lower() not in ('0', 'off', 'false', 'no')
+
+
+class HTTPCache:
+    """Content-addressed response store with a JSON index keyed by URL."""
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None,
+                 max_age: float = DEFAULT_MAX_AGE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get('UBC_HTTP_CACHE_DIR') or DEFAULT_CACHE_DIR
+        self.ttl = ttl if ttl is not None else float(os.environ.get('UBC_HTTP_CACHE_TTL', DEFAULT_TTL))
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+        self.blob_dir = os.path.join(self.cache_dir, 'blobs')
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self.lock_path = os.path.join(self.cache_dir, 'index.lock')
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.index: Dict[str, Dict] = self._load_index()
+        self._dirty = False
+        # URL -> time we dropped it, so a merge does not resurrect older copies
+        self._removed: Dict[str, float] = {}
+        atexit.register(self.flush)
+
+    # ----------------------------
+    # Index persistence
+    # ----------------------------
+    def _load_index(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  HTTP cache index unreadable ({e}), starting empty")
+            return {}
+
+    def _merge_disk_index(self):
+        """Fold in entries other processes wrote since we loaded the index."""
+        for url, disk in self._load_index().items():
+            if disk['stored_at'] <= self._removed.get(url, float('-inf')):
+                continue
+            ours = self.index.get(url)
+            if ours is None or disk['stored_at'] > ours['stored_at']:
+                if ours is not None:
+                    disk['accessed_at'] = max(disk['accessed_at'], ours['accessed_at'])
+                self.index[url] = disk
+            else:
+                ours['accessed_at'] = max(ours['accessed_at'], disk['accessed_at'])
+
+    def _save_index(self):
+        """
+        Merge with the on-disk index, evict, and write it back through a temp
+        file so a crash never truncates it. Callers hold self._lock.
+        """
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._merge_disk_index()
+                self._evict()
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(self.index, f)
+                    os.replace(tmp_path, self.index_path)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+                self._dirty = False
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def flush(self):
+        """Write pending access-time updates (runs automatically at exit)."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    # ----------------------------
+    # Lookup / store
+    # ----------------------------
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the index entry for a URL if its blob is still on disk."""
+        entry = self.index.get(url)
+        if entry and os.path.exists(self._blob_path(entry['blob'])):
+            return entry
+        return None
+
+    def is_fresh(self, url: str) -> bool:
+        """True if the URL can be served without contacting the server."""
+        entry = self.lookup(url)
+        return bool(entry) and (time.time() - entry['stored_at']) < self.ttl
+
+    def read_body(self, entry: Dict) -> bytes:
+        with open(self._blob_path(entry['blob']), 'rb') as f:
+            return f.read()
+
+    def store(self, url: str, response: requests.Response):
+        """Store a 200 response body and its validators."""
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+
+        with self._lock:
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, blob_path)
+
+            now = time.time()
+            self.index[url] = {
+                'blob': digest,
+                'size': len(body),
+                'encoding': response.encoding,
+                'headers': {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+                'stored_at': now,
+                'accessed_at': now,
+            }
+            self._removed.pop(url, None)
+            self._save_index()
+
+    def touch(self, url: str, revalidated: bool = False):
+        """Mark an entry as used; a successful revalidation also resets its age."""
+        with self._lock:
+            entry = self.index.get(url)
+            if not entry:
+                return
+            now = time.time()
+            entry['accessed_at'] = now
+            if revalidated:
+                entry['stored_at'] = now
+            self._dirty = True
+
+    def invalidate(self, url: str):
+        """Forget a URL (e.g. after detecting a block page)."""
+        with self._lock:
+            entry = self.index.pop(url, None)
+            if entry is not None:
+                self._removed[url] = time.time()
+                self._save_index()
+                self._remove_blobs({entry['blob']})
+
+    # ----------------------------
+    # Eviction
+    # ----------------------------
+    def _evict(self):
+        """
+        Drop expired entries, then least recently used ones until under
+        max_bytes. Runs on the merged index, so sizes and recency cover every
+        process sharing the cache.
+        """
+        now = time.time()
+        dropped = set()
+        for url in [u for u, e in self.index.items() if now - e['accessed_at'] > self.max_age]:
+            dropped.add(self.index.pop(url)['blob'])
+            self._removed[url] = now
+
+        # Blobs are shared between URLs, so count each one once
+        refs: Dict[str, int] = {}
+        sizes: Dict[str, int] = {}
+        for e in self.index.values():
+            refs[e['blob']] = refs.get(e['blob'], 0) + 1
+            sizes[e['blob']] = e['size']
+        total = sum(sizes.values())
+
+        if total > self.max_bytes:
+            for url in sorted(self.index, key=lambda u: self.index[u]['accessed_at']):
+                digest = self.index.pop(url)['blob']
+                self._removed[url] = now
+                refs[digest] -= 1
+                if refs[digest] == 0:
+                    total -= sizes[digest]
+                    dropped.add(digest)
+                if total <= self.max_bytes:
+                    break
+
+        self._remove_blobs(dropped)
+
+    def _remove_blobs(self, digests):
+        """Delete blobs that no index entry points at any more."""
+        live = {e['blob'] for e in self.index.values()}
+        for digest in digests - live:
+            path = self._blob_path(digest)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class CachedSession(requests.Session):
+    """
+    requests.Session whose GET requests go through HTTPCache.
+
+    GET and HEAD also take part in record/replay (scraper.utils.fixtures):
+    recorded runs store every response, replayed runs never touch the network.
+
+    Only plain GETs that come back 200 are cached. Pass `cacheable` to veto
+    responses that look fine at the HTTP level but are not (bot-block pages).
+    Responses served from disk carry `from_cache = True`.
+    """
+
+    def __init__(self, cache: Optional[HTTPCache] = None,
+                 cacheable: Optional[Callable[[requests.Response], bool]] = None):
+        super().__init__()
+        self.cache = cache if cache is not None else (HTTPCache() if cache_enabled() else None)
+        self.cacheable = cacheable
+
+    def is_fresh(self, url: str) -> bool:
+        """True if url will be answered without touching the network (cache hit or replay)."""
+        if fixtures.replaying():
+            return True
+        return self.cache is not None and self.cache.is_fresh(url)
+
+    def get(self, url, **kwargs) -> requests.Response:
+        archive = fixtures.active_archive()
+        if archive and archive.replaying:
+            return self._replay(archive, url)
+
+        response = self._cached_get(url, **kwargs)
+        if archive:
+            archive.record_response(url, response)
+        return response
+
+    def head(self, url, **kwargs) -> requests.Response:
+        archive = fixtures.active_archive()
+        if archive and archive.replaying:
+            return self._replay(archive, url, state='HEAD')
+
+        response = super().head(url, **kwargs)
+        if archive:
+            archive.record_response(url, response, state='HEAD')
+        return response
+
+    def _cached_get(self, url, **kwargs) -> requests.Response:
+        if self.cache is None or kwargs.get('params') or kwargs.get('stream'):
+            return super().get(url, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry and self.cache.is_fresh(url):
+            self.cache.touch(url)
+            return self._build_response(url, self.cache.read_body(entry), entry['headers'], entry.get('encoding'))
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry:
+            if 'ETag' in entry['headers']:
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+
+        response = super().get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(url, revalidated=True)
+            return self._build_response(url, self.cache.read_body(entry), entry['headers'], entry.get('encoding'))
+
+        if response.status_code == 200 and (self.cacheable is None or self.cacheable(response)):
+            self.cache.store(url, response)
+        response.from_cache = False
+        return response
+
+    def _replay(self, archive: 'fixtures.FixtureArchive', url: str, state: str = '') -> requests.Response:
+        try:
+            meta, body = archive.get(url, state)
+        except fixtures.FixtureMissing as e:
+            # Surface as a network error so the scrapers' existing handlers apply
+            raise requests.ConnectionError(str(e))
+        return self._build_response(url, body, meta.get('headers', {}), meta.get('encoding'),
+                                    status=meta.get('status', 200), reason='OK (replay)')
+
+    def _build_response(self, url: str, body: bytes, headers: Dict, encoding: Optional[str],
+                        status: int = 200, reason: str = 'OK (cached)') -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.url = url
+        response._content = body
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = encoding
+        response.reason = reason
+        response.from_cache = True
+        return response
@@ -0,0 +1,103 @@
+"""
+Atomic, Diff-Aware JSON Writer
+Every scraper and data-processing step used to rewrite its output with
+open(path, 'w') + json.dump(indent=2). A crash mid-write left a truncated file
+in src/data, and re-running a step with identical results still touched every
+file, so the Vite dev server reloaded and rebuilt for nothing.
+
+- Fast encoder: orjson when installed (OPT_INDENT_2, byte-identical to
+  json.dumps(indent=2, ensure_ascii=False) on the repo's data), otherwise the
+  standard json module; anything orjson refuses (non-string keys, integers
+  beyond 64 bits) falls back to json
+- Diff-aware: the new bytes are compared (size, then SHA-256) with the file on
+  disk; identical output is not written and the mtime is left alone
+- Atomic: changed output goes to a temp file in the same directory, is
+  flushed and fsync'ed, then renamed over the target with os.replace(), so
+  readers see either the old or the new file, never a partial one
+- The target's permission bits are kept (new files get 0644)
+
+Usage:
+    from scraper.utils.json_writer import write_json
+
+    if write_json(filepath, data):
+        print(f"  Saved: {filepath}")
+    else:
+        print(f"  Unchanged: {filepath}")
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Encoder used by dumps(): 'orjson' or 'json'
+ENCODER = 'orjson' if orjson is not None else 'json'
+
+
+def dumps(data: Any, indent: int = 2) -> bytes:
+    """UTF-8 JSON, formatted like json.dumps(data, indent=indent, ensure_ascii=False)."""
+    if orjson is not None and indent == 2:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=indent, ensure_ascii=False).encode('utf-8')
+
+
+def _file_digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def is_unchanged(path: str, payload: bytes) -> bool:
+    """True if `path` already holds exactly `payload`."""
+    try:
+        if os.path.getsize(path) != len(payload):
+            return False
+        return _file_digest(path) == hashlib.sha256(payload).hexdigest()
+    except OSError:
+        return False
+
+
+def write_bytes(path: str, payload: bytes) -> bool:
+    """
+    Atomically replace `path` with `payload` unless it already holds it.
+    Returns True if the file was written, False if it was left untouched.
+    """
+    if is_unchanged(path, payload):
+        return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
+def write_json(path: str, data: Any, indent: int = 2) -> bool:
+    """Serialize `data` and write it with write_bytes(); True if the file changed."""
+    return write_bytes(path, dumps(data, indent))
@@ -0,0 +1,170 @@
+"""
+Capture a Page's Data Requests (XHR / fetch) from Chrome
+Reads Chrome DevTools performance logs to find the background requests a
+client-rendered page makes, so later runs can fetch those payloads directly
+over plain HTTP instead of rendering the page in a browser.
+
+Capture (browser run):
+    enable_performance_logging(chrome_options)     # before webdriver.Chrome(...)
+    discard_requests(driver)                       # forget what happened so far
+    ... select a dropdown option ...
+    manifest.add(state, drain_requests(driver))    # XHR/fetch requests
+    manifest.save()
+
+Refresh (no browser):
+    manifest = PayloadManifest.load(path)
+    for spec in manifest.requests_for(state):
+        response = fetch_payload(session, spec)
+        html = html_fragments(response.text)
+
+The manifest only stores how to repeat each request (URL, method, form data,
+a few headers), not the bodies, so it stays small and can be committed.
+"""
+
+import base64
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+# Resource types Chrome reports for script-initiated requests
+CAPTURE_TYPES = ('XHR', 'Fetch')
+
+# Request headers that some endpoints (e.g. WordPress admin-ajax) check
+REPLAY_HEADERS = ('Content-Type', 'X-Requested-With', 'Accept')
+
+
+def enable_performance_logging(chrome_options):
+    """Ask chromedriver to keep DevTools network events in the 'performance' log."""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+def discard_requests(driver):
+    """Throw away the pending performance-log entries (no CDP round trips)."""
+    driver.get_log('performance')
+
+
+def drain_requests(driver, types=CAPTURE_TYPES, with_bodies: bool = False) -> List[Dict]:
+    """
+    Consume the pending performance-log entries and return the finished
+    data requests they describe. with_bodies=True also fetches each response
+    body over CDP (one round trip per request), e.g. for inspecting payloads.
+    """
+    seen: Dict[str, Dict] = {}
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        request_id = params.get('requestId')
+
+        if method == 'Network.requestWillBeSent':
+            request = params.get('request', {})
+            seen[request_id] = {
+                'url': request.get('url'),
+                'method': request.get('method', 'GET'),
+                'post_data': request.get('postData'),
+                'headers': {h: v for h, v in request.get('headers', {}).items() if h in REPLAY_HEADERS},
+                'type': params.get('type'),
+            }
+        elif method == 'Network.responseReceived':
+            response = params.get('response', {})
+            spec = seen.setdefault(request_id, {'url': response.get('url'), 'method': 'GET',
+                                                'post_data': None, 'headers': {}})
+            spec['type'] = params.get('type', spec.get('type'))
+            spec['status'] = response.get('status')
+            spec['mime_type'] = response.get('mimeType', '')
+        elif method == 'Network.loadingFinished' and request_id in seen:
+            seen[request_id]['finished'] = True
+
+    captured = []
+    for request_id, spec in seen.items():
+        if spec.get('type') not in types or not spec.get('finished'):
+            continue
+        spec = {k: v for k, v in spec.items() if k != 'finished'}
+        if not with_bodies:
+            captured.append(spec)
+            continue
+        try:
+            result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception:
+            continue  # body already evicted by Chrome
+        body = result.get('body', '')
+        if result.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        spec['body'] = body
+        captured.append(spec)
+    return captured
+
+
+def fetch_payload(session: requests.Session, spec: Dict, timeout: float = 15) -> requests.Response:
+    """Repeat a captured request over plain HTTP."""
+    headers = spec.get('headers') or {}
+    if spec.get('method', 'GET').upper() == 'POST':
+        return session.post(spec['url'], data=spec.get('post_data'), headers=headers, timeout=timeout)
+    return session.get(spec['url'], headers=headers, timeout=timeout)
+
+
+def html_fragments(payload: str) -> str:
+    """
+    Pull renderable HTML out of a payload: JSON string values that contain
+    markup are concatenated; a non-JSON body is returned as-is.
+    """
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return payload
+
+    fragments = []
+
+    def walk(value):
+        if isinstance(value, str):
+            if '<' in value and '>' in value:
+                fragments.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                walk(item)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+
+    walk(data)
+    return '\n'.join(fragments)
+
+
+class PayloadManifest:
+    """Per-state list of data requests, saved as JSON: {state: [request spec, ...]}."""
+
+    def __init__(self, path: Optional[str] = None, entries: Optional[Dict[str, List[Dict]]] = None,
+                 meta: Optional[Dict] = None):
+        self.path = path
+        self.entries: Dict[str, List[Dict]] = entries or {}
+        self.meta: Dict = meta or {}
+
+    @classmethod
+    def load(cls, path: str) -> 'PayloadManifest':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(path, data.get('entries', {}), data.get('meta', {}))
+
+    def add(self, state: str, captured: List[Dict]):
+        """Remember how to repeat the requests seen for `state` (bodies are dropped)."""
+        self.entries[state] = [{k: v for k, v in spec.items() if k != 'body'} for spec in captured]
+
+    def requests_for(self, state: str) -> List[Dict]:
+        return self.entries.get(state, [])
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.meta['captured_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': self.meta, 'entries': self.entries}, f, indent=2, ensure_ascii=False)
+        captured = sum(len(v) for v in self.entries.values())
+        print(f"✓ Saved {captured} captured request(s) for {len(self.entries)} page state(s) to {path}")
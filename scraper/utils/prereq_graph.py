@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Prerequisite Graph with Precomputed Closures
+Compiles every course into one integer-indexed directed graph and stores its
+transitive closures as bitsets (Python ints, bit i = course i), so "what does
+failing MATH 101 block?" is one lookup instead of a walk over code strings.
+
+Edges come from:
+- the "pre" requisite ASTs of ubc_math_courses.json and src/data/curriculum/**
+  (see requisites.py; corequisites are not prerequisites and are left out)
+- src/data/engineering_prereqs.json (scrape_engineering_prereqs.py): a
+  first-year course blocks every course in its "direct" and "affected"
+  columns, and notes like "BMEG 220 (Term 2, MATH 256 is pre-req)" add
+  MATH 256 -> BMEG 220
+
+Bitsets per course:
+- direct        its direct prerequisites (any course its requirement mentions)
+- prereqs       transitive closure of direct
+- dependents    every course that transitively mentions it
+- blocks        the courses that can no longer be completed if it is failed:
+                a course is blocked when a hard edge (engineering table) comes
+                from a blocked course, or its AST cannot be met without the
+                blocked courses (a one-of with a remaining option stays open).
+                Non-course conditions (standing, grades, text) count as met,
+                so "One of PHYS 12, PHYS 100" stays open when PHYS 100 is failed
+
+A course listed in several files with different ASTs (the catalog and a
+curriculum page scraped at another time, or a truncated requisite text) keeps
+the version naming the most courses, the earlier source winning ties; the
+conflicting codes are reported by --build and stored under "conflicts".
+
+The artifact is src/data/prereq_graph.json: the sorted codes and each bitset
+as a hex string (JavaScript can read them with BigInt). It is rebuilt when the
+SHA-1 of any source file changes.
+
+Usage:
+    python scraper/utils/prereq_graph.py "MATH 101"         # blocks / dependents / prerequisites
+    python scraper/utils/prereq_graph.py --build
+
+    from scraper.utils.prereq_graph import load_graph
+
+    graph = load_graph()
+    graph.blocked_by('MATH 101')                # ['ELEC 201', 'MATH 253', ...]
+    graph.blocks('MATH 101', 'ELEC 201')        # True, one bit test
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scraper.utils.course_index import iter_course_entries, normalize_code
+from scraper.utils.json_writer import write_json
+from scraper.utils.requisites import COURSE_CODE, course_codes, course_requisites
+
+CATALOG_FILE = os.path.join(PROJECT_ROOT, 'ubc_math_courses.json')
+CURRICULUM_DIR = os.path.join(PROJECT_ROOT, 'src', 'data', 'curriculum')
+ENGINEERING_PREREQS_FILE = os.path.join(PROJECT_ROOT, 'src', 'data', 'engineering_prereqs.json')
+DEFAULT_GRAPH_PATH = os.path.join(PROJECT_ROOT, 'src', 'data', 'prereq_graph.json')
+
+GRAPH_VERSION = 2
+
+BITSETS = ('direct', 'prereqs', 'dependents', 'blocks')
+
+# A parenthesised note, or a course code outside one
+TABLE_TOKEN = re.compile(r'\(([^()]*)\)|\b([A-Z]{2,4})(?:_V)?\s*(\d{3}[A-Z]?)\b')
+# "MATH 253, MATH 256 are pre-req", "CPEN 211 and CPEN 221 are pre-reqs", "MATH 217 or MATH 255 is pre-req"
+PREREQ_NOTE = re.compile(r'((?:[A-Z]{2,4}(?:_V)?\s*\d{3}[A-Z]?(?:\s*,\s*|\s+and\s+|\s+or\s+)?)+)\s+(?:is|are)\s+(?:a\s+)?pre-?reqs?\b')
+
+# Compiled AST: ('course', i) | ('all', [..]) | ('one', [..]) | ('n', k, [..]) | None (always met)
+Compiled = Optional[Tuple]
+
+
+def source_files(catalog_file: str = CATALOG_FILE, curriculum_dir: str = CURRICULUM_DIR,
+                 prereqs_file: str = ENGINEERING_PREREQS_FILE) -> List[str]:
+    """The catalog, every curriculum file, then the engineering prerequisite table."""
+    files = [catalog_file] if os.path.isfile(catalog_file) else []
+    files += sorted(glob.glob(os.path.join(curriculum_dir, '**', '*.json'), recursive=True))
+    return files + ([prereqs_file] if os.path.isfile(prereqs_file) else [])
+
+
+def _digests(files: Sequence[str]) -> Dict[str, str]:
+    digests = {}
+    for path in files:
+        with open(path, 'rb') as f:
+            digests[os.path.relpath(path, PROJECT_ROOT).replace(os.sep, '/')] = hashlib.sha1(f.read()).hexdigest()
+    return digests
+
+
+# ----------------------------
+# Collecting edges
+# ----------------------------
+def table_edges(rows: List[Dict]) -> List[Tuple[str, str, bool]]:
+    """(prerequisite, course, hard) edges from the engineering prerequisite table rows of one major."""
+    edges = []
+    for row in rows:
+        first_year = normalize_code(row.get('course', ''))
+        if not COURSE_CODE.fullmatch(first_year):
+            continue
+        for column in ('direct', 'affected'):
+            last_code = None
+            for note, subject, number in TABLE_TOKEN.findall(row.get(column) or ''):
+                if subject:
+                    last_code = f"{subject} {number}"
+                    edges.append((first_year, last_code, True))
+                elif last_code:
+                    for match in PREREQ_NOTE.finditer(note):
+                        codes = [f"{s} {n}" for s, n in COURSE_CODE.findall(match.group(1))]
+                        hard = ' or ' not in match.group(1)
+                        edges.extend((code, last_code, hard) for code in codes)
+    return edges
+
+
+def _compile(node: Any, index: Dict[str, int]) -> Compiled:
+    """AST -> nested tuples over course indices; conditions that are not courses compile to None."""
+    if isinstance(node, str):
+        return ('course', index[node]) if node in index else None
+    if not isinstance(node, dict):
+        return None
+    if 'all' in node:
+        return ('all', [_compile(child, index) for child in node['all']])
+    if 'one' in node:
+        return ('one', [_compile(child, index) for child in node['one']])
+    if 'n' in node:
+        return ('n', node['n'], [_compile(child, index) for child in node['of']])
+    if 'grade' in node:
+        return _compile(node['of'], index)
+    return None
+
+
+def _possible(node: Compiled, blocked: int) -> bool:
+    """False if `node` can no longer be met once the courses in `blocked` are failed."""
+    if node is None:
+        return True
+    kind = node[0]
+    if kind == 'course':
+        return not (blocked >> node[1]) & 1
+    if kind == 'all':
+        return all(_possible(child, blocked) for child in node[1])
+    if kind == 'one':
+        return any(_possible(child, blocked) for child in node[1])
+    return sum(_possible(child, blocked) for child in node[2]) >= node[1]
+
+
+# ----------------------------
+# Graph
+# ----------------------------
+class PrereqGraph:
+    """Courses indexed 0..n-1 (sorted by code) with per-course closure bitsets."""
+
+    def __init__(self, codes: List[str], bitsets: Dict[str, List[int]], sources: Optional[Dict[str, str]] = None,
+                 conflicts: Optional[List[str]] = None):
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.direct = bitsets['direct']
+        self.prereqs = bitsets['prereqs']
+        self.dependents = bitsets['dependents']
+        self.blocks_mask = bitsets['blocks']
+        self.sources = sources or {}
+        self.conflicts = conflicts or []
+
+    @classmethod
+    def build(cls, files: Sequence[str]) -> 'PrereqGraph':
+        versions: Dict[str, List[Any]] = {}
+        edges: List[Tuple[str, str, bool]] = []
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if os.path.basename(path) == os.path.basename(ENGINEERING_PREREQS_FILE):
+                for rows in data.values():
+                    edges.extend(table_edges(rows))
+                continue
+            for course in iter_course_entries(data):
+                code = normalize_code(course['code'])
+                pre = course_requisites(course).get('pre') if COURSE_CODE.fullmatch(code) else None
+                if pre is not None and pre not in versions.setdefault(code, []):
+                    versions[code].append(pre)
+
+        asts = {code: cls._merge(found) for code, found in versions.items() if found}
+        conflicts = sorted(code for code, found in versions.items() if len(found) > 1)
+        for code, pre in asts.items():
+            edges.extend((prerequisite, code, False) for prerequisite in course_codes(pre))
+        edges = [(a, b, hard) for a, b, hard in edges if a != b]
+        codes = sorted(set(asts) | {a for a, _, _ in edges} | {b for _, b, _ in edges})
+        index = {code: i for i, code in enumerate(codes)}
+        n = len(codes)
+
+        direct = [0] * n
+        hard_prereqs = [0] * n
+        for a, b, hard in edges:
+            direct[index[b]] |= 1 << index[a]
+            if hard:
+                hard_prereqs[index[b]] |= 1 << index[a]
+        compiled = {index[code]: _compile(ast, index) for code, ast in asts.items()}
+
+        order = cls._topological_order(direct)
+        prereqs = list(direct)
+        # One pass in topological order closes a DAG; repeat for any cycle in the scraped data
+        changed = True
+        while changed:
+            changed = False
+            for i in order:
+                closure = prereqs[i]
+                mask = direct[i]
+                while mask:
+                    low = mask & -mask
+                    closure |= prereqs[low.bit_length() - 1]
+                    mask ^= low
+                closure &= ~(1 << i)
+                if closure != prereqs[i]:
+                    prereqs[i] = closure
+                    changed = True
+
+        dependents = [0] * n
+        for i in range(n):
+            mask = prereqs[i]
+            while mask:
+                low = mask & -mask
+                dependents[low.bit_length() - 1] |= 1 << i
+                mask ^= low
+
+        position = {i: p for p, i in enumerate(order)}
+        blocks = [0] * n
+        for source in range(n):
+            candidates = sorted(cls._members(dependents[source]), key=position.get)
+            blocked = 1 << source
+            changed = bool(candidates)
+            while changed:
+                changed = False
+                for i in candidates:
+                    if (blocked >> i) & 1:
+                        continue
+                    if hard_prereqs[i] & blocked or not _possible(compiled.get(i), blocked):
+                        blocked |= 1 << i
+                        changed = True
+            blocks[source] = blocked & ~(1 << source)
+
+        bitsets = {'direct': direct, 'prereqs': prereqs, 'dependents': dependents, 'blocks': blocks}
+        return cls(codes, bitsets, _digests(files), conflicts)
+
+    @staticmethod
+    def _merge(found: List[Any]) -> Any:
+        """The AST naming the most courses among differing versions; the earliest source wins ties."""
+        return max(enumerate(found), key=lambda item: (len(course_codes(item[1])), -item[0]))[1]
+
+    @staticmethod
+    def _topological_order(direct: List[int]) -> List[int]:
+        """Prerequisites before dependents (Kahn); courses on a cycle are appended at the end."""
+        n = len(direct)
+        remaining = [bin(mask).count('1') for mask in direct]
+        users: List[List[int]] = [[] for _ in range(n)]
+        for i, mask in enumerate(direct):
+            for j in PrereqGraph._members(mask):
+                users[j].append(i)
+        order = [i for i in range(n) if not remaining[i]]
+        for i in order:
+            for user in users[i]:
+                remaining[user] -= 1
+                if not remaining[user]:
+                    order.append(user)
+        seen = set(order)
+        return order + [i for i in range(n) if i not in seen]
+
+    @staticmethod
+    def _members(mask: int) -> List[int]:
+        members = []
+        while mask:
+            low = mask & -mask
+            members.append(low.bit_length() - 1)
+            mask ^= low
+        return members
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': GRAPH_VERSION,
+            'sources': self.sources,
+            'conflicts': self.conflicts,
+            'codes': self.codes,
+            **{name: [format(mask, 'x') for mask in masks]
+               for name, masks in zip(BITSETS, (self.direct, self.prereqs, self.dependents, self.blocks_mask))},
+        }
+
+    @classmethod
+    def from_dict(cls, stored: Dict) -> 'PrereqGraph':
+        return cls(stored['codes'], {name: [int(mask, 16) for mask in stored[name]] for name in BITSETS},
+                   stored.get('sources'), stored.get('conflicts'))
+
+    # ----------------------------
+    # Lookups
+    # ----------------------------
+    def codes_of(self, mask: int) -> List[str]:
+        """Course codes of the set bits of `mask`, in code order."""
+        return [self.codes[i] for i in self._members(mask)]
+
+    def _mask(self, masks: List[int], code: str) -> int:
+        i = self.index.get(normalize_code(code))
+        return masks[i] if i is not None else 0
+
+    def blocks(self, failed: str, course: str) -> bool:
+        """True if failing `failed` makes `course` impossible to complete."""
+        i = self.index.get(normalize_code(course))
+        return i is not None and bool((self._mask(self.blocks_mask, failed) >> i) & 1)
+
+    def requires(self, course: str, prerequisite: str) -> bool:
+        """True if `prerequisite` is a transitive prerequisite of `course`."""
+        i = self.index.get(normalize_code(prerequisite))
+        return i is not None and bool((self._mask(self.prereqs, course) >> i) & 1)
+
+    def blocked_by(self, code: str) -> List[str]:
+        return self.codes_of(self._mask(self.blocks_mask, code))
+
+    def dependents_of(self, code: str) -> List[str]:
+        return self.codes_of(self._mask(self.dependents, code))
+
+    def prerequisites_of(self, code: str, transitive: bool = True) -> List[str]:
+        return self.codes_of(self._mask(self.prereqs if transitive else self.direct, code))
+
+
+def load_graph(graph_path: str = DEFAULT_GRAPH_PATH, files: Optional[Sequence[str]] = None,
+               rebuild: bool = False) -> PrereqGraph:
+    """The stored graph if it matches the current sources, else a fresh build (written back)."""
+    files = source_files() if files is None else list(files)
+    if not rebuild:
+        try:
+            with open(graph_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == GRAPH_VERSION and stored.get('sources') == _digests(files):
+                return PrereqGraph.from_dict(stored)
+        except (OSError, ValueError, KeyError):
+            pass  # missing, stale or unreadable graph: rebuild
+    graph = PrereqGraph.build(files)
+    write_json(graph_path, graph.to_dict(), indent=None)
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prerequisite closures of UBC courses')
+    parser.add_argument('codes', nargs='*', help='Course codes to look up ("MATH 101", "MATH_V 101")')
+    parser.add_argument('--build', action='store_true', help='Rebuild the stored graph')
+    parser.add_argument('--graph', default=DEFAULT_GRAPH_PATH, help='Graph file')
+    args = parser.parse_args()
+
+    if not args.codes and not args.build:
+        parser.error('a course code is required (or use --build)')
+
+    started = time.perf_counter()
+    graph = load_graph(args.graph, rebuild=args.build)
+    if args.build:
+        edges = sum(bin(mask).count('1') for mask in graph.direct)
+        print(f"✓ {len(graph.codes)} courses, {edges} direct edges, closures built in "
+              f"{(time.perf_counter() - started) * 1000:.0f} ms: {os.path.relpath(args.graph, PROJECT_ROOT)}")
+        if graph.conflicts:
+            print(f"⚠️  {len(graph.conflicts)} courses have differing requisites across files, "
+                  f"kept the fullest: {', '.join(graph.conflicts)}")
+
+    for code in args.codes:
+        if normalize_code(code) not in graph.index:
+            print(f"⚠️  {normalize_code(code)} is not in the graph")
+            continue
+        print(f"\n{normalize_code(code)}")
+        print(f"  Failing it blocks ({len(graph.blocked_by(code))}): {', '.join(graph.blocked_by(code)) or '-'}")
+        print(f"  Dependents ({len(graph.dependents_of(code))}): {', '.join(graph.dependents_of(code)) or '-'}")
+        print(f"  Prerequisites ({len(graph.prerequisites_of(code))}): {', '.join(graph.prerequisites_of(code)) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Single-Pass Walker for Admission Requirements Documents
+vancouver_detailed_requirements.json and the src/data/detailed_requirements*
+files all have provinces -> degrees -> grade_12/grade_11 requirement lists,
+with degrees either flat (degrees[degree]) or grouped by faculty
+(degrees[faculty][degree]). The mapping, fixing and verification scripts each
+re-implemented that traversal, some only for one of the two layouts.
+
+- iter_degrees() / iter_requirements() walk both layouts in document order and
+  yield (province, faculty, degree, field, requirements) once per list;
+  faculty is None for the flat layout
+- RequirementsPipeline applies registered transforms and then checks to every
+  list in that one traversal. A transform returns a replacement list (or None
+  to leave it alone); a check returns the issues it found (strings or dicts).
+  Checks added with on_input=True see each list as loaded, before the
+  transforms (e.g. the bullet-format check, which judges the scraped text)
+- run_file() loads a document once, runs the pipeline and writes the result
+  once with write_json() (skipped when nothing changed on disk)
+
+Usage:
+    from scraper.utils.requirements_walker import RequirementsPipeline
+
+    pipeline = RequirementsPipeline()
+    pipeline.add_transform(lambda province, faculty, degree, field, reqs: [...])
+    pipeline.add_check(lambda province, faculty, degree, field, reqs: ["issue"])
+    pipeline.add_check(lambda province, faculty, degree, field, reqs: [], on_input=True)
+    report = pipeline.run_file('../src/data/detailed_requirements.json',
+                               '../src/data/detailed_requirements_enhanced.json')
+    print(report.changed, len(report.issues))
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from scraper.utils.json_writer import write_json
+
+REQUIREMENT_FIELDS = ('grade_12_requirements', 'grade_11_requirements')
+
+# (province, faculty or None, degree, field, requirements)
+RequirementList = Tuple[str, Optional[str], str, str, List[str]]
+Transform = Callable[[str, Optional[str], str, str, List[str]], Optional[List[str]]]
+Check = Callable[[str, Optional[str], str, str, List[str]], Iterable[Any]]
+
+
+def is_degree(value: Any) -> bool:
+    """True for a degree entry (as opposed to a faculty grouping degrees)."""
+    return isinstance(value, dict) and any(field in value for field in REQUIREMENT_FIELDS + ('degree_name',))
+
+
+def iter_degrees(data: Dict) -> Iterator[Tuple[str, Optional[str], str, Dict]]:
+    """Yield (province, faculty, degree, degree_data) for both degree layouts."""
+    for province_name, province_data in data.get('provinces', {}).items():
+        if not isinstance(province_data, dict):
+            continue
+        for name, value in province_data.get('degrees', {}).items():
+            if is_degree(value):
+                yield province_name, None, name, value
+            elif isinstance(value, dict):
+                for degree_name, degree_data in value.items():
+                    if isinstance(degree_data, dict):
+                        yield province_name, name, degree_name, degree_data
+
+
+def iter_requirements(data: Dict, fields: Sequence[str] = REQUIREMENT_FIELDS) -> Iterator[RequirementList]:
+    """Yield (province, faculty, degree, field, requirements) for every requirement list."""
+    for province_name, faculty_name, degree_name, degree_data in iter_degrees(data):
+        for field in fields:
+            requirements = degree_data.get(field)
+            if isinstance(requirements, list):
+                yield province_name, faculty_name, degree_name, field, requirements
+
+
+class PipelineReport:
+    """Outcome of one RequirementsPipeline pass."""
+
+    def __init__(self):
+        self.lists = 0
+        self.changed = 0
+        # (province, faculty, degree) -> issues, for every degree visited, in document order
+        self.degrees: Dict[Tuple[str, Optional[str], str], List[Any]] = {}
+        self.written: Optional[bool] = None
+
+    @property
+    def issues(self) -> List[Any]:
+        return [issue for issues in self.degrees.values() for issue in issues]
+
+
+class RequirementsPipeline:
+    """Transforms and checks applied to every requirement list in a single traversal."""
+
+    def __init__(self, fields: Sequence[str] = REQUIREMENT_FIELDS):
+        self.fields = tuple(fields)
+        self.transforms: List[Transform] = []
+        self.input_checks: List[Check] = []
+        self.checks: List[Check] = []
+
+    def add_transform(self, transform: Transform) -> Transform:
+        self.transforms.append(transform)
+        return transform
+
+    def add_check(self, check: Check, on_input: bool = False) -> Check:
+        """Register a check on the transformed lists, or on the lists as loaded if `on_input`."""
+        (self.input_checks if on_input else self.checks).append(check)
+        return check
+
+    def run(self, data: Dict) -> PipelineReport:
+        """Run the input checks, every transform, then the checks, on each list of `data` (in place)."""
+        report = PipelineReport()
+        for province_name, faculty_name, degree_name, degree_data in iter_degrees(data):
+            issues = report.degrees.setdefault((province_name, faculty_name, degree_name), [])
+            for field in self.fields:
+                requirements = degree_data.get(field)
+                if not isinstance(requirements, list):
+                    continue
+                report.lists += 1
+                for check in self.input_checks:
+                    issues.extend(check(province_name, faculty_name, degree_name, field, requirements))
+                changed = False
+                for transform in self.transforms:
+                    replacement = transform(province_name, faculty_name, degree_name, field, requirements)
+                    if replacement is not None and replacement != requirements:
+                        requirements = replacement
+                        changed = True
+                if changed:
+                    degree_data[field] = requirements
+                    report.changed += 1
+                for check in self.checks:
+                    issues.extend(check(province_name, faculty_name, degree_name, field, requirements))
+        return report
+
+    def run_file(self, input_file: str, output_file: Optional[str] = None) -> PipelineReport:
+        """Load `input_file` once, run the pipeline, and write the result to `output_file` if given."""
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        report = self.run(data)
+        if output_file:
+            report.written = write_json(output_file, data)
+        return report
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Prerequisite / Corequisite / Equivalency Parser
+Turns the calendar's requisite prose ("One of MATH_V 101, MATH_V 103 and one
+of PHYS 158, PHYS 170.\\n\\nCorequisites: MATH 256.") into a small boolean AST,
+so eligibility checks evaluate a structure instead of re-running regexes over
+the text on every use.
+
+AST nodes (plain JSON):
+    "MATH 101"                          a course (normalized code)
+    {"all": [node, ...]}                every node
+    {"one": [node, ...]}                at least one node
+    {"n": 2, "of": [node, ...]}         at least n nodes
+    {"standing": 3, "program": "..."}   year standing ("program" optional)
+    {"grade": 68, "of": node}           a score of 68% or higher in node ("a score of 68% or
+                                        higher in X", "a minimum of 68% in X", "X with a
+                                        grade of 68% or higher")
+    {"credits": 21, "of": "MATH"}       credits in a subject (or "of": [node, ...])
+    {"text": "..."}                     anything the grammar does not cover
+                                        (permission, high-school courses, ...); kept as
+                                        a member of the list it appeared in, so "One of
+                                        PHYS 12, PHYS 100" stays a one-of
+
+- split_sections(): "Prerequisites:", "Corequisites:" and "Equivalency:"
+  labels split one text into pre / co / eq; unlabelled text is "pre". A
+  course header scraped past the end of the field ("MATH_V 255 (3) ...")
+  cuts it off
+- Bare numbers continuing a code list keep the list's subject:
+  "ENGL 100, 110, 111 or 112" is four ENGL courses
+- parse_expression(): sentences are ANDed; "Either (a) ... or (b) ..." is a
+  one-of of its options; within a sentence "and" followed by a new clause
+  ("and one of", "and MATH 101", "AND ONE OF") separates ANDed clauses.
+  Sentences that only recommend a course, restate the grade needed in
+  courses already listed ("Prerequisite grade requirement: 80% in ...", and
+  the "68% in ..." sentences continuing it) or exclude credit ("Credit will be
+  granted for only one of ...") are dropped
+- parse_requisites() is memoized by text_hash(text) (SHA-1 of the parser
+  version and the text); the returned nodes are shared, treat them as
+  read-only
+- course_requisites() reads a course's stored ASTs (re-parsing only if its
+  text changed since); annotate_course() stores {"hash": ..., "pre": ..., "co": ..., "eq": ...}
+  as the course's "requisites" field and skips courses whose hash already
+  matches, so re-running over unchanged files parses nothing
+
+Usage:
+    python scraper/utils/requisites.py                       # annotate curriculum + catalog JSON
+    python scraper/utils/requisites.py --check               # report only, write nothing
+    python scraper/utils/requisites.py --parse "One of MATH 100, MATH 102."
+
+    from scraper.utils.requisites import parse_requisites, is_satisfied
+
+    ast = parse_requisites(course['prerequisites'])
+    is_satisfied(ast.get('pre'), {'MATH 100', 'PHYS 157'}, year=2)
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, PROJECT_ROOT)
+
+from scraper.utils.course_index import iter_course_entries, normalize_code
+from scraper.utils.json_writer import write_json
+
+CATALOG_FILE = os.path.join(PROJECT_ROOT, 'ubc_math_courses.json')
+CURRICULUM_DIR = os.path.join(PROJECT_ROOT, 'src', 'data', 'curriculum')
+
+# Bump when the grammar changes: every stored hash then misses and is re-parsed
+PARSER_VERSION = 3
+
+SECTION_LABEL = re.compile(r'\b(pre-?requisites?|co-?requisites?|equivalenc(?:y|ies))\s*:\s*', re.I)
+
+# "MATH 101", "MATH_V 101", "MATH101", "[MATH426]", "CPSC 121A"
+COURSE_CODE = re.compile(r'\b([A-Z]{2,4})(?:_V?)?\s*(\d{3}[A-Z]?)\b')
+# A bare number continuing a code list, which keeps the last subject:
+# "ENGL 100, 110, 111 or 112", "MATH_V 103, 105", "PHYS 157/158" (not "100%")
+CODE_LIST_NUMBER = re.compile(r'\s*(?:,\s*(?:(?:or|and)\s+)?|/\s*|\s+(?:or|and)\s+)(\d{3}[A-Z]?)\b(?![%\d])', re.I)
+# A course header the scraper read past the end of the field: "MATH_V 255 (3) ..."
+COURSE_HEADER = re.compile(r'\b[A-Z]{2,4}(?:_V)?\s\d{3}[A-Z]?\s\(\d[\d.\-/]*\)')
+
+NUMBER_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+                'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+YEAR_WORDS = {'first': 1, 'second': 2, 'third': 3, 'fourth': 4, 'fifth': 5}
+
+SENTENCE_SPLIT = re.compile(r'(?<![A-Z])\.\s+(?=[A-Z(]|and\b)')
+# "; and" closes an either-group: "Either (a) ... or (b) ...; and either (a) ..."
+GROUP_AND = re.compile(r';\s*and\s+', re.I)
+EITHER = re.compile(r'\b(?:either|one of)\s+(?=\(a\))', re.I)
+OPTION_SPLIT = re.compile(r'\s*,?\s*(?:\bor\s+)?\([a-z]\)\s*', re.I)
+# "and" that starts a new clause (as opposed to "Light and Radiation" in a title)
+CLAUSE_AND = re.compile(
+    r'\s+and\s+(?=(?:all|either|' + '|'.join(NUMBER_WORDS) + r')\s+of\b|either\b|a\s+(?:score|grade)\b|'
+    r'(?:' + '|'.join(YEAR_WORDS) + r'|\d(?:st|nd|rd|th))[- ]year\b|\d+\s+credits\b|[A-Z]{2,4}(?:_V)?\s*\d{3})', re.I)
+QUANTIFIER = re.compile(r'^(all|\d+|' + '|'.join(NUMBER_WORDS) + r')\s+of\s+(?:the\s+following:?\s*)?(.*)$', re.I | re.S)
+# Separators between the members of a list: commas, and "or" unless it is "or higher"
+LIST_SPLIT = re.compile(r'\s*[,;]\s*(?:or\s+)?|\s+or\s+(?!higher\b|better\b|above\b)', re.I)
+# "A score of 68% or higher in X", "A minimum of 60% in X", "60% in X"
+GRADE = re.compile(r'^(?:a\s+)?(?:minimum\s+)?(?:(?:score|grade|mark)\s+of\s+|of\s+)?(\d+)%\s+'
+                   r'(?:or\s+(?:higher|better|above)\s+)?in\s+(.*)$', re.I | re.S)
+# "X with a grade of 68% or higher", "X with a minimum score of 60%"
+WITH_GRADE = re.compile(r'^(.*?)\s+with\s+(?:a\s+)?(?:minimum\s+)?(?:score|grade|mark)\s+of\s+(?:at\s+least\s+)?'
+                        r'(\d+)%(?:\s+or\s+(?:higher|better|above))?$', re.I | re.S)
+# "Third-year standing", "3rd year standing", "Third- or fourth-year standing", "Third-year or higher standing in BASc"
+STANDING = re.compile(r'\b(' + '|'.join(YEAR_WORDS) + r'|[1-5])(?:st|nd|rd|th)?[- ]?\s*(?:or\s+\w+[- ])?year\s+'
+                      r'(?:or\s+higher\s+)?standing(?:\s+or\s+higher)?(?:\s+in\s+(?:the\s+)?(.+))?', re.I)
+CREDITS = re.compile(r'^(?:at\s+least\s+)?(\d+)\s+credits?\s+(?:of|in|from)\s+(.*)$', re.I | re.S)
+# Sentences that add no requirement: recommendations and credit exclusions
+SKIPPED = re.compile(r'\b(?:is|are)\s+(?:strongly\s+)?recommended\b|'
+                     r'^credit\s+(?:will|can|may)\s+(?:only\s+)?be\s+(?:granted|given)\s+for\s+(?:only\s+)?one\s+of\b', re.I)
+# "Prerequisite grade requirement: 80% in MATH184,MATH180. 68% in MATH120." restates
+# grades for courses already listed; its "N% in ..." follow-up sentences go with it
+GRADE_NOTE = re.compile(r'^prerequisite grade requirement\b', re.I)
+GRADE_NOTE_MORE = re.compile(r'^\d+%\s+in\b', re.I)
+
+_MEMO: Dict[str, Dict[str, Any]] = {}
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(f"{PARSER_VERSION}\0{text}".encode('utf-8')).hexdigest()[:16]
+
+
+def _codes_in(text: str) -> List[str]:
+    """
+    Normalized course codes in `text`, first occurrence order. Bare numbers
+    listed right after a code take its subject: "ENGL 100, 110 or 112".
+    """
+    codes = []
+    for match in COURSE_CODE.finditer(text):
+        subject, number = match.groups()
+        codes.append(f"{subject} {number}")
+        position = match.end()
+        while True:
+            more = CODE_LIST_NUMBER.match(text, position)
+            if not more:
+                break
+            codes.append(f"{subject} {more.group(1)}")
+            position = more.end()
+    return list(dict.fromkeys(codes))
+
+
+def _split_list(text: str) -> List[str]:
+    """Members of a list ("A, B or C"), splitting only outside parentheses."""
+    members, depth, start, position = [], 0, 0, 0
+    while position < len(text):
+        char = text[position]
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            separator = LIST_SPLIT.match(text, position)
+            if separator and separator.end() > position:
+                members.append(text[start:position])
+                start = position = separator.end()
+                continue
+        position += 1
+    members.append(text[start:])
+    return [member.strip(' .,;:') for member in members if member.strip(' .,;:')]
+
+
+def _alternatives(text: str) -> List[Any]:
+    """
+    Nodes for the members of a list. Codes stay codes (a bare number takes the
+    previous member's subject); any other member is parsed as a clause, and
+    kept as {"text"} if the grammar cannot read it, instead of being dropped.
+    Lists whose members run codes and course titles together ("PHYS 108 –
+    Enriched Physics II PHYS 118 – Electricity, Light ...") are read as their
+    codes only, since commas there do not separate alternatives.
+    """
+    members = _split_list(text)
+    if len(members) <= 1 or any(
+            _codes_in(member) and not COURSE_CODE.fullmatch(member.strip('[]'))
+            and not GRADE.match(member) and not WITH_GRADE.match(member)
+            for member in members):
+        return _codes_in(text) or ([{'text': text.strip(' .,;:')}] if text.strip(' .,;:') else [])
+    nodes: List[Any] = []
+    subject = None
+    for member in members:
+        code = COURSE_CODE.fullmatch(member.strip('[]'))
+        if code:
+            subject = code.group(1)
+            nodes.append(f"{code.group(1)} {code.group(2)}")
+        elif subject and re.fullmatch(r'\d{3}[A-Z]?', member):
+            nodes.append(f"{subject} {member}")
+        else:
+            nodes.append(_parse_clause(member))
+    return nodes
+
+
+def _group(kind: str, nodes: List[Any]) -> Any:
+    """{"all"/"one": nodes}, flattening same-kind children and single-node groups (None if empty)."""
+    flat = []
+    for node in nodes:
+        for child in (node[kind] if isinstance(node, dict) and set(node) == {kind} else [node]):
+            if child is not None and child not in flat:
+                flat.append(child)
+    if len(flat) <= 1:
+        return flat[0] if flat else None
+    return {kind: flat}
+
+
+# ----------------------------
+# Parsing
+# ----------------------------
+def split_sections(text: str, default: str = 'pre') -> Dict[str, str]:
+    """{"pre"/"co"/"eq": text} from one requisites field; unlabelled text goes to `default`."""
+    text = text or ''
+    header = COURSE_HEADER.search(text)
+    if header:
+        text = text[:header.start()]
+    sections: Dict[str, str] = {}
+    key, start = default, 0
+    for label in SECTION_LABEL.finditer(text):
+        sections[key] = (sections.get(key, '') + '. ' + text[start:label.start()]).strip(' .')
+        name = label.group(1).lower()
+        key, start = ('pre' if name.startswith('pre') else 'co' if name.startswith('co') else 'eq'), label.end()
+    sections[key] = (sections.get(key, '') + '. ' + text[start:]).strip(' .')
+    return {key: value for key, value in sections.items() if value}
+
+
+def _parse_clause(clause: str) -> Any:
+    """One clause without a top-level "and" or "either"."""
+    clause = re.sub(r'^\(?and\s+', '', clause.strip(' .,;:'), flags=re.I)
+    match = QUANTIFIER.match(clause)
+    if match:
+        word, rest = match.group(1).lower(), match.group(2)
+        if not _codes_in(rest):
+            return {'text': clause}
+        members = _alternatives(rest)
+        if word == 'all':
+            return _group('all', members)
+        n = int(word) if word.isdigit() else NUMBER_WORDS[word]
+        if n == 1:
+            return _group('one', members)
+        return _group('all', members) if n >= len(members) else {'n': n, 'of': members}
+
+    match = GRADE.match(clause)
+    if match:
+        return {'grade': int(match.group(1)), 'of': _parse_clause(match.group(2))}
+
+    match = WITH_GRADE.match(clause)
+    if match and _codes_in(match.group(1)):
+        return {'grade': int(match.group(2)), 'of': _parse_clause(match.group(1))}
+
+    match = STANDING.search(clause)
+    if match:
+        year = match.group(1).lower()
+        node: Dict[str, Any] = {'standing': int(year) if year.isdigit() else YEAR_WORDS[year]}
+        if match.group(2):
+            node['program'] = match.group(2).strip(' .()')
+        return node
+
+    match = CREDITS.match(clause)
+    if match:
+        codes = _codes_in(match.group(2))
+        return {'credits': int(match.group(1)), 'of': codes or match.group(2).strip(' .')}
+
+    codes = _codes_in(clause)
+    if not codes:
+        return {'text': clause}
+    if re.search(r'\bor\b', clause, re.I):
+        return _group('one', _alternatives(clause))
+    return _group('all', codes)
+
+
+def _parse_sentence(sentence: str) -> Optional[Any]:
+    if SKIPPED.search(sentence):
+        return None
+    nodes: List[Any] = []
+    for part in GROUP_AND.split(sentence):
+        either = EITHER.search(part)
+        head, tail = (part[:either.start()], part[either.end():]) if either else (part, '')
+        nodes.extend(_parse_clauses(re.sub(r'\s*\band\s*$', '', head, flags=re.I)))
+        if tail:
+            nodes.append(_group('one', [_group('all', _parse_clauses(option)) for option in OPTION_SPLIT.split(tail)]))
+    return _group('all', nodes)
+
+
+def _parse_clauses(text: str) -> List[Any]:
+    """The ANDed clauses of `text`."""
+    return [_parse_clause(clause) for clause in CLAUSE_AND.split(text) if clause.strip(' .,;:')]
+
+
+def parse_expression(text: str) -> Optional[Any]:
+    """AST of one section's text (None if empty or only recommendations)."""
+    text = ' '.join((text or '').split())
+    nodes = []
+    in_grade_note = False
+    for sentence in SENTENCE_SPLIT.split(text):
+        if GRADE_NOTE.search(sentence) or (in_grade_note and GRADE_NOTE_MORE.search(sentence)):
+            in_grade_note = True
+            continue
+        in_grade_note = False
+        node = _parse_sentence(sentence)
+        if node is not None:
+            nodes.append(node)
+    return _group('all', nodes)
+
+
+def parse_requisites(text: str, default: str = 'pre') -> Dict[str, Any]:
+    """{"pre"/"co"/"eq": AST} for a requisites field; memoized by text_hash()."""
+    key = text_hash(text) if default == 'pre' else f"{default}:{text_hash(text)}"
+    parsed = _MEMO.get(key)
+    if parsed is None:
+        parsed = {}
+        for section, section_text in split_sections(text, default).items():
+            node = parse_expression(section_text)
+            if node is not None:
+                parsed[section] = node
+        _MEMO[key] = parsed
+    return parsed
+
+
+# ----------------------------
+# Using the AST
+# ----------------------------
+def course_codes(node: Any) -> List[str]:
+    """Every course code in an AST, first occurrence order."""
+    codes: List[str] = []
+
+    def walk(value):
+        if isinstance(value, str):
+            if value not in codes:
+                codes.append(value)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif isinstance(value, dict):
+            for key in ('all', 'one', 'of'):
+                if key in value and not (key == 'of' and 'credits' in value and isinstance(value[key], str)):
+                    walk(value[key])
+
+    walk(node)
+    return codes
+
+
+def is_satisfied(node: Any, completed: Iterable[str], year: int = 0,
+                 grades: Optional[Dict[str, float]] = None) -> bool:
+    """
+    True if `completed` course codes (and standing `year`) meet `node`. Without
+    `grades`, a completed course counts for any grade requirement. A "text"
+    node is met only if its text is itself a completed code (e.g. the
+    high-school "PHYS 12"); "credits" nodes cannot be decided from codes alone
+    and count as unmet.
+    """
+    done = {normalize_code(code) for code in completed}
+
+    def check(value, minimum=None):
+        if value is None:
+            return True
+        if isinstance(value, str):
+            if value not in done:
+                return False
+            return minimum is None or grades is None or grades.get(value, 0) >= minimum
+        if 'all' in value:
+            return all(check(item, minimum) for item in value['all'])
+        if 'one' in value:
+            return any(check(item, minimum) for item in value['one'])
+        if 'n' in value:
+            return sum(check(item, minimum) for item in value['of']) >= value['n']
+        if 'grade' in value:
+            return check(value['of'], value['grade'])
+        if 'standing' in value:
+            return year >= value['standing']
+        if 'text' in value:
+            return normalize_code(value['text']) in done
+        return False
+
+    return check(node)
+
+
+# ----------------------------
+# Annotating JSON files
+# ----------------------------
+def requisite_text(course: Dict) -> Optional[str]:
+    """The text a course's "requisites" field is parsed from (prerequisites plus equivalency)."""
+    text = course.get('prerequisites')
+    if not isinstance(text, str):
+        return None
+    equivalency = course.get('equivalency')
+    if isinstance(equivalency, str) and equivalency.strip():
+        text = f"{text}\n\nEquivalency: {equivalency}"
+    return text
+
+
+def course_requisites(course: Dict) -> Dict[str, Any]:
+    """A course's {"pre"/"co"/"eq": AST}: the stored field if its hash is current, else parsed now."""
+    text = requisite_text(course)
+    if not text or not text.strip():
+        return {}
+    current = course.get('requisites')
+    if isinstance(current, dict) and current.get('hash') == text_hash(text):
+        return {key: value for key, value in current.items() if key != 'hash'}
+    return parse_requisites(text)
+
+
+def annotate_course(course: Dict) -> bool:
+    """Set course["requisites"] from its prerequisites (and equivalency) text; True if it changed."""
+    text = requisite_text(course)
+    if text is None:
+        return False
+    if not text.strip():
+        return course.pop('requisites', None) is not None
+    key = text_hash(text)
+    current = course.get('requisites')
+    if isinstance(current, dict) and current.get('hash') == key:
+        return False
+    course['requisites'] = {'hash': key, **parse_requisites(text)}
+    return True
+
+
+def annotate_file(path: str, write: bool = True) -> Dict[str, int]:
+    """Annotate every course of one JSON file; the file is written only when a course changed."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    counts = {'courses': 0, 'updated': 0, 'text': 0}
+    for course in iter_course_entries(data):
+        if not isinstance(course.get('prerequisites'), str):
+            continue
+        counts['courses'] += 1
+        counts['updated'] += annotate_course(course)
+        if '"text"' in json.dumps(course.get('requisites', {})):
+            counts['text'] += 1
+    if write and counts['updated']:
+        write_json(path, data)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse requisite text into ASTs in the curriculum JSON')
+    parser.add_argument('files', nargs='*', help='JSON files (default: catalog + src/data/curriculum/**)')
+    parser.add_argument('--check', action='store_true', help='Report only; write nothing')
+    parser.add_argument('--parse', metavar='TEXT', help='Print the AST of one text and exit')
+    args = parser.parse_args()
+
+    if args.parse is not None:
+        print(json.dumps(parse_requisites(args.parse), indent=2, ensure_ascii=False))
+        return
+
+    files = args.files or ([CATALOG_FILE] + sorted(glob.glob(os.path.join(CURRICULUM_DIR, '**', '*.json'),
+                                                             recursive=True)))
+    totals = {'courses': 0, 'updated': 0, 'text': 0}
+    for path in files:
+        counts = annotate_file(path, write=not args.check)
+        for key in totals:
+            totals[key] += counts[key]
+        if counts['updated']:
+            print(f"✓ {os.path.relpath(path, PROJECT_ROOT)}: {counts['updated']}/{counts['courses']} courses "
+                  f"{'to update' if args.check else 'updated'}")
+    print(f"\n✅ {totals['courses']} courses with requisite text, {totals['updated']} "
+          f"{'out of date' if args.check else 'updated'}, {len(_MEMO)} distinct texts parsed; "
+          f"{totals['text']} keep some unparsed text")
+
+
+if __name__ == '__main__':
+    main()
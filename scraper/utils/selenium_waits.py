@@ -0,0 +1,193 @@
+"""
+Event-Driven Selenium Waits
+Replaces fixed time.sleep() calls with waits on concrete DOM conditions, and
+records how long every wait actually took.
+
+A MutationObserver is installed in the page (arm_observer), along with hooks
+that count in-flight XHR / fetch requests. After an action that triggers
+client-side rendering (e.g. choosing a degree), dom_settled() fires once the
+target element has content, at least one mutation happened since the observer
+was armed, every request the action started has completed, and the DOM has
+been quiet for `quiet_ms`. Waiting on the requests (rather than on the content
+differing from the last selection) keeps page reuse correct even when two
+selections render identical content.
+
+WaitTimings wraps WebDriverWait and keeps per-label durations, so timeouts can
+be tuned against the real latency distribution instead of worst-case guesses.
+
+Usage:
+    from scraper.utils.selenium_waits import WaitTimings, arm_observer, dom_settled
+
+    timings = WaitTimings()
+    arm_observer(driver)
+    Select(...).select_by_visible_text(degree_name)
+    timings.wait(driver, 'degree_content', dom_settled('.section-requirements'), timeout=20)
+
+    timings.print_summary()
+    timings.save('wait_timings.json')
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Installs (once per document) a MutationObserver that counts mutations and
+# remembers when the last one happened, plus XHR/fetch hooks that count
+# requests still in flight; re-running it resets the counters.
+OBSERVER_JS = """
+if (!window.__domWatch) {
+    var watch = window.__domWatch = {count: 0, last: performance.now(), pending: 0, requests: 0};
+    new MutationObserver(function (mutations) {
+        watch.count += mutations.length;
+        watch.last = performance.now();
+    }).observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+
+    var begin = function () { watch.pending += 1; watch.requests += 1; };
+    var end = function () { watch.pending = Math.max(0, watch.pending - 1); watch.last = performance.now(); };
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return fetch.apply(this, arguments).finally(end);
+        };
+    }
+}
+window.__domWatch.count = 0;
+window.__domWatch.requests = 0;
+window.__domWatch.last = performance.now();
+"""
+
+STATE_JS = """
+var watch = window.__domWatch;
+var el = document.querySelector(arguments[0]);
+return {
+    armed: !!watch,
+    mutations: watch ? watch.count : 0,
+    quiet_ms: watch ? performance.now() - watch.last : 0,
+    pending: watch ? watch.pending : 0,
+    text_length: el ? el.innerText.trim().length : -1
+};
+"""
+
+
+def arm_observer(driver):
+    """Install/reset the page's MutationObserver; call right before the triggering action."""
+    driver.execute_script(OBSERVER_JS)
+
+
+def document_ready(driver) -> bool:
+    """WebDriverWait predicate: the document has finished loading."""
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+def select_populated(css_selector: str, min_options: int = 2) -> Callable:
+    """WebDriverWait predicate: a <select> exists and has at least `min_options` options."""
+    def _predicate(driver) -> bool:
+        return driver.execute_script(
+            "var s = document.querySelector(arguments[0]); return s ? s.options.length : 0;",
+            css_selector
+        ) >= min_options
+    return _predicate
+
+
+class dom_settled:
+    """
+    WebDriverWait predicate (expected_conditions style).
+
+    True once `css_selector` has visible text, the DOM changed since
+    arm_observer() (when require_mutation is set), no XHR/fetch request is
+    still in flight and nothing (mutation or response) has happened for
+    `quiet_ms` milliseconds.
+    """
+
+    def __init__(self, css_selector: str, quiet_ms: int = 500, require_mutation: bool = True):
+        self.css_selector = css_selector
+        self.quiet_ms = quiet_ms
+        self.require_mutation = require_mutation
+
+    def __call__(self, driver) -> bool:
+        try:
+            state = driver.execute_script(STATE_JS, self.css_selector)
+        except JavascriptException:
+            return False
+        if not state['armed']:
+            # Page navigated since the observer was installed; start watching now
+            arm_observer(driver)
+            return False
+        if state['text_length'] <= 0:
+            return False
+        if self.require_mutation and state['mutations'] == 0:
+            return False
+        if state['pending'] > 0:
+            return False
+        return state['quiet_ms'] >= self.quiet_ms
+
+
+class WaitTimings:
+    """WebDriverWait wrapper that records the duration of each wait by label."""
+
+    def __init__(self, poll_frequency: float = 0.1):
+        self.poll_frequency = poll_frequency
+        self.samples: Dict[str, List[float]] = {}
+        self.timeouts: Dict[str, int] = {}
+
+    def wait(self, driver, label: str, condition: Callable, timeout: float) -> bool:
+        """Wait for `condition`; returns False (instead of raising) on timeout."""
+        started = time.monotonic()
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(condition)
+            ok = True
+        except TimeoutException:
+            ok = False
+        self.record(label, time.monotonic() - started, timed_out=not ok)
+        return ok
+
+    def record(self, label: str, seconds: float, timed_out: bool = False):
+        self.samples.setdefault(label, []).append(seconds)
+        if timed_out:
+            self.timeouts[label] = self.timeouts.get(label, 0) + 1
+
+    def summary(self) -> Dict[str, Dict]:
+        """Count, timeouts and min/median/p90/max seconds per label."""
+        result = {}
+        for label, values in self.samples.items():
+            ordered = sorted(values)
+            n = len(ordered)
+            result[label] = {
+                'count': n,
+                'timeouts': self.timeouts.get(label, 0),
+                'min': round(ordered[0], 3),
+                'median': round(ordered[n // 2], 3),
+                'p90': round(ordered[min(n - 1, int(n * 0.9))], 3),
+                'max': round(ordered[-1], 3),
+                'total': round(sum(ordered), 3),
+            }
+        return result
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("\nWait timings (seconds):")
+        for label, s in summary.items():
+            print(f"  {label:<20} n={s['count']:<4} median={s['median']:<6} p90={s['p90']:<6} "
+                  f"max={s['max']:<6} timeouts={s['timeouts']}")
+
+    def save(self, path: str):
+        """Write the summary plus raw samples to JSON."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'summary': self.summary(), 'samples': self.samples}, f, indent=2)
+        print(f"✓ Wait timings saved to {path}")
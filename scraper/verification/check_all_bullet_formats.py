@@ -6,7 +6,15 @@ Rule: If website shows on same line with "or", keep as single array element
 """
 
 import json
+import os
 import re
+import sys
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils.requirements_walker import iter_requirements
 
 def load_original_data():
     """Load original scraped data to check format"""
@@ -30,6 +38,23 @@ def analyze_requirement(req_text):
     
     return False, None
 
+FIELD_TYPES = {'grade_12_requirements': 'Grade 12', 'grade_11_requirements': 'Grade 11'}
+
+def bullet_format_check(province_name, faculty_name, degree_name, field, requirements):
+    """RequirementsPipeline check (on_input=True): compound "X, Y, or Z" requirements"""
+    issues = []
+    for req in requirements:
+        is_compound, original_format = analyze_requirement(req)
+        if is_compound:
+            issues.append({
+                'province': province_name,
+                'degree': degree_name,
+                'type': FIELD_TYPES[field],
+                'original': original_format,
+                'note': 'Should be kept as single line with "or"'
+            })
+    return issues
+
 def check_all_formats():
     """Check all provinces and degrees for correct formatting"""
     
@@ -40,40 +65,13 @@ def check_all_formats():
     print("CHECKING ALL PROVINCES AND MAJORS FOR BULLET POINT FORMAT")
     print("="*80)
     
-    # Check each province
-    for province_name, province_data in original.get('provinces', {}).items():
-        province_issues = []
-        
-        for degree_name, degree_data in province_data.get('degrees', {}).items():
-            if not isinstance(degree_data, dict):
-                continue
-            
-            # Check Grade 12 requirements
-            g12_reqs = degree_data.get('grade_12_requirements', [])
-            for req in g12_reqs:
-                is_compound, original_format = analyze_requirement(req)
-                if is_compound:
-                    province_issues.append({
-                        'province': province_name,
-                        'degree': degree_name,
-                        'type': 'Grade 12',
-                        'original': original_format,
-                        'note': 'Should be kept as single line with "or"'
-                    })
-            
-            # Check Grade 11 requirements
-            g11_reqs = degree_data.get('grade_11_requirements', [])
-            for req in g11_reqs:
-                is_compound, original_format = analyze_requirement(req)
-                if is_compound:
-                    province_issues.append({
-                        'province': province_name,
-                        'degree': degree_name,
-                        'type': 'Grade 11',
-                        'original': original_format,
-                        'note': 'Should be kept as single line with "or"'
-                    })
-        
+    # Check every Grade 12 / Grade 11 list in one pass, grouped by province
+    by_province = {}
+    for province_name, faculty_name, degree_name, field, reqs in iter_requirements(original):
+        by_province.setdefault(province_name, []).extend(
+            bullet_format_check(province_name, faculty_name, degree_name, field, reqs))
+    
+    for province_name, province_issues in by_province.items():
         if province_issues:
             print(f"\n{'='*80}")
             print(f"Province: {province_name}")
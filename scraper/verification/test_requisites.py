@@ -0,0 +1,79 @@
+"""
+Tests for the calendar prerequisite parser (scraper/utils/requisites.py)
+Runs offline on fixed requisite texts; no browser or network needed.
+"""
+
+import os
+import sys
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils.requisites import is_satisfied, parse_requisites
+
+
+def test_one_of_keeps_unparsed_alternatives():
+    """A high-school alternative stays in the one-of instead of being dropped"""
+    parsed = parse_requisites("One of PHYS 12, PHYS 100.")
+    assert parsed == {'pre': {'one': [{'text': 'PHYS 12'}, 'PHYS 100']}}, parsed
+    assert is_satisfied(parsed['pre'], ['PHYS 12'])
+    assert is_satisfied(parsed['pre'], ['PHYS 100'])
+    assert not is_satisfied(parsed['pre'], ['MATH 100'])
+
+
+def test_one_of_keeps_grade_alternative():
+    """"or a score of 80% or higher in MATH 12" is the third alternative"""
+    parsed = parse_requisites("One of MATH 100, MATH 180 or a score of 80% or higher in MATH 12.")
+    assert parsed == {'pre': {'one': ['MATH 100', 'MATH 180',
+                                      {'grade': 80, 'of': {'text': 'MATH 12'}}]}}, parsed
+
+
+def test_minimum_grade():
+    parsed = parse_requisites("A minimum of 60% in MATH 200.")
+    assert parsed == {'pre': {'grade': 60, 'of': 'MATH 200'}}, parsed
+    assert is_satisfied(parsed['pre'], ['MATH 200'], grades={'MATH 200': 64})
+    assert not is_satisfied(parsed['pre'], ['MATH 200'], grades={'MATH 200': 55})
+
+
+def test_with_grade():
+    parsed = parse_requisites("MATH 101 with a grade of 68% or higher.")
+    assert parsed == {'pre': {'grade': 68, 'of': 'MATH 101'}}, parsed
+
+
+def test_credit_exclusion_is_not_a_requirement():
+    parsed = parse_requisites("MATH 200. Credit will be granted for only one of MATH 100 or MATH 180.")
+    assert parsed == {'pre': 'MATH 200'}, parsed
+
+
+def test_grade_note_is_skipped():
+    """The grade note restates courses already listed, including its follow-up sentences"""
+    parsed = parse_requisites("One of MATH 100, MATH 120. Prerequisite grade requirement: "
+                              "80% in MATH100. 68% in MATH120.")
+    assert parsed == {'pre': {'one': ['MATH 100', 'MATH 120']}}, parsed
+
+
+def test_code_list_carries_subject():
+    parsed = parse_requisites("Equivalency: MATH_V 103, 105.")
+    assert parsed == {'eq': {'all': ['MATH 103', 'MATH 105']}}, parsed
+
+
+def test_titled_list_reads_codes_only():
+    """Commas inside course titles do not split the list into alternatives"""
+    parsed = parse_requisites("Prerequisites: ONE of PHYS 108 – Enriched Physics II PHYS 118 – "
+                              "Electricity, Light and Radiation PHYS 158 – Introductory Physics")
+    assert parsed == {'pre': {'one': ['PHYS 108', 'PHYS 118', 'PHYS 158']}}, parsed
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_')]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
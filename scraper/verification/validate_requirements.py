@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Rule-based validation of the admission requirements data
+Every check from the verification scripts is a registered rule. Each document
+(the raw scrape and the enhanced frontend file) is loaded once and walked once
+(scraper/utils/requirements_walker.py); every rule for that document runs in
+the same pass. Results go to the console and optionally to a machine-readable
+report (--json, --junit), so the run can serve as a pipeline gate.
+
+Rules come from:
+- verify_all_requirements.py: bc-codes, generic-format
+- check_all_bullet_formats.py: compound-one-line
+- comprehensive_bullet_check.py: and-conjunction
+- final_complete_verification.py: science-or-format
+- final_comprehensive_check.py: expected-provinces, applied-biology
+test_alberta_specific.py scrapes the live site and stays a separate script.
+
+The BC course codes and generic "A Grade 12 X" formats are matched with one
+precompiled alternation instead of re.compile() per requirement and code.
+
+Usage:
+    python scraper/verification/validate_requirements.py
+    python scraper/verification/validate_requirements.py --json report.json --junit report.xml
+    python scraper/verification/validate_requirements.py --rules bc-codes generic-format
+    python scraper/verification/validate_requirements.py --list
+
+Exit status is 1 if any rule at 'error' severity found an issue.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from xml.etree import ElementTree
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from scraper.utils.json_writer import write_bytes, write_json
+from scraper.utils.requirements_walker import REQUIREMENT_FIELDS, iter_degrees
+
+DOCUMENTS = {
+    'raw': os.path.join(project_root, 'scraper', 'data', 'vancouver_detailed_requirements.json'),
+    'enhanced': os.path.join(project_root, 'src', 'data', 'detailed_requirements_enhanced.json'),
+}
+
+FIELD_TYPES = {'grade_12_requirements': 'Grade 12', 'grade_11_requirements': 'Grade 11'}
+
+# ----------------------------
+# Patterns
+# ----------------------------
+# BC-specific course codes that should NOT appear in other provinces
+BC_COURSE_CODES = [
+    "English Studies 12",
+    "English First Peoples 12",
+    "Pre-Calculus 12",
+    "Calculus 12",
+    "Foundations of Math 12",
+    "Anatomy and Physiology 12",
+    "Biology 12",
+    "Chemistry 12",
+    "Physics 12",
+    "Chemistry 11",
+    "Biology 11",
+    "Physics 11",
+]
+
+# Province codes marking a composite requirement that may mention BC codes
+PROVINCE_CODE_MARKERS = ["121", "122", "111", "112", "30S", "40S", "30-1", "30-2", "3201", "4U"]
+
+# One scan per requirement: generic formats at the start, BC codes anywhere.
+# The lookahead makes every start position a candidate, so overlapping codes
+# ("Calculus 12" inside "Pre-Calculus 12") are each reported, as before.
+REQUIREMENT_PATTERN = re.compile(
+    r'(?=(?P<generic>^(?:A )?Grade 1[12] )|\b(?P<bc>'
+    + '|'.join(re.escape(code) for code in BC_COURSE_CODES)
+    + r')\b)'
+)
+
+# "A Grade 12 X, a Grade 12 Y, or a Grade 12 Z" in one bullet (and Grade 11)
+COMPOUND_PATTERN = re.compile(
+    r'Grade 12 \w+,.*Grade 12 \w+,.*or.*Grade 12 \w+'
+    r'|Grade 12 \w+,.*or.*Grade 12 \w+'
+    r'|Grade 11 \w+,.*Grade 11 \w+,.*or.*Grade 11 \w+'
+    r'|Grade 11 \w+,.*or.*Grade 11 \w+'
+)
+
+SCIENCE_WORDS = ['Biology', 'Chemistry', 'Physics', 'Anatomy']
+
+def scan_requirement(req):
+    """(BC codes found, in BC_COURSE_CODES order; whether it starts with a generic format)"""
+    codes = set()
+    generic = False
+    for match in REQUIREMENT_PATTERN.finditer(req):
+        if match.group('generic'):
+            generic = True
+        elif match.group('bc'):
+            codes.add(match.group('bc'))
+    return [code for code in BC_COURSE_CODES if code in codes], generic
+
+def bc_codes_outside_bc(req, province_name):
+    """BC codes in a non-BC requirement, skipping composites with province codes"""
+    if province_name == "British Columbia" or req.startswith("("):
+        return []
+    if any(code in req for code in PROVINCE_CODE_MARKERS):
+        return []
+    return scan_requirement(req)[0]
+
+# ----------------------------
+# Rules
+# ----------------------------
+RULES = {}
+
+class Rule:
+    """
+    One check. scope is 'list' (called with each requirement list), 'degree'
+    (each degree entry) or 'document' (once per document); every rule returns
+    a list of issue messages.
+    """
+
+    def __init__(self, name, description, check, document='enhanced', scope='list', severity='error'):
+        self.name = name
+        self.description = description
+        self.check = check
+        self.document = document
+        self.scope = scope
+        self.severity = severity
+
+def rule(name, description, document='enhanced', scope='list', severity='error'):
+    """Decorator registering a check function as a rule"""
+    def register(check):
+        RULES[name] = Rule(name, description, check, document, scope, severity)
+        return check
+    return register
+
+@rule('bc-codes', 'BC course codes left in another province')
+def check_bc_codes(province_name, degree_name, field, requirements):
+    return [f"BC code found: '{req}'"
+            for req in requirements
+            for _ in bc_codes_outside_bc(req, province_name)]
+
+@rule('generic-format', 'Generic "A Grade 12 X" formats not mapped to province codes')
+def check_generic_format(province_name, degree_name, field, requirements):
+    return [f"Generic format: '{req}'" for req in requirements if scan_requirement(req)[1]]
+
+@rule('compound-one-line', '"X, Y, or Z" requirements that must stay one bullet',
+      document='raw', severity='warning')
+def check_compound_one_line(province_name, degree_name, field, requirements):
+    return [f"{FIELD_TYPES[field]}: should be kept as single line with \"or\": '{req}'"
+            for req in requirements if COMPOUND_PATTERN.search(req)]
+
+@rule('and-conjunction', 'Requirements with "and" plus commas that may have been split',
+      document='raw', severity='warning')
+def check_and_conjunction(province_name, degree_name, field, requirements):
+    return [f"{FIELD_TYPES[field]}: may need to check \"and\" conjunction: '{req}'"
+            for req in requirements if ' and ' in req and ',' in req]
+
+# Degree -> expected layout of its Grade 12 science requirements
+SCIENCE_FORMATS = {
+    "Applied Biology": "should_have_or",  # Bio, Chem, OR Phys (3 choose 1)
+    "Science": "should_have_or",  # Bio, Chem, OR Phys (3 choose 1)
+    "Applied Science (Engineering)": "should_be_separate",  # Chem AND Phys (both required)
+    "Dental Hygiene": "should_be_separate"  # Bio AND Chem (both required)
+}
+SCIENCE_FORMAT_PROVINCES = ["Alberta", "British Columbia", "Ontario"]
+
+@rule('science-or-format', 'Science requirements: one "or" line vs. separate lines', scope='degree')
+def check_science_or_format(province_name, degree_name, degree_data):
+    expected_format = SCIENCE_FORMATS.get(degree_name)
+    if expected_format is None or province_name not in SCIENCE_FORMAT_PROVINCES:
+        return []
+    g12_reqs = degree_data.get('grade_12_requirements', [])
+    sci_reqs = [r for r in g12_reqs if any(x in r for x in SCIENCE_WORDS)]
+    if expected_format == "should_have_or" and (len(sci_reqs) != 1 or ' or ' not in sci_reqs[0]):
+        return [f"Expected single 'or' requirement, found {len(sci_reqs)} entries"]
+    if expected_format == "should_be_separate" and len(sci_reqs) < 2:
+        return [f"Expected 2+ separate requirements, found {len(sci_reqs)}"]
+    return []
+
+EXPECTED_PROVINCES = [
+    "Alberta", "British Columbia", "Manitoba", "New Brunswick",
+    "Newfoundland & Labrador", "Northwest Territories", "Nova Scotia",
+    "Nunavut", "Ontario", "Prince Edward Island", "Quebec",
+    "Saskatchewan", "Yukon"
+]
+
+@rule('expected-provinces', 'All 13 provinces present, each with Applied Biology', scope='document')
+def check_expected_provinces(data):
+    provinces = data.get('provinces', {})
+    issues = [f"Missing province: {name}" for name in EXPECTED_PROVINCES if name not in provinces]
+    issues += [f"{name}: Missing 'Applied Biology' degree" for name in EXPECTED_PROVINCES
+               if name in provinces and 'Applied Biology' not in provinces[name].get('degrees', {})]
+    return issues
+
+@rule('applied-biology', 'Applied Biology science requirement on one line', scope='degree',
+      severity='warning')
+def check_applied_biology(province_name, degree_name, degree_data):
+    if degree_name != 'Applied Biology' or province_name not in EXPECTED_PROVINCES:
+        return []
+    g12_reqs = degree_data.get('grade_12_requirements', [])
+    bio_count = sum(1 for r in g12_reqs if 'Biology' in r or 'Anatomy' in r)
+    chem_count = sum(1 for r in g12_reqs if 'Chemistry' in r and 'Biology' not in r)
+    phys_count = sum(1 for r in g12_reqs if 'Physics' in r)
+    if bio_count + chem_count + phys_count > 1:
+        return ["Multiple separate science requirements (should be one line with 'or')"]
+    return []
+
+# ----------------------------
+# Engine
+# ----------------------------
+def validate(rules, documents=DOCUMENTS):
+    """
+    Run `rules` with one load and one traversal per document.
+    Returns (issues, stats); each issue is a dict with rule, severity,
+    document, province, faculty, degree, field and message.
+    """
+    issues = []
+    stats = {'documents': 0, 'degrees': 0, 'lists': 0, 'checks': {r.name: 0 for r in rules}}
+
+    for document, path in documents.items():
+        doc_rules = [r for r in rules if r.document == document]
+        if not doc_rules:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        stats['documents'] += 1
+
+        def report(r, messages, province=None, faculty=None, degree=None, field=None):
+            stats['checks'][r.name] += 1
+            for message in messages:
+                issues.append({'rule': r.name, 'severity': r.severity, 'document': document,
+                               'province': province, 'faculty': faculty, 'degree': degree,
+                               'field': field, 'message': message})
+
+        for r in doc_rules:
+            if r.scope == 'document':
+                report(r, r.check(data))
+
+        degree_rules = [r for r in doc_rules if r.scope == 'degree']
+        list_rules = [r for r in doc_rules if r.scope == 'list']
+        for province_name, faculty_name, degree_name, degree_data in iter_degrees(data):
+            stats['degrees'] += 1
+            for r in degree_rules:
+                report(r, r.check(province_name, degree_name, degree_data),
+                       province_name, faculty_name, degree_name)
+            for field in REQUIREMENT_FIELDS:
+                requirements = degree_data.get(field)
+                if not isinstance(requirements, list):
+                    continue
+                stats['lists'] += 1
+                for r in list_rules:
+                    report(r, r.check(province_name, degree_name, field, requirements),
+                           province_name, faculty_name, degree_name, field)
+
+    return issues, stats
+
+def location(issue):
+    parts = [issue['province'], issue['faculty'], issue['degree']]
+    return ' / '.join(p for p in parts if p) or issue['document']
+
+def build_json_report(rules, issues, stats):
+    """Deterministic for unchanged data (no timings), so write_json skips rewriting it"""
+    counts = {r.name: sum(1 for i in issues if i['rule'] == r.name) for r in rules}
+    return {
+        'summary': {
+            'documents': stats['documents'],
+            'degrees': stats['degrees'],
+            'lists': stats['lists'],
+            'rules': len(rules),
+            'errors': sum(1 for i in issues if i['severity'] == 'error'),
+            'warnings': sum(1 for i in issues if i['severity'] == 'warning'),
+        },
+        'rules': [{'name': r.name, 'description': r.description, 'document': r.document,
+                   'scope': r.scope, 'severity': r.severity, 'checks': stats['checks'][r.name],
+                   'issues': counts[r.name]} for r in rules],
+        'issues': issues,
+    }
+
+def build_junit_report(rules, issues, stats, seconds):
+    """One testsuite per rule; errors are failures, warnings go to system-out"""
+    root = ElementTree.Element('testsuites', name='requirements-validation', time=f"{seconds:.4f}")
+    for r in rules:
+        by_location = {}
+        for issue in issues:
+            if issue['rule'] == r.name:
+                by_location.setdefault(location(issue), []).append(issue['message'])
+        failures = len(by_location) if r.severity == 'error' else 0
+        suite = ElementTree.SubElement(root, 'testsuite', name=r.name, tests=str(max(1, len(by_location))),
+                                       failures=str(failures), errors='0')
+        if not by_location:
+            ElementTree.SubElement(suite, 'testcase', classname=r.name, name=r.description)
+        for place, messages in by_location.items():
+            case = ElementTree.SubElement(suite, 'testcase', classname=r.name, name=place)
+            text = '\n'.join(messages)
+            if r.severity == 'error':
+                failure = ElementTree.SubElement(case, 'failure', message=messages[0], type=r.name)
+                failure.text = text
+            else:
+                ElementTree.SubElement(case, 'system-out').text = text
+    ElementTree.indent(root)
+    return ElementTree.tostring(root, encoding='utf-8', xml_declaration=True) + b'\n'
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate the admission requirements data')
+    parser.add_argument('--rules', nargs='+', metavar='RULE', help='Run only these rules (default: all)')
+    parser.add_argument('--json', metavar='PATH', help='Write a JSON report')
+    parser.add_argument('--junit', metavar='PATH', help='Write a JUnit XML report')
+    parser.add_argument('--list', action='store_true', help='List the rules and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for r in RULES.values():
+            print(f"  {r.name:<20} [{r.severity}, {r.document}] {r.description}")
+        return 0
+
+    unknown = [name for name in args.rules or [] if name not in RULES]
+    if unknown:
+        parser.error(f"unknown rule(s): {', '.join(unknown)} (see --list)")
+    rules = [RULES[name] for name in args.rules] if args.rules else list(RULES.values())
+
+    print("=" * 80)
+    print("REQUIREMENTS VALIDATION")
+    print("=" * 80)
+
+    started = time.perf_counter()
+    issues, stats = validate(rules)
+    seconds = time.perf_counter() - started
+
+    for r in rules:
+        rule_issues = [i for i in issues if i['rule'] == r.name]
+        if not rule_issues:
+            print(f"\n✓ {r.name}: {r.description}")
+            continue
+        symbol = '❌' if r.severity == 'error' else '⚠️ '
+        print(f"\n{symbol} {r.name}: {r.description} ({len(rule_issues)} issue(s))")
+        for issue in rule_issues:
+            print(f"    - {location(issue)}: {issue['message']}")
+
+    report = build_json_report(rules, issues, stats)
+    summary = report['summary']
+    if args.json:
+        write_json(args.json, report)
+    if args.junit:
+        write_bytes(args.junit, build_junit_report(rules, issues, stats, seconds))
+
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"Rules: {summary['rules']}, degrees checked: {summary['degrees']}, "
+          f"requirement lists: {summary['lists']} ({summary['documents']} document(s), {seconds:.3f}s)")
+    print(f"Errors: {summary['errors']}, warnings: {summary['warnings']}")
+    for path in (args.json, args.junit):
+        if path:
+            print(f"Report: {path}")
+    print("=" * 80)
+
+    return 1 if summary['errors'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
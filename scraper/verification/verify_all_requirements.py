@@ -8,69 +8,38 @@ Checks for:
 4. Consistency across provinces
 """
 
-import json
-import re
+import os
+import sys
 
-# BC-specific course codes that should NOT appear in other provinces
-BC_COURSE_CODES = [
-    "English Studies 12",
-    "English First Peoples 12",
-    "Pre-Calculus 12",
-    "Calculus 12",
-    "Foundations of Math 12",
-    "Anatomy and Physiology 12",
-    "Biology 12",
-    "Chemistry 12",
-    "Physics 12",
-    "Chemistry 11",
-    "Biology 11",
-    "Physics 11",
-]
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
 
-# Generic patterns that should be mapped
-GENERIC_PATTERNS = [
-    r"^A Grade 1[12] ",
-    r"^Grade 1[12] ",
-]
+from scraper.utils.requirements_walker import RequirementsPipeline
+from scraper.verification.validate_requirements import bc_codes_outside_bc, scan_requirement
 
 def check_for_bc_codes(requirements, province):
     """Check if BC codes appear in non-BC provinces"""
-    issues = []
-    if province == "British Columbia":
-        return issues
-    
-    for req in requirements:
-        # Skip if it's a composite requirement with province codes
-        if any(code in req for code in ["121", "122", "111", "112", "30S", "40S", "30-1", "30-2", "3201", "4U"]):
-            continue
-            
-        for bc_code in BC_COURSE_CODES:
-            # Check for exact match or surrounded by spaces/punctuation
-            if bc_code in req and not req.startswith("("):
-                # Make sure it's not part of a longer course code
-                import re
-                pattern = r'\b' + re.escape(bc_code) + r'\b'
-                if re.search(pattern, req):
-                    issues.append(f"BC code found: '{req}'")
-    
-    return issues
+    # One issue per BC code found; composites with province codes are skipped
+    return [f"BC code found: '{req}'"
+            for req in requirements
+            for _ in bc_codes_outside_bc(req, province)]
 
 def check_for_generic_patterns(requirements):
     """Check if generic patterns still exist"""
-    issues = []
-    for req in requirements:
-        for pattern in GENERIC_PATTERNS:
-            if re.match(pattern, req):
-                issues.append(f"Generic format: '{req}'")
-    
-    return issues
+    return [f"Generic format: '{req}'" for req in requirements if scan_requirement(req)[1]]
+
+def requirement_checks(province_name, faculty_name, degree_name, field, requirements):
+    """RequirementsPipeline check: BC codes outside BC, then leftover generic formats"""
+    return check_for_bc_codes(requirements, province_name) + check_for_generic_patterns(requirements)
 
 def verify_all_provinces():
     """Verify all provinces and degrees"""
     
-    # Load the data
-    with open('../src/data/detailed_requirements_enhanced.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # Load the data and check every requirement list in one pass
+    pipeline = RequirementsPipeline()
+    pipeline.add_check(requirement_checks)
+    report = pipeline.run_file('../src/data/detailed_requirements_enhanced.json')
     
     total_issues = 0
     provinces_checked = 0
@@ -81,40 +50,23 @@ def verify_all_provinces():
     print("=" * 80)
     print()
     
-    # Check each province
-    for province_name, province_data in data['provinces'].items():
-        provinces_checked += 1
-        province_issues = []
-        
-        print(f"\n{'='*80}")
-        print(f"Province: {province_name}")
-        print(f"{'='*80}")
+    current_province = None
+    for (province_name, faculty_name, degree_name), all_issues in report.degrees.items():
+        if province_name != current_province:
+            current_province = province_name
+            provinces_checked += 1
+            print(f"\n{'='*80}")
+            print(f"Province: {province_name}")
+            print(f"{'='*80}")
         
-        # Check each degree
-        for degree_name, degree_data in province_data['degrees'].items():
-            degrees_checked += 1
-            degree_issues = []
-            
-            # Check Grade 12 requirements
-            grade_12 = degree_data.get('grade_12_requirements', [])
-            bc_issues_12 = check_for_bc_codes(grade_12, province_name)
-            generic_issues_12 = check_for_generic_patterns(grade_12)
-            
-            # Check Grade 11 requirements
-            grade_11 = degree_data.get('grade_11_requirements', [])
-            bc_issues_11 = check_for_bc_codes(grade_11, province_name)
-            generic_issues_11 = check_for_generic_patterns(grade_11)
-            
-            # Collect all issues
-            all_issues = bc_issues_12 + generic_issues_12 + bc_issues_11 + generic_issues_11
-            
-            if all_issues:
-                print(f"\n  ⚠️  {degree_name}:")
-                for issue in all_issues:
-                    print(f"      - {issue}")
-                total_issues += len(all_issues)
-            else:
-                print(f"  ✓ {degree_name}")
+        degrees_checked += 1
+        if all_issues:
+            print(f"\n  ⚠️  {degree_name}:")
+            for issue in all_issues:
+                print(f"      - {issue}")
+            total_issues += len(all_issues)
+        else:
+            print(f"  ✓ {degree_name}")
     
     print("\n" + "=" * 80)
     print("SUMMARY")
@@ -17,18 +17,25 @@ Options:
     --code            Course code prefix (e.g., MATH, PHYS, APSC)
     --force           Force re-scraping even if course already has details
     --curriculum-dir  Path to curriculum JSON files (default: src/data/curriculum/applied-science)
+    --record ARCHIVE  Record every fetched page into a fixture archive (.zip)
+    --replay ARCHIVE  Replay pages from a fixture archive (no network, no delays)
 """
 
 import argparse
 import json
 import os
-import random
-import re
-import time
-from typing import Dict, List, Optional, Union
+import sys
+from typing import Dict, List, Optional
 
-import requests
-from bs4 import BeautifulSoup
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.utils import course_parsing, fixtures, html_text
+from scraper.utils.fetch_engine import polite_wait
+from scraper.utils.course_index import CourseIndex
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
 
 
 class UBCCourseDetailsScraper:
@@ -53,7 +60,7 @@ class UBCCourseDetailsScraper:
             self.course_list_url = f"{self.base_url}/course-descriptions/subject/{self.subject}"
         
         self.force = force
-        self.session = requests.Session()
+        self.session = CachedSession(cacheable=lambda r: not self._blocked(r.text))
         
         # Enhanced headers to bypass security detection
         self.session.headers.update({
@@ -82,201 +89,48 @@ class UBCCourseDetailsScraper:
             self.curriculum_dir = os.path.join(script_dir, 'src', 'data', 'curriculum', 'applied-science')
     
     # ----------------------------
-    # Helpers (exact copy from scrape_single_course.py)
+    # Helpers (shared with scrape_single_course.py via scraper/utils/course_parsing.py)
     # ----------------------------
     def clean_course_code(self, code: str) -> str:
         """Convert SUBJECT_V to SUBJECT and normalize whitespace."""
-        code = re.sub(r"_V\s*", " ", code.strip())
-        code = re.sub(r"\s+", " ", code)
-        return code.strip()
+        return course_parsing.clean_course_code(code)
 
-    def _random_delay(self):
-        time.sleep(random.uniform(0.8, 2.2))
+    def _random_delay(self, url: str) -> float:
+        """Wait for the host's shared rate budget (plus jitter) before a request."""
+        return polite_wait(url)
 
     def _blocked(self, html_text: str) -> bool:
-        t = html_text.lower()
-        blocking_phrases = [
-            "your request has been blocked",
-            "security system",
-            "potentially automated",
-            "access denied",
-            "blocked by security",
-            "security check",
-        ]
-        return any(p in t for p in blocking_phrases)
+        return course_parsing.is_blocked(html_text)
 
     def clean_text(self, text: str) -> str:
         """Clean description/prereq/coreq text without killing URLs."""
-        if not text:
-            return ""
-
-        # Remove common scraped artifacts (navigation text, etc.)
-        text = re.sub(r'\nCourse Descriptions.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'\nIntroduction.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'\nCourses by Subject.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'\nCourses by Faculty.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-
-        # Remove credit vectors like [3-0-0], [3-0-1*], [3-0-1.5; 3-0-1.5], etc.
-        text = re.sub(
-            r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?"
-            r"(?:\s*;\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?)*\s*\]",
-            "",
-            text,
-        )
-
-        # Remove Credit/D/Fail boilerplate (optional)
-        text = re.sub(r"This course is not eligible for Credit/D/Fail grading\.?", "", text, flags=re.IGNORECASE)
+        return course_parsing.clean_text(text)
 
-        # Normalize whitespace
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r"\s+\n", "\n", text)
-        text = re.sub(r"\n\s+", "\n", text)
-
-        # Normalize period spacing
-        text = re.sub(r"\s*\.\s*\.", ".", text)
-        return text.strip()
-
-    # ----------------------------
-    # Parsing a single course chunk (adapted from scrape_single_course.py)
-    # ----------------------------
     def parse_course_chunk(self, chunk_text: str) -> Optional[Dict]:
         """
         Parse a course block (header + title + description + prereq/coreq).
-        Designed to work with subject-page or course-page extracted blocks.
-        Adapted from scrape_single_course.py for multiple courses.
-        KEY DIFFERENCE: Does not filter by specific course number - accepts any course in the chunk.
+        Accepts any course number of this subject found in the chunk.
         """
-        if not chunk_text or not chunk_text.strip():
-            return None
-
-        # Reject chunks that are obviously just a list of codes
-        chunk_stripped = chunk_text.strip()
-        if re.match(
-            r"^[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]+[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]*$",
-            chunk_stripped[:250],
-            re.IGNORECASE | re.MULTILINE,
-        ):
-            return None
-
-        # Header pattern for THIS prefix + any _V + number + optional credits (3) or (2-6)
-        # Example: MATH_V 255 (3) Ordinary Differential Equations
-        # KEY: Use generic pattern (\d{3}[A-Z]?) to capture any course number
-        header_pattern = rf"{re.escape(self.code)}(?:_V)?\s+(\d{{3}}[A-Z]?)\s*(?:\(([\d-]+)\))?"
-        code_match = re.search(header_pattern, chunk_text, re.IGNORECASE)
-        if not code_match:
-            return None
-
-        number = code_match.group(1)
-        credits_raw = code_match.group(2) if code_match.lastindex >= 2 and code_match.group(2) else None
-
-        raw_course_code = code_match.group(0)
-        course_code = self.clean_course_code(raw_course_code)
-
-        # NOTE: In scrape_single_course.py, we check if number matches self.course_number here
-        # For the general scraper, we accept any course number found
-
-        # Title + body extraction
-        header_end = code_match.end()
-        remaining = chunk_text[header_end:].lstrip()
-
-        # If remaining starts with a credit vector or stray punctuation, skip it
-        remaining = re.sub(r"^\s*\.?\s*", "", remaining)
-
-        # Title is usually on the same line until newline
-        title = ""
-        body = remaining
-
-        # Try same-line title
-        # stop at newline; also allow a long title, but avoid swallowing whole sentences
-        m = re.match(r"^([^\n]{2,120})\n(.*)$", remaining, flags=re.DOTALL)
-        if m:
-            candidate = m.group(1).strip()
-            # Heuristic: title should not start with prerequisite/corequisite/equivalency
-            if not re.match(r"^(Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency)\b", candidate, re.IGNORECASE):
-                title = candidate
-                body = m.group(2).strip()
-
-        # Fallback: if no newline, take first ~100 chars up to "Prerequisite:" if present
-        if not title:
-            m2 = re.search(r"^(.*?)(?:\s+(?:Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency):\s)", remaining, re.IGNORECASE | re.DOTALL)
-            if m2:
-                candidate = m2.group(1).strip()
-                if 2 < len(candidate) <= 120:
-                    title = candidate
-                    body = remaining[m2.end(1):].strip()
-
-        # Clean title: remove embedded course code and credit vectors
-        # Use the captured number from the regex match
-        code_pattern = rf"{re.escape(self.code)}(?:_V)?\s+{re.escape(number)}"
-        title = re.sub(code_pattern, "", title, flags=re.IGNORECASE).strip()
-        title = re.sub(r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?\s*\]", "", title).strip()
-        title = re.sub(r"\s+", " ", title).strip().rstrip(".").strip()
-
-        # Extract prereq/coreq/equiv from body (exact same patterns as scrape_single_course.py)
-        full_text = body.strip()
-        prereq = ""
-        coreq = ""
-        equiv = ""
-
-        prereq_pattern = r"(?:Prerequisite|Prerequisites):\s*(.+?)(?=\s*(?:Corequisite|Co-requisite|Corequisites|Equivalency|This course|Credit will|Consult|$))"
-        coreq_pattern = r"(?:Corequisite|Co-requisite|Corequisites):\s*(.+?)(?=\s*(?:Prerequisite|Prerequisites|Equivalency|This course|Credit will|Consult|$))"
-        equiv_pattern = r"Equivalency:\s*(.+?)(?=\s*(?:Prerequisite|Prerequisites|Corequisite|Co-requisite|Corequisites|This course|Credit will|Consult|$))"
-
-        pm = re.search(prereq_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
-        if pm:
-            prereq = pm.group(1).strip()
-            full_text = full_text.replace(pm.group(0), "", 1)
-
-        cm = re.search(coreq_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
-        if cm:
-            coreq = cm.group(1).strip()
-            full_text = full_text.replace(cm.group(0), "", 1)
-
-        em = re.search(equiv_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
-        if em:
-            equiv = em.group(1).strip()
-            full_text = full_text.replace(em.group(0), "", 1)
-
-        description = self.clean_text(full_text)
-        prereq = self.clean_text(prereq)
-        coreq = self.clean_text(coreq)
-        equiv = self.clean_text(equiv)
-
-        if equiv:
-            prereq = f"{prereq}\n\nEquivalency: {equiv}" if prereq else f"Equivalency: {equiv}"
-
-        # Parse credits into int or keep range string
-        credits: Union[int, str, None] = None
-        if credits_raw:
-            credits_raw = credits_raw.strip()
-            credits = int(credits_raw) if credits_raw.isdigit() else credits_raw  # e.g. "2-6"
-
-        return {
-            "code": course_code,         # "MATH 255"
-            "title": title,              # "Ordinary Differential Equations"
-            "credits": credits,          # 3 or "2-6"
-            "description": description,
-            "prerequisites": prereq,
-            "corequisites": coreq,
-        }
+        return course_parsing.parse_course_chunk(chunk_text, self.code)
 
     # ----------------------------
-    # Scrape course list (refactored to use re.finditer and robust parser)
+    # Scrape course list (single-pass segmenter and shared parser)
     # ----------------------------
     def scrape_course_list(self) -> Dict[str, Dict]:
         """
         Scrapes the calendar and chunks the content by course header.
         Returns a dictionary mapping course codes to course data.
-        Uses re.finditer to find all course headers and split into chunks.
+        Uses course_parsing.segment_course_text to find the course headers in one scan.
         """
         print(f"Scraping {self.code} courses from: {self.course_list_url}")
         
         try:
-            # Add random delay to avoid detection
-            delay = random.uniform(1, 3)
-            print(f"  Waiting {delay:.1f}s before request...")
-            time.sleep(delay)
+            # Add random delay to avoid detection (not needed when served from cache)
+            if self.session.is_fresh(self.course_list_url):
+                print("  Using cached page (still fresh)")
+            else:
+                delay = self._random_delay(self.course_list_url)
+                print(f"  Waited {delay:.1f}s before request")
             
             response = self.session.get(self.course_list_url, timeout=15)
             
@@ -286,69 +140,28 @@ class UBCCourseDetailsScraper:
                 return {}
             
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the main content container
-            main_content = None
-            for selector in ['main', 'article', '.content', '#content', '.main-content']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
+            # Only the main content container is parsed (main, article, ... else body)
+            full_text = html_text.main_text(response.content)
             
-            # If no specific container found, use the body
-            if not main_content:
-                main_content = soup.find('body') or soup
-            
-            # Get all text from the main content
-            full_text = main_content.get_text(separator='\n', strip=False)
-            
-            # Use re.finditer to find all course headers
-            # Pattern: SUBJECT(_V)? 123(A)? (credits)?
-            header_pattern = rf'{re.escape(self.code)}(?:_V)?\s+(\d{{3}}[A-Z]?)\s*(?:\(([\d-]+)\))?'
-            all_matches = list(re.finditer(header_pattern, full_text, re.IGNORECASE))
+            # One scan finds the course headers and drops in-text references
+            # (e.g., "MECH_V 486 or NAME_V 581" or "MECH_V 360 and fourth-year standing")
+            found, spans = course_parsing.segment_course_text(full_text, self.code)
             
-            if not all_matches:
+            if not found:
                 print(f"  Warning: No {self.code} headers found at this URL.")
                 return {}
             
-            print(f"  Found {len(all_matches)} potential course headers")
-            
-            # Filter out matches that are part of equivalency statements or prerequisites
-            # (e.g., "MECH_V 486 or NAME_V 581" or "MECH_V 360 and fourth-year standing")
-            valid_headers = []
-            for m in all_matches:
-                # Look ahead to see if this is part of an equivalency or prerequisite
-                lookahead = full_text[m.end():m.end()+80].lower()
-                lookbehind = full_text[max(0, m.start()-80):m.start()].lower()
-                
-                # Skip if followed by "or" + course code pattern (equivalency)
-                is_equivalency_or = re.search(r'\s+or\s+[A-Z]{2,4}_?V?\s+\d', lookahead)
-                # Skip if followed by comma + course code pattern
-                is_equivalency_comma = re.search(r',\s*[A-Z]{2,4}_?V?\s+\d', lookahead)
-                # Skip if followed by "and" + text that looks like a requirement (not a course code)
-                is_prerequisite_and = re.search(r'\s+and\s+(?:fourth-year|third-year|second-year|all of|one of|either)', lookahead)
-                # Skip if it's in an equivalency context
-                is_equivalency_context = 'equivalency' in lookbehind or 'equivalency' in lookahead
-                # Skip if preceded by "Prerequisite:" or "Corequisite:" (it's in a requirement list)
-                is_in_requirement = re.search(r'(?:prerequisite|corequisite):', lookbehind)
-                
-                is_equivalency = (is_equivalency_or or is_equivalency_comma or is_prerequisite_and or 
-                                 is_equivalency_context or is_in_requirement)
-                
-                if not is_equivalency:
-                    valid_headers.append(m)
+            print(f"  Found {found} potential course headers")
             
-            if not valid_headers:
+            if not spans:
                 print(f"  Warning: No valid {self.code} headers found after filtering.")
                 return {}
             
-            print(f"  Found {len(valid_headers)} valid course headers after filtering")
+            print(f"  Found {len(spans)} valid course headers after filtering")
             
             # Extract chunks between headers (from Header A to Header B)
             chunks = []
-            for i in range(len(valid_headers)):
-                start = valid_headers[i].start()
-                end = valid_headers[i + 1].start() if i + 1 < len(valid_headers) else len(full_text)
+            for start, end in spans:
                 chunk = full_text[start:end].strip()
                 if chunk:
                     chunks.append(chunk)
@@ -425,9 +238,10 @@ class UBCCourseDetailsScraper:
         filepath = os.path.join(self.curriculum_dir, filename)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"  Saved: {filepath}")
+            if write_json(filepath, data):
+                print(f"  Saved: {filepath}")
+            else:
+                print(f"  Unchanged: {filepath}")
         except Exception as e:
             print(f"Error saving {filename}: {e}")
     
@@ -492,46 +306,24 @@ class UBCCourseDetailsScraper:
         
         return updated
     
-    def process_curriculum_file(self, filename: str, scraped_data: Dict):
+    def update_curriculum_files(self, scraped_data: Dict):
         """
-        Process a curriculum JSON file and enrich courses matching the subject code.
+        Enrich the scraped courses in the curriculum JSON files.
+        Only files that list at least one scraped course are opened and saved
+        (looked up in the persistent course index, see scraper/utils/course_index.py).
         """
-        print(f"\n{'='*60}")
-        print(f"Processing: {filename}")
-        print(f"{'='*60}")
-        
-        data = self.load_json_file(filename)
-        if not data:
-            return
-        
-        # Track statistics
-        total_courses = 0
-        processed_courses = 0
-        updated_courses = 0
-        
-        # Iterate through all courses in all years and terms
-        for year_data in data.get('years', []):
-            for term_data in year_data.get('terms', []):
-                for course in term_data.get('courses', []):
-                    total_courses += 1
-                    
-                    # Check if this is a matching course
-                    code = course.get('code', '')
-                    if code and code.startswith(self.code):
-                        processed_courses += 1
-                        if self.update_course(course, scraped_data):
-                            updated_courses += 1
-        
-        print(f"\nSummary for {filename}:")
-        print(f"  Total courses: {total_courses}")
-        print(f"  {self.code} courses: {processed_courses}")
-        print(f"  Updated courses: {updated_courses}")
-        
-        # Save the updated file
-        if updated_courses > 0:
-            self.save_json_file(data, filename)
-        else:
-            print(f"  No updates needed, skipping save")
+        index = CourseIndex(self.curriculum_dir)
+        counts = index.apply(scraped_data.keys(),
+                             lambda course: self.update_course(course, scraped_data),
+                             save=self.save_json_file)
+        
+        for filename, (matched, updated) in counts.items():
+            print(f"  {filename}: {matched} {self.code} course(s), {updated} updated "
+                  f"({index.files.get(filename, {}).get('total', '?')} courses in file)")
+        
+        skipped = len(index.files) - len(counts)
+        print(f"\nUpdated {sum(u for _, u in counts.values())} course(s) in {len(counts)} file(s); "
+              f"{skipped} file(s) list none of the scraped courses and were not opened")
     
     def run(self):
         """Main execution method"""
@@ -576,9 +368,7 @@ class UBCCourseDetailsScraper:
             print("No JSON files found in curriculum directory")
             return
         
-        for filename in sorted(json_files):
-            self.process_curriculum_file(filename, scraped_data)
-            time.sleep(0.5)  # Brief pause between files
+        self.update_curriculum_files(scraped_data)
         
         print(f"\n{'='*60}")
         print("Scraping Complete!")
@@ -624,7 +414,10 @@ Examples:
         help='Path to curriculum JSON files (default: src/data/curriculum/applied-science)'
     )
     
+    fixtures.add_arguments(parser)
+    
     args = parser.parse_args()
+    fixtures.configure(record=args.record, replay=args.replay)
     
     scraper = UBCCourseDetailsScraper(
         subject=args.subject,
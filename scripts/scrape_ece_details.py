@@ -4,29 +4,53 @@ Scrapes course descriptions and prerequisites from ECE department website
 and enriches existing curriculum JSON files.
 
 Usage:
-    python scripts/scrape_ece_details.py [--force] [--clean-only]
+    python scripts/scrape_ece_details.py [--force] [--clean-only] [--concurrency N] [--record ARCHIVE | --replay ARCHIVE]
     
 Options:
     --force      Force re-scraping even if course already has details
     --clean-only Only clean existing prerequisites (remove boilerplate), don't scrape new data
+    --concurrency N  Number of course pages fetched in parallel (default: 4)
+    --record ARCHIVE  Record every fetched page into a fixture archive (.zip)
+    --replay ARCHIVE  Replay pages from a fixture archive (no network, no delays)
 """
 
 import requests
 from bs4 import BeautifulSoup
 import json
 import re
-import time
-import random
 import os
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.course_index import CourseIndex
+from scraper.utils.fetch_engine import FetchEngine, polite_wait
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
+
+BLOCKING_PHRASES = [
+    'your request has been blocked',
+    'security system',
+    'potentially automated',
+    'access denied',
+    'blocked by security',
+    'security check',
+    'automated access',
+    'suspicious activity',
+    'please verify you are human'
+]
 
 class ECECourseDetailsScraper:
-    def __init__(self, force=False, clean_only=False):
+    def __init__(self, force=False, clean_only=False, concurrency=4):
         self.base_url = "https://ece.ubc.ca/courses"
         self.force = force
         self.clean_only = clean_only
-        self.session = requests.Session()
+        self.concurrency = concurrency
+        self.session = CachedSession(cacheable=self._cacheable)
         
         # Enhanced headers to bypass security detection
         # Use a realistic, modern browser User-Agent (Chrome on Mac)
@@ -51,6 +75,16 @@ class ECECourseDetailsScraper:
         
         # Cache for scraped course data (key: course_code, value: {description, prerequisites})
         self.scraped_data_cache = {}
+        
+        # Responses fetched ahead of time by prefetch_course_pages (key: url)
+        self.prefetched = {}
+    
+    def _cacheable(self, response: requests.Response) -> bool:
+        """Never cache block pages or suspiciously short error pages."""
+        response_text = response.text.lower()
+        if any(phrase in response_text for phrase in BLOCKING_PHRASES):
+            return False
+        return not (len(response.text) < 500 and ('error' in response_text or 'blocked' in response_text))
     
     def clean_prerequisites_text(self, text: str) -> str:
         """
@@ -316,30 +350,26 @@ class ECECourseDetailsScraper:
         }
         
         try:
-            # Add random delay to avoid detection (2-5 seconds)
-            delay = random.uniform(2, 5)
-            print(f"  Fetching: {url} (waiting {delay:.1f}s to avoid detection...)")
-            time.sleep(delay)
-            
-            response = self.session.get(url, timeout=15)
+            response = self.prefetched.pop(url, None)
+            if isinstance(response, Exception):
+                raise response
+            if response is not None:
+                print(f"  Fetched: {url} (prefetched)")
+            elif self.session.is_fresh(url):
+                print(f"  Fetching: {url} (cached)")
+                response = self.session.get(url, timeout=15)
+            else:
+                # Wait for the host's rate budget to avoid detection
+                delay = polite_wait(url)
+                print(f"  Fetching: {url} (waited {delay:.1f}s to avoid detection...)")
+                response = self.session.get(url, timeout=15)
             
             # Validation: Check if response contains blocking messages
             # Check both response text and status code
             response_text = response.text.lower()
-            blocking_phrases = [
-                'your request has been blocked',
-                'security system',
-                'potentially automated',
-                'access denied',
-                'blocked by security',
-                'security check',
-                'automated access',
-                'suspicious activity',
-                'please verify you are human'
-            ]
             
             # Check for blocking messages in response
-            if any(phrase in response_text for phrase in blocking_phrases):
+            if any(phrase in response_text for phrase in BLOCKING_PHRASES):
                 print(f"    ⚠️  BLOCKED: Request was blocked by UBC security system")
                 print(f"    ⚠️  Response contains security blocking message")
                 print(f"    ⚠️  Skipping {course_code} to avoid further blocks")
@@ -382,9 +412,6 @@ class ECECourseDetailsScraper:
             # Cache the result
             self.scraped_data_cache[course_code] = result
             
-            # Additional delay after successful request (randomized to avoid detection)
-            time.sleep(random.uniform(1, 2))
-            
         except requests.exceptions.RequestException as e:
             print(f"    → Error fetching {url}: {e}")
             # Cache empty result to avoid re-trying
@@ -396,6 +423,33 @@ class ECECourseDetailsScraper:
         
         return result
     
+    def needs_scrape(self, course: Dict) -> bool:
+        """True if process_course would fetch this course's page (mirrors its skip rules)."""
+        parsed = self.parse_course_code(course.get('code', ''))
+        if not parsed or parsed[0] not in ['ELEC', 'CPEN'] or self.clean_only:
+            return False
+        return self.force or not (course.get('description') and course.get('prerequisites'))
+    
+    def prefetch_course_pages(self, index: CourseIndex):
+        """
+        Fetch every course page the run will need up front, concurrently.
+        The fetch engine keeps ece.ubc.ca under its rate budget, so this replaces
+        the per-course sleeps; scrape_course_details then reads from self.prefetched.
+        """
+        urls = []
+        for _, course in index.courses(index.codes_for_subjects(['ELEC', 'CPEN'])):
+            if self.needs_scrape(course):
+                subject, number = self.parse_course_code(course['code'])
+                urls.append(self.build_course_url(subject, number))
+        
+        if not urls:
+            return
+        
+        urls = list(dict.fromkeys(urls))
+        print(f"\nPrefetching {len(urls)} course pages (concurrency={self.concurrency})...")
+        engine = FetchEngine(session=self.session, concurrency=self.concurrency)
+        self.prefetched = engine.fetch_all(urls)
+    
     def process_course(self, course: Dict) -> bool:
         """
         Process a single course object. Returns True if course was updated.
@@ -480,54 +534,31 @@ class ECECourseDetailsScraper:
         filepath = os.path.join(self.curriculum_dir, filename)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"  Saved: {filepath}")
+            if write_json(filepath, data):
+                print(f"  Saved: {filepath}")
+            else:
+                print(f"  Unchanged: {filepath}")
         except Exception as e:
             print(f"Error saving {filename}: {e}")
     
-    def process_curriculum_file(self, filename: str):
+    def update_curriculum_files(self, index: CourseIndex):
         """
-        Process a curriculum JSON file and enrich ELEC/CPEN courses.
+        Enrich ELEC/CPEN courses in the curriculum JSON files.
+        Only files that list at least one of them are opened and saved
+        (looked up in the persistent course index, see scraper/utils/course_index.py).
         """
-        print(f"\n{'='*60}")
-        print(f"Processing: {filename}")
-        print(f"{'='*60}")
-        
-        data = self.load_json_file(filename)
-        if not data:
-            return
-        
-        # Track statistics
-        total_courses = 0
-        processed_courses = 0
-        updated_courses = 0
-        
-        # Iterate through all courses in all years and terms
-        for year_data in data.get('years', []):
-            for term_data in year_data.get('terms', []):
-                for course in term_data.get('courses', []):
-                    total_courses += 1
-                    
-                    # Check if this is an ELEC or CPEN course
-                    code = course.get('code', '')
-                    parsed = self.parse_course_code(code)
-                    
-                    if parsed and parsed[0] in ['ELEC', 'CPEN']:
-                        processed_courses += 1
-                        if self.process_course(course):
-                            updated_courses += 1
-        
-        print(f"\nSummary for {filename}:")
-        print(f"  Total courses: {total_courses}")
-        print(f"  ELEC/CPEN courses: {processed_courses}")
-        print(f"  Updated courses: {updated_courses}")
-        
-        # Save the updated file
-        if updated_courses > 0:
-            self.save_json_file(data, filename)
-        else:
-            print(f"  No updates needed, skipping save")
+        counts = index.apply(index.codes_for_subjects(['ELEC', 'CPEN']),
+                             self.process_course, save=self.save_json_file)
+        
+        for filename, (matched, updated) in counts.items():
+            print(f"\nSummary for {filename}:")
+            print(f"  Total courses: {index.files.get(filename, {}).get('total', '?')}")
+            print(f"  ELEC/CPEN courses: {matched}")
+            print(f"  Updated courses: {updated}")
+        
+        skipped = len(index.files) - len(counts)
+        print(f"\nUpdated {sum(u for _, u in counts.values())} course(s) in {len(counts)} file(s); "
+              f"{skipped} file(s) list no ELEC/CPEN courses and were not opened")
     
     def run(self):
         """Main execution method"""
@@ -549,24 +580,19 @@ class ECECourseDetailsScraper:
             print(f"Error: Directory not found: {self.curriculum_dir}")
             return
         
-        json_files = [f for f in os.listdir(self.curriculum_dir) if f.endswith('.json')]
-        json_files.sort()  # Process in alphabetical order
-        
-        if not json_files:
+        index = CourseIndex(self.curriculum_dir)
+        if not index.files:
             print("No JSON files found in curriculum directory")
             return
         
-        print(f"\nFound {len(json_files)} JSON files to process:")
-        for f in json_files:
-            print(f"  - {f}")
+        print(f"\nIndexed {len(index.files)} JSON files; "
+              f"{len(index.codes_for_subjects(['ELEC', 'CPEN']))} distinct ELEC/CPEN course(s)")
         
-        total_scraped = 0
-        total_updated = 0
+        # Fetch all needed course pages concurrently under the rate limit
+        self.prefetch_course_pages(index)
         
-        # Process all JSON files
-        for filename in json_files:
-            self.process_curriculum_file(filename)
-            time.sleep(0.5)  # Brief pause between files
+        # Update only the files that list ELEC/CPEN courses
+        self.update_curriculum_files(index)
         
         # Print cache statistics
         print(f"\n{'='*60}")
@@ -581,9 +607,13 @@ class ECECourseDetailsScraper:
 
 if __name__ == "__main__":
     # Parse command line arguments
+    fixtures.configure_from_argv()
     force = '--force' in sys.argv
     clean_only = '--clean-only' in sys.argv
+    concurrency = 4
+    if '--concurrency' in sys.argv:
+        concurrency = int(sys.argv[sys.argv.index('--concurrency') + 1])
     
-    scraper = ECECourseDetailsScraper(force=force, clean_only=clean_only)
+    scraper = ECECourseDetailsScraper(force=force, clean_only=clean_only, concurrency=concurrency)
     scraper.run()
 
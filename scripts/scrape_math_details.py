@@ -4,27 +4,35 @@ Scrapes course descriptions, prerequisites, and equivalencies from UBC Calendar
 and enriches existing curriculum JSON files for all engineering majors.
 
 Usage:
-    python scripts/scrape_math_details.py [--force]
+    python scripts/scrape_math_details.py [--force] [--record ARCHIVE | --replay ARCHIVE]
     
 Options:
     --force      Force re-scraping even if course already has details
+    --record ARCHIVE  Record every fetched page into a fixture archive (.zip)
+    --replay ARCHIVE  Replay pages from a fixture archive (no network, no delays)
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import re
-import time
 import os
 import sys
 from typing import Dict, List, Optional
 
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.utils import course_parsing, fixtures, html_text
+from scraper.utils.course_index import CourseIndex
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
+
 class MATHCourseDetailsScraper:
     def __init__(self, force=False):
         self.base_url = "https://vancouver.calendar.ubc.ca"
         self.course_list_url = f"{self.base_url}/course-descriptions/subject/mathv"
         self.force = force
-        self.session = requests.Session()
+        self.session = CachedSession()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -41,29 +49,13 @@ class MATHCourseDetailsScraper:
         Clean course code: Convert MATH_V to MATH.
         Example: 'MATH_V 101' -> 'MATH 101'
         """
-        # Remove _V suffix and normalize spacing
-        code = re.sub(r'_V\s*', ' ', code.strip())
-        code = re.sub(r'\s+', ' ', code)
-        return code.strip()
+        return course_parsing.clean_course_code(code)
     
     def clean_text(self, text: str) -> str:
         """
         Clean course description text by removing unwanted content.
         """
-        if not text:
-            return ""
-        
-        # Remove credit vector pattern [x-x-x]
-        text = re.sub(r'\[?\d+-\d+-\d+\]?', '', text)
-        
-        # Remove "This course is not eligible for Credit/D/Fail grading"
-        text = re.sub(r'This course is not eligible for Credit/D/Fail grading\.?', '', text, flags=re.IGNORECASE)
-        
-        # Clean up extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\s*\.\s*\.', '.', text)  # Fix double periods
-        
-        return text.strip()
+        return course_parsing.clean_text_compact(text)
     
     def parse_course_chunk(self, chunk_text: str) -> Optional[Dict]:
         """
@@ -147,21 +139,8 @@ class MATHCourseDetailsScraper:
         try:
             response = self.session.get(self.course_list_url, timeout=15)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find the main content container
-            main_content = None
-            for selector in ['main', 'article', '.content', '#content', '.main-content']:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            # If no specific container found, use the body
-            if not main_content:
-                main_content = soup.find('body') or soup
-            
-            # Get all text from the main content
-            full_text = main_content.get_text(separator='\n', strip=False)
+            # Only the main content container is parsed (main, article, ... else body)
+            full_text = html_text.main_text(response.content)
             
             # Split into chunks using course headers
             # Pattern to find all course headers: MATH_V followed by number
@@ -229,9 +208,10 @@ class MATHCourseDetailsScraper:
         output_path = os.path.join(script_dir, filename)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(course_data, f, indent=2, ensure_ascii=False)
-            print(f"\nSaved {len(course_data)} courses to: {output_path}")
+            if write_json(output_path, course_data):
+                print(f"\nSaved {len(course_data)} courses to: {output_path}")
+            else:
+                print(f"\n{len(course_data)} courses unchanged in: {output_path}")
             return output_path
         except Exception as e:
             print(f"Error saving JSON file: {e}")
@@ -257,9 +237,10 @@ class MATHCourseDetailsScraper:
         filepath = os.path.join(self.curriculum_dir, filename)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"  Saved: {filepath}")
+            if write_json(filepath, data):
+                print(f"  Saved: {filepath}")
+            else:
+                print(f"  Unchanged: {filepath}")
         except Exception as e:
             print(f"Error saving {filename}: {e}")
     
@@ -311,46 +292,24 @@ class MATHCourseDetailsScraper:
         
         return updated
     
-    def process_curriculum_file(self, filename: str, scraped_data: Dict):
+    def update_curriculum_files(self, scraped_data: Dict):
         """
-        Process a curriculum JSON file and enrich MATH courses.
+        Enrich the scraped courses in the curriculum JSON files.
+        Only files that list at least one scraped course are opened and saved
+        (looked up in the persistent course index, see scraper/utils/course_index.py).
         """
-        print(f"\n{'='*60}")
-        print(f"Processing: {filename}")
-        print(f"{'='*60}")
-        
-        data = self.load_json_file(filename)
-        if not data:
-            return
-        
-        # Track statistics
-        total_courses = 0
-        processed_courses = 0
-        updated_courses = 0
-        
-        # Iterate through all courses in all years and terms
-        for year_data in data.get('years', []):
-            for term_data in year_data.get('terms', []):
-                for course in term_data.get('courses', []):
-                    total_courses += 1
-                    
-                    # Check if this is a MATH course
-                    code = course.get('code', '')
-                    if code and code.startswith('MATH'):
-                        processed_courses += 1
-                        if self.update_course(course, scraped_data):
-                            updated_courses += 1
-        
-        print(f"\nSummary for {filename}:")
-        print(f"  Total courses: {total_courses}")
-        print(f"  MATH courses: {processed_courses}")
-        print(f"  Updated courses: {updated_courses}")
-        
-        # Save the updated file
-        if updated_courses > 0:
-            self.save_json_file(data, filename)
-        else:
-            print(f"  No updates needed, skipping save")
+        index = CourseIndex(self.curriculum_dir)
+        counts = index.apply(scraped_data.keys(),
+                             lambda course: self.update_course(course, scraped_data),
+                             save=self.save_json_file)
+        
+        for filename, (matched, updated) in counts.items():
+            print(f"  {filename}: {matched} MATH course(s), {updated} updated "
+                  f"({index.files.get(filename, {}).get('total', '?')} courses in file)")
+        
+        skipped = len(index.files) - len(counts)
+        print(f"\nUpdated {sum(u for _, u in counts.values())} course(s) in {len(counts)} file(s); "
+              f"{skipped} file(s) list none of the scraped courses and were not opened")
     
     def run(self):
         """Main execution method"""
@@ -384,12 +343,7 @@ class MATHCourseDetailsScraper:
         # Step B: Update all JSON files
         print(f"\n[Step B] Updating curriculum JSON files...")
         
-        # Get all JSON files in the directory
-        json_files = [f for f in os.listdir(self.curriculum_dir) if f.endswith('.json')]
-        
-        for filename in sorted(json_files):
-            self.process_curriculum_file(filename, scraped_data)
-            time.sleep(0.5)  # Brief pause between files
+        self.update_curriculum_files(scraped_data)
         
         print(f"\n{'='*60}")
         print("Scraping Complete!")
@@ -398,6 +352,7 @@ class MATHCourseDetailsScraper:
 
 if __name__ == "__main__":
     # Parse command line arguments
+    fixtures.configure_from_argv()
     force = '--force' in sys.argv
     
     scraper = MATHCourseDetailsScraper(force=force)
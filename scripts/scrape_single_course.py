@@ -8,27 +8,60 @@ Works best by:
 1) Trying the per-course page first: /course-descriptions/courses/<subject>-<number>
 2) Falling back to the subject page: /course-descriptions/subject/<subject>
 
+Batch mode (several --course codes) turns this around: the codes are grouped
+by subject, each subject page is fetched and parsed once and every target is
+resolved from it; only courses missing there fall back to their per-course
+page. Only the JSON files that list a target are opened, once per batch.
+
 Usage:
     python scripts/scrape_single_course.py --course "MATH 255" --subject mathv
     python scripts/scrape_single_course.py --course "MATH 255" --subject mathv --force
+    python scripts/scrape_single_course.py --course "MATH 255" --subject mathv --replay fixtures/math.zip
+    python scripts/scrape_single_course.py --course "MATH 255" "MATH 256" "APSC 160"
+
+--subject overrides the subject page for every target, so a batch may only use
+it when all of its courses share one subject.
 """
 
 import argparse
-import json
 import os
-import random
 import re
-import time
-from typing import Dict, Optional, Tuple, Union
+import sys
+from typing import Dict, List, Optional, Tuple
 
 import requests
 from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.utils import course_parsing, fixtures
+from scraper.utils.course_index import CourseIndex, normalize_code
+from scraper.utils.fetch_engine import polite_wait
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
+
+
+COURSE_HEADER_TAGS = ["h2", "h3", "h4", "h5"]
+
+
+def course_header_tags(soup: BeautifulSoup) -> List[Tuple[Tag, str]]:
+    """(tag, text) for every candidate course header on a page."""
+    return [(tag, tag.get_text(" ", strip=True)) for tag in soup.find_all(COURSE_HEADER_TAGS)]
+
+
+def page_text(soup: BeautifulSoup) -> str:
+    """Text of the page's main content, one line per text node."""
+    main = soup.select_one("main") or soup.select_one("article") or soup.body or soup
+    return main.get_text(separator="\n", strip=False)
 
 
 class SingleCourseScraper:
-    def __init__(self, target_course: str, subject_suffix: str, force: bool = False):
+    def __init__(self, target_course: str, subject_suffix: Optional[str] = None, force: bool = False,
+                 session: Optional[CachedSession] = None):
         self.target_course = self.clean_input_code(target_course)  # e.g. "MATH 255"
-        self.subject_suffix = subject_suffix.lower().strip()       # e.g. "mathv"
 
         parts = self.target_course.split()
         if len(parts) != 2:
@@ -37,6 +70,9 @@ class SingleCourseScraper:
         self.code_prefix = parts[0].upper()
         self.course_number = parts[1]  # keep as string
 
+        # e.g. "mathv"; defaults to the course's own subject
+        self.subject_suffix = (subject_suffix or self.code_prefix).lower().strip()
+
         self.base_url = "https://vancouver.calendar.ubc.ca"
 
         # Subject page URL: ensure it ends with 'v' (UBC Vancouver subjects do)
@@ -48,7 +84,11 @@ class SingleCourseScraper:
         self.course_page_url = f"{self.base_url}/course-descriptions/courses/{self.subject_suffix}-{self.course_number.lower()}"
 
         self.force = force
-        self.session = requests.Session()
+        if session is not None:
+            self.session = session  # shared by a BatchCourseScraper
+            self.curriculum_dir = self._curriculum_dir()
+            return
+        self.session = CachedSession(cacheable=lambda r: not self._blocked(r.text))
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
                           "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
@@ -60,9 +100,13 @@ class SingleCourseScraper:
             "Cache-Control": "max-age=0",
         })
 
+        self.curriculum_dir = self._curriculum_dir()
+
+    @staticmethod
+    def _curriculum_dir() -> str:
         # Path to curriculum JSON files (same as your original)
         script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.curriculum_dir = os.path.join(script_dir, "src", "data", "curriculum", "applied-science")
+        return os.path.join(script_dir, "src", "data", "curriculum", "applied-science")
 
     # ----------------------------
     # Helpers
@@ -73,28 +117,21 @@ class SingleCourseScraper:
 
     def clean_course_code(self, code: str) -> str:
         """Convert SUBJECT_V to SUBJECT and normalize whitespace."""
-        code = re.sub(r"_V\s*", " ", code.strip())
-        code = re.sub(r"\s+", " ", code)
-        return code.strip()
+        return course_parsing.clean_course_code(code)
 
-    def _random_delay(self):
-        time.sleep(random.uniform(0.8, 2.2))
+    def _random_delay(self, url: str) -> float:
+        """Wait for the host's shared rate budget (plus jitter) before a request."""
+        return polite_wait(url)
 
     def _blocked(self, html_text: str) -> bool:
-        t = html_text.lower()
-        blocking_phrases = [
-            "your request has been blocked",
-            "security system",
-            "potentially automated",
-            "access denied",
-            "blocked by security",
-            "security check",
-        ]
-        return any(p in t for p in blocking_phrases)
+        return course_parsing.is_blocked(html_text)
 
     def fetch_soup(self, url: str) -> Optional[BeautifulSoup]:
         print(f"Fetching: {url}")
-        self._random_delay()
+        if self.session.is_fresh(url):
+            print("  (cached)")
+        else:
+            self._random_delay(url)
         try:
             r = self.session.get(url, timeout=20)
             if self._blocked(r.text):
@@ -111,35 +148,7 @@ class SingleCourseScraper:
 
     def clean_text(self, text: str) -> str:
         """Clean description/prereq/coreq text without killing URLs."""
-        if not text:
-            return ""
-
-        # Remove common scraped artifacts (navigation text, etc.)
-        text = re.sub(r'\nCourse Descriptions.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'\nIntroduction.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'\nCourses by Subject.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-        text = re.sub(r'\nCourses by Faculty.*$', '', text, flags=re.IGNORECASE | re.MULTILINE)
-
-        # Remove credit vectors like [3-0-0], [3-0-1*], [3-0-1.5; 3-0-1.5], etc.
-        text = re.sub(
-            r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?"
-            r"(?:\s*;\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?)*\s*\]",
-            "",
-            text,
-        )
-
-        # Remove Credit/D/Fail boilerplate (optional)
-        text = re.sub(r"This course is not eligible for Credit/D/Fail grading\.?", "", text, flags=re.IGNORECASE)
-
-        # Normalize whitespace
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r"\s+\n", "\n", text)
-        text = re.sub(r"\n\s+", "\n", text)
-
-        # Normalize period spacing
-        text = re.sub(r"\s*\.\s*\.", ".", text)
-        return text.strip()
+        return course_parsing.clean_text(text)
 
     # ----------------------------
     # Parsing a single course chunk
@@ -147,128 +156,19 @@ class SingleCourseScraper:
     def parse_course_chunk(self, chunk_text: str) -> Optional[Dict]:
         """
         Parse a course block (header + title + description + prereq/coreq).
-        Designed to work with subject-page or course-page extracted blocks.
+        Only the target course number is accepted.
         """
-        if not chunk_text or not chunk_text.strip():
-            return None
-
-        # Reject chunks that are obviously just a list of codes
-        chunk_stripped = chunk_text.strip()
-        if re.match(
-            r"^[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]+[A-Z]{2,6}_?V?\s+\d{3}[A-Z]?[,\s\n]*$",
-            chunk_stripped[:250],
-            re.IGNORECASE | re.MULTILINE,
-        ):
-            return None
-
-        # Header pattern for THIS prefix + any _V + number + optional credits (3) or (2-6)
-        # Example: MATH_V 255 (3) Ordinary Differential Equations
-        header_pattern = rf"{re.escape(self.code_prefix)}(?:_V)?\s+(\d{{3}}[A-Z]?)\s*(?:\(([\d-]+)\))?"
-        code_match = re.search(header_pattern, chunk_text, re.IGNORECASE)
-        if not code_match:
-            return None
-
-        number = code_match.group(1)
-        credits_raw = code_match.group(2) if code_match.lastindex and code_match.group(2) else None
-
-        raw_course_code = code_match.group(0)
-        course_code = self.clean_course_code(raw_course_code)
-
-        # Ensure we only accept the target course number
-        if number.upper() != self.course_number.upper():
-            return None
-
-        # Title + body extraction
-        header_end = code_match.end()
-        remaining = chunk_text[header_end:].lstrip()
-
-        # If remaining starts with a credit vector or stray punctuation, skip it
-        remaining = re.sub(r"^\s*\.?\s*", "", remaining)
-
-        # Title is usually on the same line until newline
-        title = ""
-        body = remaining
-
-        # Try same-line title
-        # stop at newline; also allow a long title, but avoid swallowing whole sentences
-        m = re.match(r"^([^\n]{2,120})\n(.*)$", remaining, flags=re.DOTALL)
-        if m:
-            candidate = m.group(1).strip()
-            # Heuristic: title should not start with prerequisite/corequisite/equivalency
-            if not re.match(r"^(Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency)\b", candidate, re.IGNORECASE):
-                title = candidate
-                body = m.group(2).strip()
-
-        # Fallback: if no newline, take first ~100 chars up to "Prerequisite:" if present
-        if not title:
-            m2 = re.search(r"^(.*?)(?:\s+(?:Prerequisite|Prerequisites|Corequisite|Corequisites|Co-requisite|Equivalency):\s)", remaining, re.IGNORECASE | re.DOTALL)
-            if m2:
-                candidate = m2.group(1).strip()
-                if 2 < len(candidate) <= 120:
-                    title = candidate
-                    body = remaining[m2.end(1):].strip()
-
-        # Clean title: remove embedded course code and credit vectors
-        code_pattern = rf"{re.escape(self.code_prefix)}(?:_V)?\s+{re.escape(number)}"
-        title = re.sub(code_pattern, "", title, flags=re.IGNORECASE).strip()
-        title = re.sub(r"\[\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*-\s*\d+(?:\.\d+)?\s*\*?\s*\]", "", title).strip()
-        title = re.sub(r"\s+", " ", title).strip().rstrip(".").strip()
-
-        # Extract prereq/coreq/equiv from body
-        full_text = body.strip()
-        prereq = ""
-        coreq = ""
-        equiv = ""
-
-        prereq_pattern = r"(?:Prerequisite|Prerequisites):\s*(.+?)(?=\s*(?:Corequisite|Co-requisite|Corequisites|Equivalency|This course|Credit will|Consult|$))"
-        coreq_pattern = r"(?:Corequisite|Co-requisite|Corequisites):\s*(.+?)(?=\s*(?:Prerequisite|Prerequisites|Equivalency|This course|Credit will|Consult|$))"
-        equiv_pattern = r"Equivalency:\s*(.+?)(?=\s*(?:Prerequisite|Prerequisites|Corequisite|Co-requisite|Corequisites|This course|Credit will|Consult|$))"
-
-        pm = re.search(prereq_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
-        if pm:
-            prereq = pm.group(1).strip()
-            full_text = full_text.replace(pm.group(0), "", 1)
-
-        cm = re.search(coreq_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
-        if cm:
-            coreq = cm.group(1).strip()
-            full_text = full_text.replace(cm.group(0), "", 1)
-
-        em = re.search(equiv_pattern, full_text, flags=re.IGNORECASE | re.DOTALL)
-        if em:
-            equiv = em.group(1).strip()
-            full_text = full_text.replace(em.group(0), "", 1)
-
-        description = self.clean_text(full_text)
-        prereq = self.clean_text(prereq)
-        coreq = self.clean_text(coreq)
-        equiv = self.clean_text(equiv)
-
-        if equiv:
-            prereq = f"{prereq}\n\nEquivalency: {equiv}" if prereq else f"Equivalency: {equiv}"
-
-        # Parse credits into int or keep range string
-        credits: Union[int, str, None] = None
-        if credits_raw:
-            credits_raw = credits_raw.strip()
-            credits = int(credits_raw) if credits_raw.isdigit() else credits_raw  # e.g. "2-6"
-
-        return {
-            "code": course_code,         # "MATH 255"
-            "title": title,              # "Ordinary Differential Equations"
-            "credits": credits,          # 3 or "2-6"
-            "description": description,
-            "prerequisites": prereq,
-            "corequisites": coreq,
-        }
+        return course_parsing.parse_course_chunk(chunk_text, self.code_prefix, number=self.course_number)
 
     # ----------------------------
     # Extract course block from HTML (preferred on subject page)
     # ----------------------------
-    def extract_course_block_from_subject_page(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_course_block_from_subject_page(self, soup: BeautifulSoup,
+                                               headers: Optional[List[Tuple[Tag, str]]] = None) -> Optional[str]:
         """
         On the subject page, courses are usually listed with a header element (h3/h4) per course.
         We locate the header for the target and then collect following siblings until the next course header.
+        `headers` is the page's (tag, text) header list when the caller already built it.
         """
         # A course header on the subject page usually contains the whole line:
         # "MATH_V 255 (3) Ordinary Differential Equations"
@@ -278,10 +178,10 @@ class SingleCourseScraper:
         )
 
         # Candidate header tags (site-dependent, but these cover most layouts)
-        header_tags = soup.find_all(["h2", "h3", "h4", "h5"])
+        if headers is None:
+            headers = course_header_tags(soup)
         target_header = None
-        for tag in header_tags:
-            txt = tag.get_text(" ", strip=True)
+        for tag, txt in headers:
             if header_re.search(txt):
                 target_header = tag
                 break
@@ -293,9 +193,13 @@ class SingleCourseScraper:
         any_course_header_re = re.compile(r"^[A-Z]{2,6}(?:_V)?\s+\d{3}[A-Z]?\s*\(", re.IGNORECASE)
 
         parts = [target_header.get_text(" ", strip=True)]
-        for sib in target_header.find_all_next():
+        # Walk the following tags lazily: find_all_next() would first collect the
+        # whole rest of the page, once per course
+        for sib in target_header.next_elements:
+            if not isinstance(sib, Tag):
+                continue
             # If we hit another course header tag, stop
-            if sib.name in ["h2", "h3", "h4", "h5"]:
+            if sib.name in COURSE_HEADER_TAGS:
                 sib_txt = sib.get_text(" ", strip=True)
                 if any_course_header_re.match(sib_txt):
                     break
@@ -310,9 +214,9 @@ class SingleCourseScraper:
     # ----------------------------
     # Fallback: text-chunk scanning (safer delimiter)
     # ----------------------------
-    def extract_course_block_from_text(self, soup: BeautifulSoup) -> Optional[str]:
-        main = soup.select_one("main") or soup.select_one("article") or soup.body or soup
-        full_text = main.get_text(separator="\n", strip=False)
+    def extract_course_block_from_text(self, soup: BeautifulSoup, full_text: Optional[str] = None) -> Optional[str]:
+        if full_text is None:
+            full_text = page_text(soup)
 
         # Anchor headers to line start and require credits "(" to avoid matching inside prerequisites
         target_header_pattern = re.compile(
@@ -336,23 +240,35 @@ class SingleCourseScraper:
     # ----------------------------
     def scrape_target_course(self) -> Optional[Dict]:
         # 1) Try per-course page (usually the cleanest)
-        soup = self.fetch_soup(self.course_page_url)
-        if soup:
-            block = (soup.select_one("main") or soup.body or soup).get_text(separator="\n", strip=False)
-            parsed = self.parse_course_chunk(block)
-            if parsed and parsed.get("description"):
-                print("  ✅ Parsed from per-course page")
-                return parsed
-            print("  ⚠️ Per-course page parse failed or incomplete, falling back to subject page...")
+        parsed = self.scrape_course_page()
+        if parsed:
+            return parsed
+        print("  ⚠️ Per-course page parse failed or incomplete, falling back to subject page...")
 
         # 2) Subject page fallback
         soup = self.fetch_soup(self.course_list_url)
         if not soup:
             return None
+        return self.scrape_from_subject_page(soup)
 
-        block = self.extract_course_block_from_subject_page(soup)
+    def scrape_course_page(self) -> Optional[Dict]:
+        """Parse the per-course page; None unless it yields a description."""
+        soup = self.fetch_soup(self.course_page_url)
+        if not soup:
+            return None
+        block = (soup.select_one("main") or soup.body or soup).get_text(separator="\n", strip=False)
+        parsed = self.parse_course_chunk(block)
+        if parsed and parsed.get("description"):
+            print("  ✅ Parsed from per-course page")
+            return parsed
+        return None
+
+    def scrape_from_subject_page(self, soup: BeautifulSoup, headers: Optional[List[Tuple[Tag, str]]] = None,
+                                 full_text: Optional[str] = None) -> Optional[Dict]:
+        """Locate and parse the target on an already-fetched subject page."""
+        block = self.extract_course_block_from_subject_page(soup, headers)
         if not block:
-            block = self.extract_course_block_from_text(soup)
+            block = self.extract_course_block_from_text(soup, full_text)
 
         if not block:
             print(f"❌ Could not locate course {self.target_course} on subject page.")
@@ -360,7 +276,7 @@ class SingleCourseScraper:
 
         parsed = self.parse_course_chunk(block)
         if parsed:
-            print("  ✅ Parsed from subject page")
+            print(f"  ✅ Parsed {self.target_course} from subject page")
         return parsed
 
     # ----------------------------
@@ -427,6 +343,16 @@ class SingleCourseScraper:
 
         return updated
 
+    def save_json_file(self, data: Dict, filename: str):
+        filepath = os.path.join(self.curriculum_dir, filename)
+        try:
+            if write_json(filepath, data):
+                print(f"  ✅ Updated in {filename}")
+            else:
+                print(f"  ✓ {filename} already up to date")
+        except Exception as e:
+            print(f"  ❌ Error saving {filename}: {e}")
+
     def update_json_files(self, scraped_course: Dict):
         print(f"\nSearching for {self.target_course} in JSON files...")
 
@@ -434,39 +360,14 @@ class SingleCourseScraper:
             print(f"❌ curriculum_dir not found: {self.curriculum_dir}")
             return
 
-        json_files = [f for f in os.listdir(self.curriculum_dir) if f.endswith(".json")]
-        updated_any = False
-        updated_count = 0
+        # Only the files that list this course are opened (persistent course index)
+        index = CourseIndex(self.curriculum_dir)
+        counts = index.apply([self.target_course],
+                             lambda course_obj: self.update_course_obj(course_obj, scraped_course),
+                             save=self.save_json_file)
+        updated_count = sum(updated for _, updated in counts.values())
 
-        for filename in json_files:
-            filepath = os.path.join(self.curriculum_dir, filename)
-
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception as e:
-                print(f"  ❌ Error reading {filename}: {e}")
-                continue
-
-            file_updated = False
-
-            for year in data.get("years", []):
-                for term in year.get("terms", []):
-                    for course_obj in term.get("courses", []):
-                        if self.update_course_obj(course_obj, scraped_course):
-                            file_updated = True
-                            updated_any = True
-                            updated_count += 1
-
-            if file_updated:
-                try:
-                    with open(filepath, "w", encoding="utf-8") as f:
-                        json.dump(data, f, indent=2, ensure_ascii=False)
-                    print(f"  ✅ Updated in {filename}")
-                except Exception as e:
-                    print(f"  ❌ Error saving {filename}: {e}")
-
-        if not updated_any:
+        if not updated_count:
             print(f"⚠️ Course {self.target_course} was not found in your JSON files (or required no update).")
         else:
             print(f"\n✅ Successfully updated {self.target_course} in {updated_count} place(s).")
@@ -500,12 +401,120 @@ class SingleCourseScraper:
         self.update_json_files(result)
 
 
+class BatchCourseScraper:
+    """
+    Scrape many courses with one subject-page fetch per subject.
+
+    Every target is resolved from its subject page (parsed once, headers and
+    text extracted once); only targets that are missing there, or have no
+    description, fall back to their per-course page.
+    """
+
+    def __init__(self, target_courses: List[str], subject_suffix: Optional[str] = None, force: bool = False):
+        self.force = force
+        first = SingleCourseScraper(target_courses[0], subject_suffix, force)
+        self.session = first.session
+        self.scrapers: Dict[str, SingleCourseScraper] = {first.target_course: first}
+        for code in target_courses[1:]:
+            scraper = SingleCourseScraper(code, subject_suffix, force, session=self.session)
+            self.scrapers.setdefault(scraper.target_course, scraper)
+        self.curriculum_dir = first.curriculum_dir
+
+        if subject_suffix:
+            # The suffix overrides every target's subject page; only safe within one subject
+            prefixes = sorted({scraper.code_prefix for scraper in self.scrapers.values()})
+            if len(prefixes) > 1:
+                raise ValueError(f"--subject '{subject_suffix}' would apply to courses from "
+                                 f"{len(prefixes)} subjects ({', '.join(prefixes)}); "
+                                 f"drop it or batch one subject at a time.")
+
+    def group_by_subject(self) -> Dict[str, List[SingleCourseScraper]]:
+        """Subject page URL -> scrapers of the targets listed on it."""
+        groups: Dict[str, List[SingleCourseScraper]] = {}
+        for scraper in self.scrapers.values():
+            groups.setdefault(scraper.course_list_url, []).append(scraper)
+        return groups
+
+    def scrape_all(self) -> Dict[str, Optional[Dict]]:
+        """Target code -> parsed course (None if it could not be scraped)."""
+        results: Dict[str, Optional[Dict]] = {}
+        requests_made = 0
+        for subject_url, scrapers in self.group_by_subject().items():
+            print(f"\n📚 {subject_url} ({len(scrapers)} course(s))")
+            soup = scrapers[0].fetch_soup(subject_url)
+            requests_made += 1
+            headers = course_header_tags(soup) if soup else []
+            full_text = page_text(soup) if soup else ""
+
+            for scraper in scrapers:
+                parsed = scraper.scrape_from_subject_page(soup, headers, full_text) if soup else None
+                if not (parsed and parsed.get("description")):
+                    # Only now pay for the per-course page
+                    print(f"  ⚠️ {scraper.target_course} not resolved from subject page, trying per-course page...")
+                    requests_made += 1
+                    parsed = scraper.scrape_course_page() or parsed
+                results[scraper.target_course] = parsed
+
+        print(f"\n{requests_made} page request(s) for {len(self.scrapers)} course(s)")
+        return results
+
+    def update_json_files(self, results: Dict[str, Optional[Dict]]):
+        """Apply every scraped course in one pass over the files that list them."""
+        scraped = {code: course for code, course in results.items() if course}
+        print(f"\nUpdating {len(scraped)} course(s) in JSON files...")
+
+        if not os.path.isdir(self.curriculum_dir):
+            print(f"❌ curriculum_dir not found: {self.curriculum_dir}")
+            return
+
+        updated_counts = {code: 0 for code in scraped}
+
+        def update(course_obj: Dict) -> bool:
+            code = normalize_code(course_obj.get("code", ""))
+            if code in scraped and self.scrapers[code].update_course_obj(course_obj, scraped[code]):
+                updated_counts[code] += 1
+                return True
+            return False
+
+        index = CourseIndex(self.curriculum_dir)
+        first = next(iter(self.scrapers.values()))
+        index.apply(scraped.keys(), update, save=first.save_json_file)
+
+        for code, count in updated_counts.items():
+            if count:
+                print(f"  ✅ {code}: updated in {count} place(s)")
+            else:
+                print(f"  ⚠️ {code}: not found in your JSON files (or required no update)")
+
+    def run(self):
+        print("=" * 60)
+        print(f"Batch Course Scraper: {len(self.scrapers)} course(s)")
+        print("=" * 60)
+
+        results = self.scrape_all()
+        failed = [code for code, course in results.items() if not course]
+        for code in failed:
+            print(f"❌ Failed to scrape {code}")
+        self.update_json_files(results)
+        print(f"\n✅ Scraped {len(results) - len(failed)}/{len(results)} course(s)")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scrape single course details from UBC Calendar")
-    parser.add_argument("--course", required=True, help="Course code (e.g. 'MATH 255')")
-    parser.add_argument("--subject", required=True, help="Subject suffix (e.g. 'mathv')")
+    parser.add_argument("--course", required=True, nargs="+",
+                        help="Course code(s) (e.g. 'MATH 255'); several codes run in batch mode")
+    parser.add_argument("--subject", help="Subject suffix (e.g. 'mathv'); default: from each course code. "
+                                          "Only allowed when all courses share one subject")
     parser.add_argument("--force", action="store_true", help="Force update even if data exists")
+    fixtures.add_arguments(parser)
 
     args = parser.parse_args()
-    scraper = SingleCourseScraper(args.course, args.subject, args.force)
+    fixtures.configure(record=args.record, replay=args.replay)
+    try:
+        if len(args.course) == 1:
+            scraper = SingleCourseScraper(args.course[0], args.subject, args.force)
+        else:
+            scraper = BatchCourseScraper(args.course, args.subject, args.force)
+    except ValueError as e:
+        parser.error(str(e))
     scraper.run()
@@ -4,22 +4,36 @@ Scrapes engineering curriculum data from UBC Academic Calendar and generates JSO
 for each engineering major.
 
 Usage:
-    python scripts/scrape_ubc_engineering.py
+    python scripts/scrape_ubc_engineering.py [--record ARCHIVE | --replay ARCHIVE]
 """
 
-import requests
 from bs4 import BeautifulSoup
-import json
 import re
-import time
 import os
+import sys
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
+
+# Add project root to path so the shared scraper utilities can be imported
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scraper.utils import fixtures
+from scraper.utils.fetch_engine import FetchEngine, polite_wait
+from scraper.utils.http_cache import CachedSession
+from scraper.utils.json_writer import write_json
 
 class UBCEngineeringScraper:
-    def __init__(self):
+    def __init__(self, concurrency: int = 4):
         self.base_url = "https://vancouver.calendar.ubc.ca"
-        self.session = requests.Session()
+        self.session = CachedSession()
+        self.concurrency = concurrency
+        self.prefetched = {}  # url -> Response (or Exception) from prefetch_pages
+        
+        program_base = f"{self.base_url}/faculties-colleges-and-schools/faculty-applied-science/bachelor-applied-science"
+        self.first_year_url = f"{program_base}/curriculum-and-first-year"
+        self.biomedical_url = f"{program_base}/biomedical-engineering"
+        self.ece_url = f"{program_base}/electrical-and-computer-engineering"
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -30,6 +44,22 @@ class UBCEngineeringScraper:
         # Ensure output directory exists
         os.makedirs(self.output_dir, exist_ok=True)
         
+    def prefetch_pages(self, urls: List[str]):
+        """Fetch all calendar pages for this run concurrently under the host rate limit."""
+        engine = FetchEngine(session=self.session, concurrency=self.concurrency)
+        self.prefetched = engine.fetch_all(urls)
+    
+    def fetch(self, url: str):
+        """Return the prefetched response for url, or fetch it now (rate limited)."""
+        response = self.prefetched.pop(url, None)
+        if isinstance(response, Exception):
+            raise response
+        if response is None:
+            if not self.session.is_fresh(url):
+                polite_wait(url)
+            response = self.session.get(url, timeout=15)
+        return response
+    
     def clean_course_code(self, code: str) -> str:
         """
         Clean course code:
@@ -132,12 +162,12 @@ class UBCEngineeringScraper:
     
     def scrape_standard_first_year(self) -> List[Dict]:
         """Scrape standard first year courses that apply to all engineering majors"""
-        url = f"{self.base_url}/faculties-colleges-and-schools/faculty-applied-science/bachelor-applied-science/curriculum-and-first-year"
+        url = self.first_year_url
         
         print(f"Scraping standard first year courses from: {url}")
         
         try:
-            response = self.session.get(url, timeout=15)
+            response = self.fetch(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -227,13 +257,13 @@ class UBCEngineeringScraper:
         1. Unique first year (Pre-Biomedical Engineering STT)
         2. Years 2-4 from the Biomedical Engineering page
         """
-        url = f"{self.base_url}/faculties-colleges-and-schools/faculty-applied-science/bachelor-applied-science/biomedical-engineering"
+        url = self.biomedical_url
         
         print(f"\n[Special] Scraping Biomedical Engineering...")
         print(f"  URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=15)
+            response = self.fetch(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -429,13 +459,13 @@ class UBCEngineeringScraper:
         
         Returns a list of curriculum dicts for each program.
         """
-        url = f"{self.base_url}/faculties-colleges-and-schools/faculty-applied-science/bachelor-applied-science/electrical-and-computer-engineering"
+        url = self.ece_url
         
         print(f"\n[Special] Scraping ECE page for 3 programs...")
         print(f"  URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=15)
+            response = self.fetch(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -670,7 +700,7 @@ class UBCEngineeringScraper:
         print(f"  URL: {url}")
         
         try:
-            response = self.session.get(url, timeout=15)
+            response = self.fetch(url)
             response.raise_for_status()
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -805,9 +835,10 @@ class UBCEngineeringScraper:
     def save_json(self, data: Dict, filename: str):
         """Save curriculum data to JSON file"""
         filepath = os.path.join(self.output_dir, filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"  Saved: {filepath}")
+        if write_json(filepath, data):
+            print(f"  Saved: {filepath}")
+        else:
+            print(f"  Unchanged: {filepath}")
     
     def cleanup_old_files(self):
         """Remove old/irrelevant JSON files"""
@@ -849,6 +880,14 @@ class UBCEngineeringScraper:
         print("\n[Step 0] Cleaning up old files...")
         self.cleanup_old_files()
         
+        # Fetch every page up front; the fetch engine spaces requests to the
+        # calendar host, so no extra sleeps are needed between steps
+        majors = self.get_undergraduate_majors_list()
+        print("\n[Prefetch] Fetching all curriculum pages...")
+        self.prefetch_pages(
+            [self.first_year_url, self.biomedical_url, self.ece_url] + [url for _, url in majors]
+        )
+        
         # Step 1: Scrape standard first year
         print("\n[Step 1] Scraping standard first year courses...")
         self.common_year_1 = self.scrape_standard_first_year()
@@ -858,11 +897,8 @@ class UBCEngineeringScraper:
             print("  Using default first year courses...")
             self.common_year_1 = self.get_default_first_year()
         
-        time.sleep(1)  # Be polite to the server
-        
         # Step 2: Get undergraduate majors list
         print("\n[Step 2] Using predefined undergraduate majors list...")
-        majors = self.get_undergraduate_majors_list()
         print(f"  Will scrape {len(majors)} undergraduate engineering programs")
         for name, _ in majors:
             print(f"    - {name}")
@@ -880,8 +916,6 @@ class UBCEngineeringScraper:
         else:
             failed += 1
         
-        time.sleep(2)
-        
         # Step 4: Scrape ECE page (special handling for 2 programs - Computer and Electrical)
         print("\n[Step 4] Scraping ECE page (2 programs)...")
         ece_results = self.scrape_ece_page()
@@ -894,14 +928,10 @@ class UBCEngineeringScraper:
             else:
                 failed += 1
         
-        time.sleep(2)
-        
         # Step 5: Scrape each remaining major
         print("\n[Step 5] Scraping other major curricula...")
         
         for program_name, url in majors:
-            time.sleep(2)  # Be polite to the server
-            
             curriculum = self.scrape_major_curriculum(program_name, url)
             
             if curriculum:
@@ -927,5 +957,6 @@ class UBCEngineeringScraper:
 
 
 if __name__ == "__main__":
+    fixtures.configure_from_argv()
     scraper = UBCEngineeringScraper()
     scraper.run()